@@ -0,0 +1,65 @@
+"""Benchmark: record() latency with synchronous vs. background JsonStore saves.
+
+Records N metrics one at a time through an AnalyticsCollector that flushes
+every ``persist_every`` rows, and reports the median, p99 and worst
+record() latency plus the total time including the final wait for
+durability.
+
+    python benchmarks/bench_background_save.py [records] [persist_every]
+    # default: 200000 5000
+"""
+
+from __future__ import annotations
+
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore
+
+BASE = datetime(2026, 1, 1)
+
+
+def _run(background: bool, n: int, persist_every: int, workdir: Path) -> tuple[float, float, float, float]:
+    store = JsonStore(workdir / f"bg-{background}.json", background=background)
+    collector = AnalyticsCollector(store=store, persist_every=persist_every)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for i in range(n):
+        metric = EngagementMetric(
+            channel_id=f"ch{i % 4}", content_id=f"post-{i % 5000}",
+            timestamp=BASE + timedelta(seconds=30 * i), impressions=100 + i % 900, clicks=i % 7,
+        )
+        t0 = time.perf_counter()
+        collector.record(metric)
+        latencies.append(time.perf_counter() - t0)
+    collector.close()
+    store.close()
+    total = time.perf_counter() - start
+    latencies.sort()
+    return (
+        statistics.median(latencies), latencies[int(len(latencies) * 0.99)],
+        latencies[-1], total,
+    )
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    persist_every = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    print(f"{'mode':<11} {'median us':>10} {'p99 us':>9} {'max ms':>9} {'total s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for background in (False, True):
+            median, p99, worst, total = _run(background, n, persist_every, Path(tmp))
+            mode = "background" if background else "sync"
+            print(
+                f"{mode:<11} {median * 1e6:>10.1f} {p99 * 1e6:>9.1f}"
+                f" {worst * 1e3:>9.1f} {total:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
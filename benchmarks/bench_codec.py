@@ -0,0 +1,65 @@
+"""Benchmark: JsonStore save/load time and size per codec and layout.
+
+Builds an analytics store of N metric records (plus sketches) and times
+JsonStore.save() and a cold JsonStore load for the stdlib and orjson
+encoders (when installed), in indented and compact layouts.
+
+    python benchmarks/bench_codec.py [records]    # default: 200000
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from kerygma_strategy import codec
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore
+
+BASE = datetime(2026, 1, 1)
+
+
+def _document(n: int) -> dict:
+    collector = AnalyticsCollector()
+    collector.record_many(
+        EngagementMetric(
+            channel_id=f"ch{i % 4}", content_id=f"post-{i % 5000}",
+            timestamp=BASE + timedelta(seconds=30 * i), impressions=100 + i % 900, clicks=i % 7,
+        )
+        for i in range(n)
+    )
+    return {
+        "metrics": [m.to_dict() for m in collector.all_metrics],
+        "sketches": collector.sketches.to_dict(),
+    }
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    document = _document(n)
+    orjson = codec.orjson
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    print(f"{'codec':<8} {'layout':<9} {'save s':>8} {'load s':>8} {'MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in backends:
+            codec.orjson = orjson if name == "orjson" else None
+            for compact in (False, True):
+                path = Path(tmp) / f"{name}-{compact}.json"
+                store = JsonStore.from_dict(document, path=path, compact=compact)
+                start = time.perf_counter()
+                store.save()
+                save = time.perf_counter() - start
+                start = time.perf_counter()
+                JsonStore(path)
+                load = time.perf_counter() - start
+                layout = "compact" if compact else "indented"
+                size = path.stat().st_size / 1e6
+                print(f"{name:<8} {layout:<9} {save:>8.3f} {load:>8.3f} {size:>8.1f}")
+    codec.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: JsonStore and report size/time per compression.
+
+Builds an analytics store of N metric records (plus sketches) and times
+JsonStore.save(), a cold JsonStore load and a streamed one-week read
+(AnalyticsCollector.from_stream) for no compression, gzip and lzma in
+both layouts, then compares saved report sizes.
+
+    python benchmarks/bench_compression.py [records]    # default: 200000
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.report_generator import ReportGenerator, ReportPeriod
+
+BASE = datetime(2026, 1, 1)
+
+
+def _collector(n: int) -> AnalyticsCollector:
+    collector = AnalyticsCollector()
+    collector.record_many(
+        EngagementMetric(
+            channel_id=f"ch{i % 4}", content_id=f"post-{i % 5000}",
+            timestamp=BASE + timedelta(seconds=30 * i), impressions=100 + i % 900, clicks=i % 7,
+        )
+        for i in range(n)
+    )
+    return collector
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    collector = _collector(n)
+    document = {
+        "metrics": [m.to_dict() for m in collector.all_metrics],
+        "sketches": collector.sketches.to_dict(),
+    }
+    week = (BASE + timedelta(days=20), BASE + timedelta(days=27))
+    print(f"{'compression':<12} {'layout':<9} {'save s':>8} {'load s':>8} {'week s':>8} {'MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in (None, "gzip", "lzma"):
+            for compact in (False, True):
+                path = Path(tmp) / f"{compression}-{compact}.json"
+                store = JsonStore.from_dict(
+                    document, path=path, compact=compact, compression=compression,
+                )
+                start = time.perf_counter()
+                store.save()
+                save = time.perf_counter() - start
+                start = time.perf_counter()
+                JsonStore(path)
+                load = time.perf_counter() - start
+                start = time.perf_counter()
+                AnalyticsCollector.from_stream(path, start=week[0], end=week[1])
+                window = time.perf_counter() - start
+                layout = "compact" if compact else "indented"
+                size = path.stat().st_size / 1e6
+                print(
+                    f"{compression or 'none':<12} {layout:<9} {save:>8.3f} {load:>8.3f}"
+                    f" {window:>8.3f} {size:>8.2f}"
+                )
+
+        gen = ReportGenerator(collector)
+        report = gen.generate(ReportPeriod.monthly(end=BASE + timedelta(days=60)))
+        print(f"\n{'report':<12} {'KB':>8}")
+        for compression in (None, "gzip", "lzma"):
+            out = Path(tmp) / f"reports-{compression}"
+            files = gen.save_report(report, out, compression=compression)
+            size = sum(f.stat().st_size for f in files) / 1e3
+            print(f"{compression or 'none':<12} {size:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
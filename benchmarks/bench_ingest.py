@@ -0,0 +1,88 @@
+"""Benchmark: ingest rate vs. producer threads.
+
+Compares producers calling AnalyticsCollector.record() behind a global
+lock (persistence on the caller's thread) with producers submitting to a
+ConcurrentIngestor (single writer thread). "produce/s" only times the
+producers' put() calls until they return; "durable/s" times until every
+record is applied and flushed, and is the number that matters.
+
+The ingestor does not make ingestion scale with threads. Under CPython's
+GIL the single writer bounds the durable rate, and extra producers add
+contention: on the reference machine durable/s fell from about 129k/s
+with one producer to about 65k/s with eight. Once the bounded queue
+fills, produce/s falls to the writer's rate too. What the ingestor buys
+is that producers never hold a lock across indexing and disk I/O.
+
+    python benchmarks/bench_ingest.py [records_per_thread]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.ingest import ConcurrentIngestor
+from kerygma_strategy.persistence import AppendLog
+
+BASE = datetime(2026, 1, 1)
+
+
+def _metrics(thread: int, n: int) -> list[EngagementMetric]:
+    return [
+        EngagementMetric(
+            channel_id=f"ch{thread}", content_id=f"post-{i % 500}",
+            timestamp=BASE, impressions=100, clicks=i % 7,
+        )
+        for i in range(n)
+    ]
+
+
+def _run(producers: int, per_thread: int, workdir: Path, mode: str) -> tuple[float, float]:
+    wal = AppendLog(workdir / f"{mode}-{producers}.json")
+    collector = AnalyticsCollector(wal=wal, persist_every=2000)
+    batches = [_metrics(t, per_thread) for t in range(producers)]
+    lock = threading.Lock()
+    ingestor = ConcurrentIngestor(collector) if mode == "ingestor" else None
+
+    def produce(batch: list[EngagementMetric]) -> None:
+        if ingestor is not None:
+            for m in batch:
+                ingestor.submit(m)
+        else:
+            for m in batch:
+                with lock:
+                    collector.record(m)
+
+    threads = [threading.Thread(target=produce, args=(b,)) for b in batches]
+    start = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    produced = time.perf_counter() - start
+    if ingestor is not None:
+        ingestor.close()
+    collector.close()
+    durable = time.perf_counter() - start
+    total = producers * per_thread
+    return total / produced, total / durable
+
+
+def main() -> None:
+    per_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        print(f"{'mode':<10} {'threads':>7} {'produce/s':>12} {'durable/s':>12}")
+        for mode in ("lock", "ingestor"):
+            for producers in (1, 2, 4, 8):
+                produce_rate, durable_rate = _run(producers, per_thread, workdir, mode)
+                print(f"{mode:<10} {producers:>7} {produce_rate:>12,.0f} {durable_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
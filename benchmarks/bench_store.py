@@ -0,0 +1,78 @@
+"""Benchmark: JsonStore vs. SqliteStore write and load latency.
+
+For each size, writes N metrics through an AnalyticsCollector in ten
+flushes (JsonStore rewrites the whole document each time while
+SqliteStore appends only the new rows), then times a cold load of the
+full history and a one-week range load.
+
+    python benchmarks/bench_store.py [size ...]    # default: 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore, SqliteStore
+
+BASE = datetime(2026, 1, 1)
+
+
+def _metrics(n: int) -> list[EngagementMetric]:
+    step = timedelta(days=365) / n
+    return [
+        EngagementMetric(
+            channel_id=f"ch{i % 4}", content_id=f"post-{i % 5000}",
+            timestamp=BASE + i * step, impressions=100 + i % 900, clicks=i % 7,
+        )
+        for i in range(n)
+    ]
+
+
+def _run(kind: str, metrics: list[EngagementMetric], workdir: Path) -> tuple[float, float, float]:
+    n = len(metrics)
+    path = workdir / f"{kind}-{n}.{'db' if kind == 'sqlite' else 'json'}"
+
+    def open_store() -> JsonStore | SqliteStore:
+        return SqliteStore(path) if kind == "sqlite" else JsonStore(path)
+
+    collector = AnalyticsCollector(store=open_store(), persist_every=max(n // 10, 1))
+    start = time.perf_counter()
+    for i in range(0, n, 10_000):
+        collector.record_many(metrics[i:i + 10_000])
+    collector.flush()
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    AnalyticsCollector(store=open_store())
+    load = time.perf_counter() - start
+
+    week = (BASE + timedelta(days=180), BASE + timedelta(days=187))
+    start = time.perf_counter()
+    if kind == "sqlite":
+        store = open_store()
+        assert isinstance(store, SqliteStore)
+        AnalyticsCollector.from_sqlite(store, start=week[0], end=week[1])
+    else:
+        AnalyticsCollector.from_stream(path, start=week[0], end=week[1])
+    window = time.perf_counter() - start
+    return write, load, window
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'store':<8} {'metrics':>9} {'write s':>9} {'load s':>9} {'week s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            metrics = _metrics(n)
+            for kind in ("json", "sqlite"):
+                write, load, window = _run(kind, metrics, Path(tmp))
+                print(f"{kind:<8} {n:>9,} {write:>9.2f} {load:>9.2f} {window:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@
 
 from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
 from kerygma_strategy.channels import ChannelConfig, ChannelRegistry
-from kerygma_strategy.scheduler import ContentScheduler, ScheduleEntry, Frequency
-from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.scheduler import (
+    ContentScheduler, Frequency, RecurrenceRule, ScheduleArchive, ScheduleEntry,
+)
+from kerygma_strategy.persistence import AppendLog, JsonStore, MappedJsonStore, SqliteStore
 
 __all__ = [
     "AnalyticsCollector",
@@ -18,6 +20,11 @@
     "ChannelRegistry",
     "ContentScheduler",
     "ScheduleEntry",
+    "ScheduleArchive",
+    "RecurrenceRule",
     "Frequency",
     "JsonStore",
+    "AppendLog",
+    "SqliteStore",
+    "MappedJsonStore",
 ]
@@ -6,12 +6,25 @@
 
 from __future__ import annotations
 
+import bisect
+import heapq
+import math
+import sys
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, overload
+
+from kerygma_strategy import codec
+from kerygma_strategy.persistence import JsonStore, SqliteStore
+from kerygma_strategy.rollups import RetentionPolicy, RollupStore
+from kerygma_strategy.sketches import ChannelSketches
 
 if TYPE_CHECKING:
-    from kerygma_strategy.persistence import JsonStore
+    from kerygma_strategy.columnar import ColumnarMetrics
+    from kerygma_strategy.persistence import AppendLog
 
 
 @dataclass
@@ -42,77 +55,754 @@ def to_dict(self) -> dict[str, Any]:
             "engagement_rate": round(self.engagement_rate, 4),
         }
 
+    @classmethod
+    def from_dict(cls, item: dict[str, Any], timestamp: datetime | None = None) -> EngagementMetric:
+        """Build from a to_dict() record; pass ``timestamp`` if it is already parsed."""
+        return cls(
+            channel_id=item["channel_id"],
+            content_id=item["content_id"],
+            timestamp=timestamp or datetime.fromisoformat(item["timestamp"]),
+            impressions=item.get("impressions", 0),
+            clicks=item.get("clicks", 0),
+            shares=item.get("shares", 0),
+            replies=item.get("replies", 0),
+        )
+
+
+class CompactMetric:
+    """Memory-lean drop-in for EngagementMetric.
+
+    Uses ``__slots__`` instead of a per-instance ``__dict__``, interns the
+    channel and content ids so rows share one copy of each string, and
+    keeps the timestamp as an integer of epoch microseconds that becomes a
+    datetime only when read. Timezone-aware timestamps are normalized to
+    naive UTC. Compares equal to an EngagementMetric with the same fields.
+    """
+
+    __slots__ = (
+        "_micros", "channel_id", "clicks", "content_id", "impressions", "replies", "shares",
+    )
+
+    def __init__(
+        self,
+        channel_id: str,
+        content_id: str,
+        timestamp: datetime,
+        impressions: int = 0,
+        clicks: int = 0,
+        shares: int = 0,
+        replies: int = 0,
+    ) -> None:
+        self.channel_id = sys.intern(channel_id)
+        self.content_id = sys.intern(content_id)
+        self._micros = codec.epoch_micros(timestamp)
+        self.impressions = impressions
+        self.clicks = clicks
+        self.shares = shares
+        self.replies = replies
+
+    @property
+    def timestamp(self) -> datetime:
+        return codec.EPOCH + timedelta(microseconds=self._micros)
+
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self._micros = codec.epoch_micros(value)
+
+    @property
+    def engagement_rate(self) -> float:
+        if self.impressions == 0:
+            return 0.0
+        return (self.clicks + self.shares + self.replies) / self.impressions
+
+    def _fields(self) -> tuple[Any, ...]:
+        return (
+            self.channel_id, self.content_id, self.timestamp,
+            self.impressions, self.clicks, self.shares, self.replies,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CompactMetric, EngagementMetric)):
+            return self._fields() == (
+                other.channel_id, other.content_id, other.timestamp,
+                other.impressions, other.clicks, other.shares, other.replies,
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, like the dataclass
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactMetric(channel_id={self.channel_id!r}, content_id={self.content_id!r}, "
+            f"timestamp={self.timestamp!r}, impressions={self.impressions}, "
+            f"clicks={self.clicks}, shares={self.shares}, replies={self.replies})"
+        )
+
+    to_dict = EngagementMetric.to_dict
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> CompactMetric:
+        return cls(
+            channel_id=item["channel_id"],
+            content_id=item["content_id"],
+            timestamp=datetime.fromisoformat(item["timestamp"]),
+            impressions=item.get("impressions", 0),
+            clicks=item.get("clicks", 0),
+            shares=item.get("shares", 0),
+            replies=item.get("replies", 0),
+        )
+
+    @classmethod
+    def from_metric(cls, metric: EngagementMetric | CompactMetric) -> CompactMetric:
+        if isinstance(metric, CompactMetric):
+            return metric
+        return cls(
+            metric.channel_id, metric.content_id, metric.timestamp,
+            metric.impressions, metric.clicks, metric.shares, metric.replies,
+        )
+
+    def to_metric(self) -> EngagementMetric:
+        return EngagementMetric(*self._fields())
+
+
+_COUNTER_FIELDS = ("impressions", "clicks", "shares", "replies")
+
+
+def _coerce_metric(
+    item: EngagementMetric | CompactMetric | dict[str, Any], index: int,
+) -> EngagementMetric:
+    """Validate one record_many() item and convert it to an EngagementMetric."""
+    if isinstance(item, EngagementMetric):
+        return item
+    if isinstance(item, CompactMetric):
+        return item.to_metric()
+    if not isinstance(item, dict):
+        raise TypeError(f"Item {index}: expected EngagementMetric or dict, got {type(item).__name__}")
+    for key in ("channel_id", "content_id", "timestamp"):
+        if not item.get(key):
+            raise ValueError(f"Item {index}: missing '{key}'")
+    ts = item["timestamp"]
+    if isinstance(ts, str):
+        try:
+            ts = datetime.fromisoformat(ts)
+        except ValueError:
+            raise ValueError(f"Item {index}: invalid timestamp '{ts}'") from None
+    elif not isinstance(ts, datetime):
+        raise TypeError(f"Item {index}: invalid timestamp {ts!r}")
+    counters = {}
+    for key in _COUNTER_FIELDS:
+        value = item.get(key, 0)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Item {index}: '{key}' must be a non-negative integer")
+        counters[key] = value
+    return EngagementMetric(
+        channel_id=item["channel_id"], content_id=item["content_id"], timestamp=ts, **counters,
+    )
+
+
+class MetricsView(Sequence[EngagementMetric]):
+    """Read-only, zero-copy window onto a collector's stored rows.
+
+    Holds a reference to the storage and, when narrowed, to the selected
+    row positions; metrics are only touched when indexed or iterated, and
+    there is no mutating API. A view may reflect rows recorded after it
+    was taken; use ``list(view)`` for a stable snapshot.
+    """
+
+    __slots__ = ("_positions", "_rows")
+
+    def __init__(
+        self, rows: Sequence[EngagementMetric], positions: Sequence[int] | None = None,
+    ) -> None:
+        self._rows = rows
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self._rows if self._positions is None else self._positions)
+
+    @overload
+    def __getitem__(self, index: int) -> EngagementMetric: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MetricsView: ...
+
+    def __getitem__(self, index: int | slice) -> EngagementMetric | MetricsView:
+        if isinstance(index, slice):
+            positions = self._positions if self._positions is not None else range(len(self._rows))
+            return MetricsView(self._rows, positions[index])
+        if self._positions is None:
+            return self._rows[index]
+        return self._rows[self._positions[index]]
+
+    def __iter__(self) -> Iterator[EngagementMetric]:
+        if self._positions is None:
+            return iter(self._rows)
+        rows = self._rows
+        return (rows[p] for p in self._positions)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"MetricsView({len(self)} rows)"
+
+    def filter(self, predicate: Callable[[EngagementMetric], bool]) -> Iterator[EngagementMetric]:
+        """Lazily yield the metrics in this view that satisfy ``predicate``."""
+        return (m for m in self if predicate(m))
+
 
 class AnalyticsCollector:
     """Collects and aggregates distribution performance metrics."""
 
-    def __init__(self, store: JsonStore | None = None, persist_every: int = 50) -> None:
-        self._metrics: list[EngagementMetric] = []
+    def __init__(
+        self,
+        store: JsonStore | SqliteStore | None = None,
+        persist_every: int = 50,
+        columnar: bool = False,
+        verify_aggregates: bool = False,
+        wal: AppendLog | None = None,
+        upsert: str | None = None,
+        upsert_key: tuple[str, ...] = ("channel_id", "content_id", "timestamp"),
+        compact_records: bool = False,
+    ) -> None:
+        """Create a collector, loading history from ``wal`` or ``store``.
+
+        Rows are held as EngagementMetric objects, as a ColumnarMetrics
+        table with ``columnar=True`` or as CompactMetric with
+        ``compact_records=True``; the object API is the same in every mode.
+        With ``wal`` metrics go to the AppendLog instead of ``store``.
+        ``verify_aggregates=True`` cross-checks every aggregate read
+        against a full recompute. With ``upsert="replace"`` or ``"merge"``
+        a sample repeating ``upsert_key`` overwrites (or takes the
+        per-counter maximum with) its stored row instead of appending.
+        An internal lock guards mutations and reads, so a
+        ConcurrentIngestor can write while other threads query.
+        """
+        if columnar and compact_records:
+            raise ValueError("columnar and compact_records are mutually exclusive")
+        if upsert not in (None, "replace", "merge"):
+            raise ValueError(f"Unknown upsert mode '{upsert}'")
+        if not {"channel_id", "content_id"} <= set(upsert_key):
+            raise ValueError("upsert_key must include channel_id and content_id")
+        self._table: ColumnarMetrics | None = None
+        self._metrics: list[EngagementMetric] | ColumnarMetrics = []
+        if columnar:
+            from kerygma_strategy.columnar import ColumnarMetrics
+            self._table = self._metrics = ColumnarMetrics()
+        self._by_channel: dict[str, list[int]] = {}
+        self._by_content: dict[str, list[int]] = {}
+        self._channel_totals: dict[str, dict[str, int]] = {}
+        self._content_rates: dict[str, list[float]] = {}
+        self._compact_records = compact_records
+        self._time_keys: list[int] = []
+        self._time_rows: list[int] = []
+        self._upsert = upsert
+        self._upsert_key = upsert_key
+        self._by_key: dict[tuple[Any, ...], int] = {}
+        self._rollups = RollupStore()
+        self._sketches = ChannelSketches()
+        self._lock = threading.RLock()
+        self._verify_aggregates = verify_aggregates
         self._store = store
+        self._metric_table = isinstance(store, SqliteStore)
+        self._wal = wal
         self._persist_every = persist_every
-        self._unsaved_count = 0
-        if store:
+        self._pending: list[EngagementMetric] = []
+        if wal:
+            self._load_from_wal()
+        elif store:
             self._load_from_store()
 
+    def _load_from_wal(self) -> None:
+        """Replay the write-ahead log snapshot and tail."""
+        if not self._wal:
+            return
+        # Persisted sketches already cover the snapshot rows; only the log
+        # tail still needs to be folded in.
+        covered = self._wal.snapshot_size if "sketches" in self._wal.meta else 0
+        if covered:
+            self._sketches = ChannelSketches.from_dict(self._wal.meta["sketches"])
+        for i, item in enumerate(self._wal.replay()):
+            self._ingest(EngagementMetric.from_dict(item), sketch=i >= covered)
+        if "rollups" in self._wal.meta:
+            self._rollups = RollupStore.from_dict(self._wal.meta["rollups"])
+            self._seed_from_rollups()
+
     def _load_from_store(self) -> None:
         """Load metrics from persistent store."""
         if not self._store:
             return
-        raw = self._store.get("metrics", [])
+        if self._metric_table:
+            raw = self._store.iter_metrics()  # type: ignore[union-attr]
+            n_rows = self._store.count_metrics()  # type: ignore[union-attr]
+        else:
+            raw = self._store.get("metrics", [])
+            n_rows = len(raw)
+        # Persisted sketches are only reused when they were written over
+        # exactly the stored rows; otherwise (a crash after a flush, or
+        # another writer's rows) they are rebuilt from the rows.
+        sketches = self._store.get("sketches")
+        covered = bool(sketches) and sketches.get("rows") == n_rows
+        if covered:
+            self._sketches = ChannelSketches.from_dict(sketches)
         for item in raw:
-            self._metrics.append(EngagementMetric(
-                channel_id=item["channel_id"],
-                content_id=item["content_id"],
-                timestamp=datetime.fromisoformat(item["timestamp"]),
-                impressions=item.get("impressions", 0),
-                clicks=item.get("clicks", 0),
-                shares=item.get("shares", 0),
-                replies=item.get("replies", 0),
+            self._ingest(EngagementMetric.from_dict(item), sketch=not covered)
+        rollups = self._store.get("rollups")
+        if rollups:
+            self._rollups = RollupStore.from_dict(rollups)
+            self._seed_from_rollups()
+
+    def _ingest(self, metric: EngagementMetric, sketch: bool = True) -> None:
+        """Append a metric, or upsert it onto an existing row in upsert mode."""
+        if self._upsert is not None:
+            row = self._by_key.get(self._natural_key(metric))
+            if row is not None:
+                self._replace(row, metric)
+                return
+        self._append(metric, sketch)
+
+    def _as_row(self, metric: EngagementMetric) -> EngagementMetric:
+        if self._compact_records:
+            return CompactMetric.from_metric(metric)  # type: ignore[return-value]
+        return metric
+
+    def _time_key(self, metric: EngagementMetric) -> int:
+        """Time-index key of a metric as it is (or will be) stored: epoch microseconds.
+
+        Integer keys let naive and timezone-aware timestamps share one index.
+        """
+        if isinstance(metric, CompactMetric):
+            return metric._micros
+        micros = codec.epoch_micros(metric.timestamp)
+        if self._table is not None:
+            # Columnar rows keep whole epoch seconds; key on what is stored.
+            return micros // 1_000_000 * 1_000_000
+        return micros
+
+    def _time_bound(self, ts: datetime) -> int:
+        return codec.epoch_micros(ts)
+
+    def _natural_key(self, metric: EngagementMetric) -> tuple[Any, ...]:
+        # Timestamps are keyed like the time index so incoming aware values
+        # match the normalized ones stored as CompactMetric or columnar rows.
+        return tuple(
+            self._time_key(metric) if name == "timestamp" else getattr(metric, name)
+            for name in self._upsert_key
+        )
+
+    def _replace(self, row: int, metric: EngagementMetric) -> None:
+        """Overwrite (or merge into) the stored row, keeping indexes and sums exact.
+
+        Sketches are left as they are: quantile sketches cannot retract a
+        value, so each natural key contributes its first sample only.
+        """
+        old = self._metrics[row]
+        if self._upsert == "merge":
+            metric = EngagementMetric(
+                channel_id=old.channel_id,
+                content_id=old.content_id,
+                timestamp=max(old.timestamp, metric.timestamp, key=codec.epoch_micros),
+                impressions=max(old.impressions, metric.impressions),
+                clicks=max(old.clicks, metric.clicks),
+                shares=max(old.shares, metric.shares),
+                replies=max(old.replies, metric.replies),
+            )
+        metric = self._as_row(metric)
+        self._accumulate(old, sign=-1)
+        self._accumulate(metric)
+        old_key, new_key = self._time_key(old), self._time_key(metric)
+        if new_key != old_key:
+            lo = bisect.bisect_left(self._time_keys, old_key)
+            hi = bisect.bisect_right(self._time_keys, old_key, lo=lo)
+            pos = lo + self._time_rows[lo:hi].index(row)
+            del self._time_keys[pos]
+            del self._time_rows[pos]
+            pos = bisect.bisect_right(self._time_keys, new_key)
+            self._time_keys.insert(pos, new_key)
+            self._time_rows.insert(pos, row)
+        self._metrics[row] = metric
+
+    def _append(self, metric: EngagementMetric, sketch: bool = True) -> None:
+        """Store a metric, index its row position and (optionally) sketch it."""
+        metric = self._as_row(metric)
+        self._index(len(self._metrics), metric)
+        self._metrics.append(metric)
+        if sketch:
+            self._sketches.add(
+                metric.channel_id, metric.content_id, metric.timestamp, metric.engagement_rate,
+            )
+
+    def _index(self, row: int, metric: EngagementMetric, timed: bool = True) -> None:
+        # Compute keys before touching any index so a bad row changes nothing.
+        key = self._time_key(metric) if timed else 0
+        natural_key = self._natural_key(metric) if self._upsert is not None else None
+        self._by_channel.setdefault(metric.channel_id, []).append(row)
+        self._by_content.setdefault(metric.content_id, []).append(row)
+        if natural_key is not None:
+            self._by_key[natural_key] = row
+        if timed:
+            if not self._time_keys or key >= self._time_keys[-1]:
+                self._time_keys.append(key)
+                self._time_rows.append(row)
+            else:
+                pos = bisect.bisect_right(self._time_keys, key)
+                self._time_keys.insert(pos, key)
+                self._time_rows.insert(pos, row)
+        self._accumulate(metric)
+
+    def _append_batch(self, metrics: list[EngagementMetric]) -> None:
+        """Append many metrics, merging them into the time index in one step."""
+        base = len(self._metrics)
+        if self._compact_records:
+            metrics = [self._as_row(m) for m in metrics]
+        entries = sorted(
+            ((self._time_key(m), base + offset) for offset, m in enumerate(metrics)),
+            key=lambda e: e[0],
+        )
+        for offset, metric in enumerate(metrics):
+            self._index(base + offset, metric, timed=False)
+            self._metrics.append(metric)
+            self._sketches.add(
+                metric.channel_id, metric.content_id, metric.timestamp, metric.engagement_rate,
+            )
+        split = 0
+        if self._time_keys:
+            split = bisect.bisect_left(entries, self._time_keys[-1], key=lambda e: e[0])
+        late, in_order = entries[:split], entries[split:]
+        if len(late) <= 64:
+            for ts, row in late:
+                pos = bisect.bisect_right(self._time_keys, ts)
+                self._time_keys.insert(pos, ts)
+                self._time_rows.insert(pos, row)
+        else:
+            merged = list(heapq.merge(
+                zip(self._time_keys, self._time_rows), late, key=lambda e: e[0],
             ))
+            self._time_keys = [ts for ts, _ in merged]
+            self._time_rows = [row for _, row in merged]
+        self._time_keys.extend(ts for ts, _ in in_order)
+        self._time_rows.extend(row for _, row in in_order)
+
+    def _accumulate(self, metric: EngagementMetric, sign: int = 1) -> None:
+        totals = self._channel_totals.get(metric.channel_id)
+        if totals is None:
+            totals = self._channel_totals[metric.channel_id] = {
+                "impressions": 0, "clicks": 0, "shares": 0, "replies": 0,
+            }
+        totals["impressions"] += sign * metric.impressions
+        totals["clicks"] += sign * metric.clicks
+        totals["shares"] += sign * metric.shares
+        totals["replies"] += sign * metric.replies
+        rates = self._content_rates.get(metric.content_id)
+        if rates is None:
+            rates = self._content_rates[metric.content_id] = [0.0, 0]
+        rates[0] += sign * metric.engagement_rate
+        rates[1] += sign
 
-    def _persist(self) -> None:
-        """Save metrics to persistent store."""
+    def _rebuild_indexes(self) -> None:
+        """Recompute the secondary indexes and running aggregates from the stored rows."""
+        self._by_channel = {}
+        self._by_content = {}
+        self._channel_totals = {}
+        self._content_rates = {}
+        self._time_keys = []
+        self._time_rows = []
+        self._by_key = {}
+        for row, metric in enumerate(self._metrics):
+            self._index(row, metric)
+        self._seed_from_rollups()
+
+    def _seed_from_rollups(self) -> None:
+        """Fold compacted history (weekly buckets) into the running aggregates."""
+        for channel_id, bucket in self._rollups.channel_totals().items():
+            totals = self._channel_totals.setdefault(
+                channel_id, {"impressions": 0, "clicks": 0, "shares": 0, "replies": 0},
+            )
+            for name, value in bucket.counters().items():
+                totals[name] += value
+        for content_id, bucket in self._rollups.content_totals().items():
+            rates = self._content_rates.setdefault(content_id, [0.0, 0])
+            rates[0] += bucket.rate_sum
+            rates[1] += bucket.count
+
+    def _persist(self, rewrite: bool = False, sketches: bool = False) -> None:
+        """Save metrics to persistent store.
+
+        Only pending rows are appended to a JsonStore's metrics list, so a
+        locking store can merge them with other writers' rows; upserts and
+        ``rewrite`` (after compaction) store the full list. Rollups are
+        only written on ``rewrite``; sketches on ``rewrite`` or when asked
+        (close()), tagged with the row count they cover.
+        """
+        if self._wal:
+            self._wal.append(m.to_dict() for m in self._pending)
+            if self._wal.needs_compaction:
+                self._compact_wal()
+            return
         if not self._store:
             return
-        self._store.set("metrics", [m.to_dict() for m in self._metrics])
+        if self._metric_table and self._upsert is not None:
+            rows = dict.fromkeys(self._by_key[self._natural_key(m)] for m in self._pending)
+            self._store.upsert_metrics(  # type: ignore[union-attr]
+                (self._metrics[row].to_dict() for row in rows), self._upsert_key,
+            )
+        elif self._metric_table:
+            self._store.append_metrics(m.to_dict() for m in self._pending)  # type: ignore[union-attr]
+        elif rewrite or self._upsert is not None:
+            self._store.set("metrics", [m.to_dict() for m in self._metrics])
+        elif self._pending:
+            self._store.append("metrics", [m.to_dict() for m in self._pending])  # type: ignore[union-attr]
+        if rewrite:
+            # Rollups only change in compact(); rewriting them on every flush
+            # would let a locking writer's stale copy replace a newer one.
+            if self._rollups.is_empty:
+                self._store.delete("rollups")
+            else:
+                self._store.set("rollups", self._rollups.to_dict())
+        if rewrite or sketches:
+            self._store.set("sketches", {**self._sketches.to_dict(), "rows": len(self._metrics)})
         self._store.save()
 
+    def _compact_wal(self) -> None:
+        if not self._wal:
+            return
+        meta: dict[str, Any] = {"sketches": self._sketches.to_dict()}
+        if not self._rollups.is_empty:
+            meta["rollups"] = self._rollups.to_dict()
+        self._wal.compact((m.to_dict() for m in self._metrics), meta=meta)
+
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> AnalyticsCollector:
-        """Deserialize from a dict (e.g., loaded from JSON)."""
-        collector = cls()
+    def from_dict(
+        cls, data: dict[str, Any], columnar: bool = False, compact_records: bool = False,
+    ) -> AnalyticsCollector:
+        """Deserialize from a dict (e.g., loaded from JSON).
+
+        Like the other read-only constructors, no sketches are built.
+        """
+        collector = cls(columnar=columnar, compact_records=compact_records)
         for item in data.get("metrics", []):
-            collector._metrics.append(EngagementMetric(
-                channel_id=item["channel_id"],
-                content_id=item["content_id"],
-                timestamp=datetime.fromisoformat(item["timestamp"]),
-                impressions=item.get("impressions", 0),
-                clicks=item.get("clicks", 0),
-                shares=item.get("shares", 0),
-                replies=item.get("replies", 0),
-            ))
+            collector._append(EngagementMetric.from_dict(item), sketch=False)
+        return collector
+
+    @classmethod
+    def from_stream(
+        cls,
+        path: Path,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        channels: Collection[str] | None = None,
+        columnar: bool = False,
+        compact_records: bool = False,
+    ) -> AnalyticsCollector:
+        """Load a read-only view of a store file, keeping only matching rows.
+
+        The file is parsed incrementally (see kerygma_strategy.streaming), so
+        memory is bounded by the rows that pass the time/channel filters.
+        Rollups of compacted history are loaded whole; reports window them
+        by time. The returned collector has no store attached and builds
+        no sketches.
+        """
+        from kerygma_strategy.streaming import iter_metrics
+
+        collector = cls(columnar=columnar, compact_records=compact_records)
+        kept: dict[str, Any] = {}
+        for metric in iter_metrics(
+            path, start=start, end=end, channels=channels, keep=("rollups",), kept=kept,
+        ):
+            collector._append(metric, sketch=False)
+        if kept.get("rollups"):
+            collector._rollups = RollupStore.from_dict(kept["rollups"])
+            collector._seed_from_rollups()
+        return collector
+
+    @classmethod
+    def from_sqlite(
+        cls,
+        store: SqliteStore,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        channels: Collection[str] | None = None,
+        columnar: bool = False,
+    ) -> AnalyticsCollector:
+        """Load a read-only view of a SqliteStore, filtered by an indexed query.
+
+        Like from_stream(), rollups are loaded whole and the returned
+        collector has no store attached.
+        """
+        collector = cls(columnar=columnar)
+        for item in store.iter_metrics(start=start, end=end, channels=channels):
+            collector._append(EngagementMetric.from_dict(item), sketch=False)
+        rollups = store.get("rollups")
+        if rollups:
+            collector._rollups = RollupStore.from_dict(rollups)
+            collector._seed_from_rollups()
         return collector
 
     def record(self, metric: EngagementMetric) -> None:
-        self._metrics.append(metric)
-        self._unsaved_count += 1
-        if self._unsaved_count >= self._persist_every:
-            self.flush()
+        with self._lock:
+            self._ingest(metric)
+            self._pending.append(metric)
+            if len(self._pending) >= self._persist_every:
+                self.flush()
+
+    def record_many(
+        self, items: Iterable[EngagementMetric | CompactMetric | dict[str, Any]],
+    ) -> int:
+        """Validate and record a batch of metrics or raw metric dicts.
+
+        Every item is checked and converted before any is stored, so a bad
+        item leaves the collector untouched. Indexes and aggregates are
+        updated in one pass and the store is persisted at most once.
+        Returns the number of metrics recorded.
+        """
+        metrics = [_coerce_metric(item, i) for i, item in enumerate(items)]
+        if not metrics:
+            return 0
+        with self._lock:
+            if self._upsert is None:
+                self._append_batch(metrics)
+            else:
+                for metric in metrics:
+                    self._ingest(metric)
+            self._pending.extend(metrics)
+            if len(self._pending) >= self._persist_every:
+                self.flush()
+        return len(metrics)
 
     def flush(self) -> None:
-        """Force-persist any unsaved metrics to disk."""
-        if self._unsaved_count > 0:
-            self._persist()
-            self._unsaved_count = 0
+        """Force-persist any unsaved metrics to disk.
+
+        Only unsaved rows are written: appended to the AppendLog (compacted
+        into its snapshot once past its threshold), to a SqliteStore's
+        metrics table (upserted in upsert mode) or to a JsonStore's metrics
+        list (rewritten whole in upsert mode).
+        """
+        with self._lock:
+            if self._pending:
+                self._persist()
+                self._pending = []
+
+    def close(self) -> None:
+        """Flush unsaved metrics and sketches and make them durable."""
+        with self._lock:
+            if self._wal:
+                self.flush()
+                self._wal.close()
+            elif self._store is not None:
+                self._persist(sketches=True)
+                self._pending = []
+                if isinstance(self._store, JsonStore):
+                    self._store.wait_durable()
 
     def get_by_channel(self, channel_id: str) -> list[EngagementMetric]:
-        return [m for m in self._metrics if m.channel_id == channel_id]
+        with self._lock:
+            return [self._metrics[row] for row in self._by_channel.get(channel_id, ())]
 
     def get_by_content(self, content_id: str) -> list[EngagementMetric]:
-        return [m for m in self._metrics if m.content_id == content_id]
+        with self._lock:
+            return [self._metrics[row] for row in self._by_content.get(content_id, ())]
+
+    def compact(self, policy: RetentionPolicy, now: datetime | None = None) -> int:
+        """Move raw rows older than ``policy.raw_max_age`` into rollups.
+
+        Expires fine-grained buckets per the policy, folds daily sketches
+        older than ``policy.daily_max_age`` into weekly ones and rewrites
+        the persisted state. Returns the number of raw rows compacted.
+        """
+        with self._lock:
+            current = now or datetime.now()
+            cutoff = current - policy.raw_max_age
+            n_old = bisect.bisect_left(self._time_keys, self._time_bound(cutoff))
+            if n_old:
+                for row in self._time_rows[:n_old]:
+                    self._rollups.add(self._metrics[row])
+                kept = [self._metrics[row] for row in sorted(self._time_rows[n_old:])]
+                self._metrics = self._new_rows()
+                for metric in kept:
+                    self._metrics.append(metric)
+                self._rebuild_indexes()
+            self._rollups.expire(policy, current)
+            self._sketches.expire(policy.daily_max_age, current)
+            if self._wal:
+                self._compact_wal()
+            elif self._store:
+                if self._metric_table:
+                    self._store.replace_metrics(  # type: ignore[union-attr]
+                        m.to_dict() for m in self._metrics
+                    )
+                    self._pending = []
+                self._persist(rewrite=True)
+            self._pending = []
+            return n_old
+
+    def _new_rows(self) -> list[EngagementMetric] | ColumnarMetrics:
+        if self._table is None:
+            return []
+        from kerygma_strategy.columnar import ColumnarMetrics
+        self._table = ColumnarMetrics()
+        return self._table
+
+    @property
+    def rollups(self) -> RollupStore:
+        """Time-bucketed aggregates of compacted history."""
+        return self._rollups
+
+    @property
+    def sketches(self) -> ChannelSketches:
+        return self._sketches
+
+    def distinct_content(
+        self, channel_id: str, start: datetime | None = None, end: datetime | None = None,
+    ) -> int:
+        """Approximate number of distinct content ids seen on a channel."""
+        with self._lock:
+            return self._sketches.distinct_content(channel_id, start, end)
+
+    def rate_quantiles(
+        self,
+        channel_id: str,
+        qs: tuple[float, ...] = (0.5, 0.9, 0.99),
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[float, float]:
+        """Approximate engagement-rate quantiles for a channel, e.g. p50/p90/p99."""
+        with self._lock:
+            return self._sketches.rate_quantiles(channel_id, qs, start, end)
+
+    def range(self, start: datetime, end: datetime) -> list[EngagementMetric]:
+        """Metrics with start <= timestamp <= end, in timestamp order.
+
+        Binary-searches the time index, so a window costs O(log N + k).
+        """
+        with self._lock:
+            lo = bisect.bisect_left(self._time_keys, self._time_bound(start))
+            hi = bisect.bisect_right(self._time_keys, self._time_bound(end), lo=lo)
+            return [self._metrics[row] for row in self._time_rows[lo:hi]]
 
     def aggregate_by_channel(self) -> dict[str, dict[str, int]]:
+        """All-time counter totals per channel, including compacted rows."""
+        with self._lock:
+            if self._verify_aggregates:
+                self.check_aggregates()
+            return {ch: dict(totals) for ch, totals in self._channel_totals.items()}
+
+    def top_content(self, limit: int = 5) -> list[tuple[str, float]]:
+        with self._lock:
+            if self._verify_aggregates:
+                self.check_aggregates()
+            averages = ((cid, total / count) for cid, (total, count) in self._content_rates.items())
+            return heapq.nlargest(limit, averages, key=lambda x: x[1])
+
+    def _recompute_aggregates(self) -> tuple[dict[str, dict[str, int]], dict[str, float]]:
+        """Full-scan channel totals and content rate means, ignoring running state."""
+        if self._table is not None:
+            return self._table.aggregate_by_channel(), self._table.content_rate_means()
         agg: dict[str, dict[str, int]] = {}
+        content_rates: dict[str, list[float]] = {}
         for m in self._metrics:
             if m.channel_id not in agg:
                 agg[m.channel_id] = {"impressions": 0, "clicks": 0, "shares": 0, "replies": 0}
@@ -120,19 +810,91 @@ def aggregate_by_channel(self) -> dict[str, dict[str, int]]:
             agg[m.channel_id]["clicks"] += m.clicks
             agg[m.channel_id]["shares"] += m.shares
             agg[m.channel_id]["replies"] += m.replies
-        return agg
-
-    def top_content(self, limit: int = 5) -> list[tuple[str, float]]:
-        content_rates: dict[str, list[float]] = {}
-        for m in self._metrics:
             content_rates.setdefault(m.content_id, []).append(m.engagement_rate)
-        averages = [(cid, sum(rates) / len(rates)) for cid, rates in content_rates.items()]
-        return sorted(averages, key=lambda x: x[1], reverse=True)[:limit]
+        means = {cid: sum(rates) / len(rates) for cid, rates in content_rates.items()}
+        return agg, means
+
+    def _recompute_with_rollups(self) -> tuple[dict[str, dict[str, int]], dict[str, float]]:
+        """Full recompute over raw rows plus compacted rollup buckets."""
+        channel_totals, content_means = self._recompute_aggregates()
+        if self._rollups.is_empty:
+            return channel_totals, content_means
+        for channel_id, bucket in self._rollups.channel_totals().items():
+            totals = channel_totals.setdefault(
+                channel_id, {"impressions": 0, "clicks": 0, "shares": 0, "replies": 0},
+            )
+            for name, value in bucket.counters().items():
+                totals[name] += value
+        raw_counts = {cid: len(rows) for cid, rows in self._by_content.items()}
+        for content_id, bucket in self._rollups.content_totals().items():
+            raw_n = raw_counts.get(content_id, 0)
+            raw_sum = content_means.get(content_id, 0.0) * raw_n
+            content_means[content_id] = (raw_sum + bucket.rate_sum) / (raw_n + bucket.count)
+        return channel_totals, content_means
+
+    def check_aggregates(self) -> None:
+        """Compare running aggregates with a full recompute.
+
+        Raises RuntimeError naming the first channel or content id whose
+        running value has drifted.
+        """
+        with self._lock:
+            channel_totals, content_means = self._recompute_with_rollups()
+            if channel_totals != self._channel_totals:
+                drifted = sorted(
+                    ch for ch in channel_totals.keys() | self._channel_totals.keys()
+                    if channel_totals.get(ch) != self._channel_totals.get(ch)
+                )
+                raise RuntimeError(f"Running channel aggregates drifted for '{drifted[0]}'")
+            for cid in content_means.keys() | self._content_rates.keys():
+                expected = content_means.get(cid)
+                running = self._content_rates.get(cid)
+                if (
+                    expected is None or running is None
+                    or not math.isclose(running[0] / running[1], expected, abs_tol=1e-12)
+                ):
+                    raise RuntimeError(f"Running content rate drifted for '{cid}'")
+
+    def view(
+        self,
+        channel_id: str | None = None,
+        content_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> MetricsView:
+        """Read-only view of the stored rows, optionally narrowed.
+
+        Narrowing uses the channel, content and time indexes, so only the
+        matching row positions are allocated, never the metrics. With a
+        time bound the view is in timestamp order, otherwise in arrival
+        order. Without arguments the view covers every row.
+        """
+        with self._lock:
+            selections: list[Sequence[int]] = []
+            if start is not None or end is not None:
+                lo = 0 if start is None else bisect.bisect_left(
+                    self._time_keys, self._time_bound(start),
+                )
+                hi = len(self._time_keys) if end is None else bisect.bisect_right(
+                    self._time_keys, self._time_bound(end), lo=lo,
+                )
+                selections.append(self._time_rows[lo:hi])
+            if channel_id is not None:
+                selections.append(self._by_channel.get(channel_id, []))
+            if content_id is not None:
+                selections.append(self._by_content.get(content_id, []))
+            if not selections:
+                return MetricsView(self._metrics)
+            positions = selections[0]
+            if len(selections) > 1:
+                keep = set.intersection(*(set(rows) for rows in selections[1:]))
+                positions = [row for row in positions if row in keep]
+            return MetricsView(self._metrics, positions)
 
     @property
-    def all_metrics(self) -> list[EngagementMetric]:
-        """Public read-only access to the full metrics list."""
-        return list(self._metrics)
+    def all_metrics(self) -> MetricsView:
+        """Read-only, zero-copy view of every stored metric."""
+        return self.view()
 
     @property
     def total_records(self) -> int:
@@ -52,25 +52,25 @@ def cmd_calendar(calendar_path: str, upcoming: bool) -> None:
         print(f"  {ev.event_id}: {ev.name} ({ev.event_type}) {ev.start_date}{end} [×{ev.posting_modifier}]")
 
 
-def cmd_report(analytics_path: str, reports_dir: str, period: str) -> None:
+def cmd_report(
+    analytics_path: str, reports_dir: str, period: str, compression: str | None = None,
+) -> None:
     from kerygma_strategy.analytics import AnalyticsCollector
-    from kerygma_strategy.persistence import JsonStore
     from kerygma_strategy.report_generator import ReportGenerator, ReportPeriod
 
-    store_path = Path(analytics_path)
-    store = JsonStore(store_path) if store_path.exists() else None
-    collector = AnalyticsCollector(store=store)
+    rp = ReportPeriod.weekly() if period == "weekly" else ReportPeriod.monthly()
+    # Only the report window is materialized; the rest of the store is skipped.
+    collector = AnalyticsCollector.from_stream(Path(analytics_path), start=rp.start, end=rp.end)
 
-    if collector.total_records == 0:
+    if collector.total_records == 0 and collector.rollups.is_empty:
         print("No analytics data to report.")
         return
 
     gen = ReportGenerator(collector)
-    rp = ReportPeriod.weekly() if period == "weekly" else ReportPeriod.monthly()
     report = gen.generate(rp)
 
     out_dir = Path(reports_dir)
-    files = gen.save_report(report, out_dir)
+    files = gen.save_report(report, out_dir, compression=compression)
     for f in files:
         print(f"  Created: {f}")
     print(gen.to_markdown(report))
@@ -93,6 +93,7 @@ def main(argv: list[str] | None = None) -> None:
 
     rep_p = sub.add_parser("report", help="Generate report")
     rep_p.add_argument("--monthly", action="store_true")
+    rep_p.add_argument("--compress", choices=["gzip", "lzma"], default=None)
 
     sub.add_parser("schedule", help="Show schedule")
 
@@ -109,7 +110,7 @@ def main(argv: list[str] | None = None) -> None:
         cmd_calendar(cfg.calendar_path, args.upcoming)
     elif args.command == "report":
         period = "monthly" if args.monthly else "weekly"
-        cmd_report(cfg.analytics_store_path, cfg.reports_directory, period)
+        cmd_report(cfg.analytics_store_path, cfg.reports_directory, period, args.compress)
     elif args.command == "schedule":
         cmd_schedule()
 
@@ -0,0 +1,198 @@
+"""Columnar storage engine for engagement metrics.
+
+Holds metrics as parallel typed arrays instead of one dataclass per row:
+channel and content ids are interned to integer codes, timestamps are
+epoch seconds, and counters are 64-bit ints. Aggregations run as
+vectorized passes over the buffers when NumPy is installed and fall back
+to tight loops over the stdlib arrays otherwise.
+
+Timestamps are stored to the second. Timezone-aware values are
+normalized to naive UTC, so materialized rows always carry naive
+datetimes.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timedelta
+from typing import overload
+
+from kerygma_strategy import codec
+from kerygma_strategy.analytics import EngagementMetric
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+_COUNTERS = ("impressions", "clicks", "shares", "replies")
+
+
+def to_epoch(ts: datetime) -> int:
+    """Convert a datetime to whole epoch seconds (naive values taken as UTC)."""
+    return codec.epoch_micros(ts) // 1_000_000
+
+
+def from_epoch(seconds: int) -> datetime:
+    """Inverse of to_epoch, returning a naive datetime."""
+    return codec.EPOCH + timedelta(seconds=seconds)
+
+
+class _Interner:
+    """Bidirectional string <-> dense integer code mapping."""
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self.codes[name] = code
+            self.names.append(name)
+        return code
+
+
+class ColumnarMetrics(Sequence[EngagementMetric]):
+    """Array-backed metric table exposing a lazy EngagementMetric view.
+
+    Indexing or iterating materializes EngagementMetric objects on demand;
+    the aggregation helpers never build per-row objects.
+    """
+
+    def __init__(self) -> None:
+        self._channels = _Interner()
+        self._contents = _Interner()
+        self._channel = array("q")
+        self._content = array("q")
+        self._timestamp = array("q")
+        self._impressions = array("q")
+        self._clicks = array("q")
+        self._shares = array("q")
+        self._replies = array("q")
+
+    def append(self, metric: EngagementMetric) -> None:
+        self._channel.append(self._channels.code(metric.channel_id))
+        self._content.append(self._contents.code(metric.content_id))
+        self._timestamp.append(to_epoch(metric.timestamp))
+        self._impressions.append(metric.impressions)
+        self._clicks.append(metric.clicks)
+        self._shares.append(metric.shares)
+        self._replies.append(metric.replies)
+
+    def __setitem__(self, index: int, metric: EngagementMetric) -> None:
+        """Overwrite one row in place (used by upserts)."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("metric index out of range")
+        self._channel[index] = self._channels.code(metric.channel_id)
+        self._content[index] = self._contents.code(metric.content_id)
+        self._timestamp[index] = to_epoch(metric.timestamp)
+        self._impressions[index] = metric.impressions
+        self._clicks[index] = metric.clicks
+        self._shares[index] = metric.shares
+        self._replies[index] = metric.replies
+
+    def _row(self, i: int) -> EngagementMetric:
+        return EngagementMetric(
+            channel_id=self._channels.names[self._channel[i]],
+            content_id=self._contents.names[self._content[i]],
+            timestamp=from_epoch(self._timestamp[i]),
+            impressions=self._impressions[i],
+            clicks=self._clicks[i],
+            shares=self._shares[i],
+            replies=self._replies[i],
+        )
+
+    def __len__(self) -> int:
+        return len(self._channel)
+
+    @overload
+    def __getitem__(self, index: int) -> EngagementMetric: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[EngagementMetric]: ...
+
+    def __getitem__(self, index: int | slice) -> EngagementMetric | list[EngagementMetric]:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("metric index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[EngagementMetric]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    # -- vectorized queries -------------------------------------------------
+
+    def aggregate_by_channel(self) -> dict[str, dict[str, int]]:
+        n_codes = len(self._channels.names)
+        if np is not None:
+            ch = np.frombuffer(self._channel, dtype=np.int64)
+            present = np.bincount(ch, minlength=n_codes) > 0
+            sums = {
+                name: np.bincount(
+                    ch, weights=np.frombuffer(getattr(self, f"_{name}"), dtype=np.int64),
+                    minlength=n_codes,
+                ).astype(np.int64).tolist()
+                for name in _COUNTERS
+            }
+            return {
+                self._channels.names[code]: {name: sums[name][code] for name in _COUNTERS}
+                for code in range(n_codes) if present[code]
+            }
+        agg: dict[int, list[int]] = {}
+        for code, imp, clk, shr, rep in zip(
+            self._channel, self._impressions, self._clicks, self._shares, self._replies,
+        ):
+            totals = agg.get(code)
+            if totals is None:
+                totals = agg[code] = [0, 0, 0, 0]
+            totals[0] += imp
+            totals[1] += clk
+            totals[2] += shr
+            totals[3] += rep
+        return {
+            self._channels.names[code]: dict(zip(_COUNTERS, totals))
+            for code, totals in sorted(agg.items())
+        }
+
+    def content_rate_means(self) -> dict[str, float]:
+        """Mean per-row engagement rate for every content id."""
+        n_codes = len(self._contents.names)
+        if np is not None:
+            content = np.frombuffer(self._content, dtype=np.int64)
+            imp = np.frombuffer(self._impressions, dtype=np.int64)
+            engaged = (
+                np.frombuffer(self._clicks, dtype=np.int64)
+                + np.frombuffer(self._shares, dtype=np.int64)
+                + np.frombuffer(self._replies, dtype=np.int64)
+            )
+            rates = np.divide(
+                engaged, imp, out=np.zeros(len(imp), dtype=np.float64), where=imp != 0,
+            )
+            counts = np.bincount(content, minlength=n_codes)
+            sums = np.bincount(content, weights=rates, minlength=n_codes)
+            return {
+                self._contents.names[code]: float(sums[code] / counts[code])
+                for code in range(n_codes) if counts[code]
+            }
+        acc: dict[int, list[float]] = {}
+        for code, imp, clk, shr, rep in zip(
+            self._content, self._impressions, self._clicks, self._shares, self._replies,
+        ):
+            entry = acc.get(code)
+            if entry is None:
+                entry = acc[code] = [0.0, 0]
+            entry[0] += (clk + shr + rep) / imp if imp else 0.0
+            entry[1] += 1
+        return {
+            self._contents.names[code]: total / count
+            for code, (total, count) in sorted(acc.items())
+        }
@@ -8,13 +8,13 @@
 """
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from kerygma_strategy import codec
 from kerygma_strategy.calendar import DistributionCalendar
 from kerygma_strategy.channels import ChannelRegistry
 from kerygma_strategy.scheduler import Frequency
@@ -129,8 +129,12 @@ def build_channel_report(fixtures_dir: Path | None = None) -> dict[str, Any]:
 def export_all(
     fixtures_dir: Path | None = None,
     output_dir: Path | None = None,
+    compact: bool = False,
 ) -> list[Path]:
-    """Generate all data artifacts and return output paths."""
+    """Generate all data artifacts and return output paths.
+
+    ``compact`` writes the JSON without indentation for machine consumers.
+    """
     fixtures_dir = fixtures_dir or FIXTURES_DIR
     output_dir = output_dir or REPO_ROOT / "data"
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -146,7 +150,7 @@ def export_all(
         "repo": "distribution-strategy",
         **plan,
     }
-    plan_path.write_text(json.dumps(plan_data, indent=2) + "\n")
+    plan_path.write_text(codec.dumps(plan_data, compact) + "\n", encoding="utf-8")
     outputs.append(plan_path)
 
     # channel-report.json
@@ -159,7 +163,7 @@ def export_all(
         "repo": "distribution-strategy",
         **report,
     }
-    report_path.write_text(json.dumps(report_data, indent=2) + "\n")
+    report_path.write_text(codec.dumps(report_data, compact) + "\n", encoding="utf-8")
     outputs.append(report_path)
 
     return outputs
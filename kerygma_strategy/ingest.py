@@ -0,0 +1,148 @@
+"""Concurrent ingestion front end for AnalyticsCollector.
+
+Producer threads hand metrics to a ConcurrentIngestor, which pushes them
+onto a bounded ``queue.Queue``. A single writer thread drains the queue in
+batches, applies them to the collector and performs any persistence, so
+producers never block on indexing or disk I/O, only on a full queue.
+Under CPython's GIL the writer bounds the durable rate: more producer
+threads return sooner but do not ingest faster.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, Self
+
+if TYPE_CHECKING:
+    from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+
+_STOP = object()
+
+
+class ConcurrentIngestor:
+    """Single-writer ingestion queue in front of an AnalyticsCollector.
+
+    submit() is safe to call from any number of threads and blocks once
+    ``max_pending`` items (a submit_many() batch counts as one) are
+    waiting. The writer thread applies up to ``batch_size`` queued metrics
+    at a time and flushes the collector whenever the queue has been idle
+    for ``flush_interval`` seconds. Errors raised on the writer thread are
+    re-raised from the next submit(), wait_idle() or close().
+    """
+
+    def __init__(
+        self,
+        collector: AnalyticsCollector,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self._collector = collector
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._error: Exception | None = None
+        self._writer = threading.Thread(
+            target=self._run, name="analytics-ingest-writer", daemon=True,
+        )
+        self._writer.start()
+
+    def submit(self, metric: EngagementMetric) -> None:
+        """Queue a metric for ingestion; blocks only while the queue is full."""
+        self._check_open()
+        self._queue.put(metric)
+
+    def submit_many(self, metrics: Iterable[EngagementMetric]) -> None:
+        """Queue a batch of metrics as a single queue item."""
+        self._check_open()
+        self._queue.put(list(metrics))
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until everything submitted so far has been applied and flushed."""
+        marker = threading.Event()
+        self._queue.put(marker)
+        done = marker.wait(timeout)
+        self._raise_writer_error()
+        return done
+
+    def close(self, timeout: float | None = None) -> None:
+        """Apply remaining items, flush the collector and stop the writer."""
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+        self._raise_writer_error()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("ConcurrentIngestor is closed")
+        self._raise_writer_error()
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("analytics ingest writer failed") from error
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                self._safely(self._collector.flush)
+                continue
+            batch: list[EngagementMetric] = []
+            markers: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                elif isinstance(item, list):
+                    batch.extend(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._safely(self._apply, batch)
+            if markers or stop:
+                self._safely(self._collector.flush)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _apply(self, batch: list[EngagementMetric]) -> None:
+        try:
+            self._collector.record_many(batch)
+        except (TypeError, ValueError):
+            # record_many() rejects the whole batch for one bad item; record
+            # the rest one at a time and surface the first rejection.
+            error: Exception | None = None
+            for metric in batch:
+                try:
+                    self._collector.record_many([metric])
+                except (TypeError, ValueError) as exc:
+                    error = error or exc
+            if error is not None:
+                raise error from None
+
+    def _safely(self, fn: Callable[..., object], *args: Any) -> None:
+        try:
+            fn(*args)
+        except Exception as exc:  # noqa: BLE001 - surfaced to producers
+            self._error = exc
@@ -1,51 +1,428 @@
 """JSON file persistence with atomic writes.
 
 Provides a JsonStore class for safely reading/writing JSON data
-to disk with atomic os.replace to prevent corruption.
+to disk with atomic os.replace to prevent corruption, an
+AppendLog for log-structured record persistence (NDJSON tail plus
+periodically compacted snapshot), and a SqliteStore exposing the
+JsonStore interface on top of SQLite with a native metrics table.
 """
 
 from __future__ import annotations
 
-import json
+import mmap
 import os
+import sqlite3
+import threading
+from collections.abc import Collection, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Self
+
+from kerygma_strategy import codec
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+_MANIFEST_KEY = "__jsonstore_segments__"
+_WRITER_CHUNK = 2048
+
+
+def _segment_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".segments")
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def _lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
+
+
+def _signature(path: Path) -> tuple[int, int, int] | None:
+    """Identity of the file's current version; atomic replaces change the inode."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _encode_value(
+    value: Any, compact: bool, chunk: int = 0, indent: bytes = b"",
+) -> list[bytes]:
+    """Encode ``value`` as byte parts, nested ``indent`` deeper.
+
+    With ``chunk`` set, long lists are encoded that many items at a time.
+    The parts join to the same bytes as one call, but other threads can
+    take the GIL between chunks.
+    """
+    if not chunk or not isinstance(value, list) or len(value) <= chunk:
+        encoded = codec.dumps_bytes(value, compact)
+        return [encoded.replace(b"\n", b"\n" + indent) if indent else encoded]
+    parts = [b"["]
+    for i in range(0, len(value), chunk):
+        encoded = codec.dumps_bytes(value[i:i + chunk], compact)
+        inner = encoded[1:-1] if compact else encoded[1:-2]
+        if indent:
+            inner = inner.replace(b"\n", b"\n" + indent)
+        parts += [b"," if i else b"", inner]
+    parts.append(b"]" if compact else b"\n" + indent + b"]")
+    return parts
+
+
+def _encode_with_offsets(
+    data: dict[str, Any], compact: bool, chunk: int = 0,
+) -> tuple[list[bytes], dict[str, list[int]]]:
+    """Encode a top-level object as byte parts, recording each value's span.
+
+    The joined output is identical to encoding ``data`` in one call:
+    encoded strings never contain raw newlines, so nested values are
+    re-indented by prefixing their line breaks.
+    """
+    parts = [b"{"]
+    pos = 1
+    offsets: dict[str, list[int]] = {}
+    for i, (key, value) in enumerate(data.items()):
+        head = (b"," if i else b"") + (b"" if compact else b"\n  ")
+        head += codec.dumps_bytes(key) + (b":" if compact else b": ")
+        encoded = _encode_value(value, compact, chunk, b"" if compact else b"  ")
+        size = sum(len(part) for part in encoded)
+        pos += len(head)
+        offsets[key] = [pos, pos + size]
+        pos += size
+        parts.append(head)
+        parts += encoded
+    parts.append(b"}" if compact or not data else b"\n}")
+    return parts, offsets
 
 
 class JsonStore:
     """Persistent JSON key-value store with atomic writes."""
 
-    def __init__(self, path: Path | None = None) -> None:
+    def __init__(
+        self,
+        path: Path | None = None,
+        segmented: bool = False,
+        compact: bool = False,
+        write_index: bool = False,
+        locking: bool = False,
+        background: bool = False,
+        compression: str | None = None,
+    ) -> None:
+        """Open the store at ``path`` (None keeps it in memory only).
+
+        ``segmented=True`` keeps each key in its own file under
+        ``<name>.segments/`` behind a manifest at ``path``; a monolithic
+        file is converted on its next save. ``compact=True`` drops the
+        indentation, and ``write_index=True`` writes a ``<name>.idx`` offset
+        sidecar for MappedJsonStore. ``compression`` ("gzip" or "lzma",
+        inferred from a ``.gz``/``.xz`` suffix) applies to every file
+        written and excludes ``write_index``; compressed files are read
+        either way. ``locking=True`` lets several processes share the file
+        and ``background=True`` moves writes to a thread; see save().
+        """
+        if compression is None and path is not None:
+            compression = codec.compression_for(path)
+        self._compression = codec.check_compression(compression)
+        if self._compression and write_index:
+            raise ValueError("write_index requires an uncompressed store")
         self._path = path
         self._data: dict[str, Any] = {}
+        self._segmented = segmented
+        self._compact = compact
+        self._write_index = write_index
+        self._locking = locking
+        self._segments: dict[str, str] = {}
+        self._next_segment = 0
+        self._dirty: set[str] = set()
+        self._appended: dict[str, list[Any]] = {}
+        self._signature: tuple[int, int, int] | None = None
+        self._writer: threading.Thread | None = None
+        self._cond = threading.Condition()
+        self._queued: tuple[dict[str, Any], set[str], dict[str, list[Any]]] | None = None
+        self._writing = False
+        self._closing = False
+        self._error: Exception | None = None
+        if background and path:
+            self._writer = threading.Thread(
+                target=self._run_writer, name=f"jsonstore-writer-{path.name}", daemon=True,
+            )
+            self._writer.start()
         if path and path.exists():
-            self._load()
+            with self._locked(exclusive=False):
+                # Stat before reading: a replace in between then shows up as
+                # a (harmless) conflict on the next save instead of a miss.
+                self._signature = _signature(path)
+                self._load()
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        if not self._locking or not self._path or fcntl is None:
+            yield
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock_path(self._path).open("a+b") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
 
     def _load(self) -> None:
         if not self._path or not self._path.exists():
             return
         try:
-            self._data = json.loads(self._path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, TypeError):
-            self._data = {}
+            data = codec.loads(codec.read_bytes(self._path))
+        except (ValueError, TypeError):
+            data = {}
+        if isinstance(data, dict) and _MANIFEST_KEY in data:
+            self._load_segments(self._path, data[_MANIFEST_KEY])
+        else:
+            self._data = data
+            if self._segmented:
+                self._dirty = set(self._data)
+
+    def _load_segments(self, path: Path, manifest: dict[str, Any]) -> None:
+        self._segmented = True
+        self._segments = dict(manifest.get("segments", {}))
+        self._next_segment = manifest.get("next", len(self._segments))
+        directory = _segment_dir(path)
+        for key, name in self._segments.items():
+            try:
+                self._data[key] = codec.loads(codec.read_bytes(directory / name))
+            except (OSError, ValueError):
+                self._data.pop(key, None)
 
     def save(self) -> None:
-        """Write data to disk atomically."""
+        """Write data to disk atomically.
+
+        A monolithic store rewrites its file, so values mutated in place are
+        saved too. A segmented store writes only the dirty keys' segments
+        (nothing when none are dirty, so in-place mutations need set()),
+        then swaps the manifest before deleting superseded segments.
+
+        With ``locking=True`` the write holds an exclusive lock on
+        ``<name>.lock``. If another writer changed the file since this store
+        last read it, unsaved changes are rebased onto it: append()ed items
+        extend the other writer's list, other dirty keys replace its values
+        and clean keys take them. Without fcntl the rebase still runs but
+        writes are not mutually exclusive.
+
+        In background mode this only hands a snapshot (top-level lists
+        copied, other values must not be mutated afterwards) to the writer
+        thread, which coalesces queued saves; use wait_durable() to block
+        until it is on disk.
+        """
         if not self._path:
+            self._dirty.clear()
+            self._appended.clear()
+            return
+        self._raise_writer_error()
+        # Only segmented saves are driven by dirty keys; a monolithic save
+        # also persists values mutated in place, so it always writes.
+        if self._segmented and not self._dirty and self._path.exists():
             return
+        if self._writer is None:
+            self._data = self._write(self._data, self._dirty, self._appended)
+            self._dirty.clear()
+            self._appended.clear()
+            return
+        # Top-level lists are copied because append() extends them in place.
+        data = {k: list(v) if isinstance(v, list) else v for k, v in self._data.items()}
+        with self._cond:
+            dirty, appended = self._dirty, self._appended
+            self._dirty, self._appended = set(), {}
+            if self._queued is None:
+                self._queued = (data, dirty, appended)
+            else:
+                # Coalesce: the newest snapshot wins, carrying every key
+                # dirtied since the last write.
+                _, queued_dirty, queued_appended = self._queued
+                for key in dirty:
+                    if key in appended and (key in queued_appended or key not in queued_dirty):
+                        queued_appended.setdefault(key, []).extend(appended[key])
+                    else:
+                        queued_appended.pop(key, None)
+                self._queued = (data, queued_dirty | dirty, queued_appended)
+            self._cond.notify_all()
+
+    def _write(
+        self, data: dict[str, Any], dirty: set[str], appended: dict[str, list[Any]],
+    ) -> dict[str, Any]:
+        """Write one snapshot; returns the data as written (rebased on conflict)."""
+        assert self._path is not None
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self._path.with_suffix(".tmp")
-        tmp.write_text(json.dumps(self._data, indent=2, default=str), encoding="utf-8")
-        os.replace(str(tmp), str(self._path))
+        # The writer thread encodes in chunks so it does not hold the GIL
+        # against ingest for a whole document.
+        chunk = _WRITER_CHUNK if self._writer is not None else 0
+        with self._locked(exclusive=True):
+            rebased = self._locking and _signature(self._path) != self._signature
+            if rebased:
+                data = self._rebase(data, dirty, appended)
+            if self._segmented:
+                self._save_segments(self._path, data, dirty, chunk)
+            elif self._write_index or chunk:
+                payload, offsets = _encode_with_offsets(data, self._compact, chunk)
+                self._write_atomic(self._path, payload)
+                if self._write_index:
+                    stat = self._path.stat()
+                    index = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "keys": offsets}
+                    _index_path(self._path).write_bytes(codec.dumps_bytes(index, compact=True))
+            else:
+                self._write_atomic(self._path, codec.dumps_bytes(data, self._compact))
+            # A background rebase is not seen by the in-memory data, so keep
+            # the old signature and rebase again on the next write.
+            if not (rebased and self._writer is not None):
+                self._signature = _signature(self._path)
+        return data
+
+    def _rebase(
+        self, data: dict[str, Any], dirty: set[str], appended: dict[str, list[Any]],
+    ) -> dict[str, Any]:
+        """Re-apply unsaved changes on top of the file's current contents."""
+        assert self._path is not None
+        disk = JsonStore(self._path, segmented=self._segmented, compression=self._compression)
+        merged = disk._data
+        for key in dirty:
+            if key in appended:
+                base = merged.get(key)
+                merged[key] = (base if isinstance(base, list) else []) + appended[key]
+            elif key in data:
+                merged[key] = data[key]
+            else:
+                merged.pop(key, None)
+        if disk._segmented:
+            self._segments = disk._segments
+            self._next_segment = disk._next_segment
+        return merged
+
+    def _write_atomic(self, path: Path, payload: bytes | list[bytes]) -> None:
+        tmp = path.with_suffix(".tmp")
+        codec.write_bytes(tmp, payload, self._compression)
+        os.replace(str(tmp), str(path))
+
+    def _save_segments(
+        self, path: Path, data: dict[str, Any], dirty: set[str], chunk: int = 0,
+    ) -> None:
+        directory = _segment_dir(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        superseded: list[str] = []
+        for key in dirty:
+            old = self._segments.pop(key, None)
+            if old is not None:
+                superseded.append(old)
+            if key not in data:
+                continue
+            name = f"seg-{self._next_segment:08d}.json"
+            self._next_segment += 1
+            # Fresh file names mean the live manifest never points at a
+            # partially written segment.
+            codec.write_bytes(
+                directory / name, _encode_value(data[key], self._compact, chunk), self._compression,
+            )
+            self._segments[key] = name
+        manifest = {_MANIFEST_KEY: {"segments": self._segments, "next": self._next_segment}}
+        self._write_atomic(path, codec.dumps_bytes(manifest))
+        for name in superseded:
+            (directory / name).unlink(missing_ok=True)
+
+    def wait_durable(self, timeout: float | None = None) -> bool:
+        """Block until every save() so far is on disk; False on timeout.
+
+        Returns immediately for synchronous stores. A failed background
+        write is re-raised here as RuntimeError.
+        """
+        if self._writer is not None:
+            with self._cond:
+                done = self._cond.wait_for(
+                    lambda: self._queued is None and not self._writing, timeout,
+                )
+            if not done:
+                return False
+        self._raise_writer_error()
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        """Finish pending background writes and stop the writer thread.
+
+        Later save() calls write synchronously.
+        """
+        writer = self._writer
+        if writer is None:
+            return
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        writer.join(timeout)
+        if not writer.is_alive():
+            self._writer = None
+        self._raise_writer_error()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("JsonStore background save failed") from error
+
+    def _run_writer(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queued is not None or self._closing)
+                job, self._queued = self._queued, None
+                if job is None:
+                    return
+                self._writing = True
+            error: Exception | None = None
+            try:
+                self._write(*job)
+            except Exception as exc:  # noqa: BLE001 - surfaced to the caller
+                error = exc
+            with self._cond:
+                if error is not None:
+                    self._error = error
+                    # Carry the failed keys into the next save().
+                    self._dirty |= job[1]
+                self._writing = False
+                self._cond.notify_all()
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         self._data[key] = value
+        self._dirty.add(key)
+        self._appended.pop(key, None)
+
+    def append(self, key: str, items: Iterable[Any]) -> None:
+        """Extend the list stored at ``key``, creating it if missing.
+
+        With ``locking=True`` the items are merged into another writer's
+        list on conflict, where set() would replace it.
+        """
+        values = list(items)
+        if key in self._data and not isinstance(self._data[key], list):
+            self.set(key, values)
+            return
+        # Appended items are only needed to rebase a file write.
+        if self._path is not None and (key not in self._dirty or key in self._appended):
+            self._appended.setdefault(key, []).extend(values)
+        self._data.setdefault(key, []).extend(values)
+        self._dirty.add(key)
 
     def delete(self, key: str) -> None:
-        self._data.pop(key, None)
+        if key in self._data or key in self._segments:
+            self._data.pop(key, None)
+            self._dirty.add(key)
+            self._appended.pop(key, None)
 
     def keys(self) -> list[str]:
         return list(self._data.keys())
@@ -54,12 +431,465 @@ def to_dict(self) -> dict[str, Any]:
         return dict(self._data)
 
     @classmethod
-    def from_dict(cls, data: dict[str, Any], path: Path | None = None) -> JsonStore:
-        store = cls(path=None)
+    def from_dict(
+        cls,
+        data: dict[str, Any],
+        path: Path | None = None,
+        segmented: bool = False,
+        compact: bool = False,
+        write_index: bool = False,
+        locking: bool = False,
+        compression: str | None = None,
+    ) -> JsonStore:
+        if compression is None and path is not None:
+            compression = codec.compression_for(path)
+        store = cls(
+            path=None, segmented=segmented, compact=compact,
+            write_index=write_index, locking=locking, compression=compression,
+        )
         store._data = dict(data)
         store._path = path
+        store._dirty = set(store._data)
         return store
 
     @property
     def is_persistent(self) -> bool:
         return self._path is not None
+
+    @property
+    def dirty_keys(self) -> set[str]:
+        """Keys changed since the last save."""
+        return set(self._dirty)
+
+
+class MappedJsonStore:
+    """Read-only JsonStore view that decodes values only when requested.
+
+    The file is memory-mapped and the top-level key -> byte span index is
+    read from the ``<name>.idx`` sidecar that ``JsonStore(write_index=True)``
+    writes, so opening costs no decoding; get() decodes and caches one
+    value. Without a sidecar matching the file's size and mtime the
+    document is decoded once at open, as JsonStore would; so is a
+    compressed file, which cannot be sliced. Segmented stores are read
+    through their manifest, one segment per get(). Mutating methods raise
+    RuntimeError.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._cache: dict[str, Any] = {}
+        self._segments: dict[str, str] | None = None
+        self._offsets: dict[str, list[int]] = {}
+        self._fh = path.open("rb")
+        size = os.fstat(self._fh.fileno()).st_size
+        self._map: mmap.mmap | None = None
+        if size:
+            self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            compressed = codec.detect_compression(self._map[:6]) is not None
+            offsets = None if compressed else self._read_index(size)
+            if offsets is not None:
+                self._offsets = offsets
+            else:
+                try:
+                    data = codec.loads(codec.read_bytes(path) if compressed else self._map[:])
+                except ValueError:
+                    data = {}
+                self._cache = data if isinstance(data, dict) else {}
+        manifest = self.get(_MANIFEST_KEY)
+        if manifest is not None:
+            self._cache.clear()
+            self._segments = dict(manifest.get("segments", {}))
+
+    def _read_index(self, size: int) -> dict[str, list[int]] | None:
+        index_path = _index_path(self._path)
+        try:
+            index = codec.loads(index_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        stat = os.fstat(self._fh.fileno())
+        if index.get("size") != size or index.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+        return index.get("keys")
+
+    def _decode(self, key: str) -> Any:
+        start, end = self._offsets[key]
+        if self._map is None:
+            raise KeyError(key)
+        return codec.loads(self._map[start:end])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        if self._segments is not None:
+            name = self._segments.get(key)
+            if name is None:
+                return default
+            value = codec.loads(codec.read_bytes(_segment_dir(self._path) / name))
+        elif key in self._offsets:
+            value = self._decode(key)
+        else:
+            return default
+        self._cache[key] = value
+        return value
+
+    def keys(self) -> list[str]:
+        if self._segments is not None:
+            return list(self._segments)
+        return list(self._offsets or self._cache)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: self.get(key) for key in self.keys()}
+
+    @property
+    def is_persistent(self) -> bool:
+        return True
+
+    def set(self, key: str, value: Any) -> None:
+        raise RuntimeError("MappedJsonStore is read-only")
+
+    def delete(self, key: str) -> None:
+        raise RuntimeError("MappedJsonStore is read-only")
+
+    def save(self) -> None:
+        raise RuntimeError("MappedJsonStore is read-only")
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._fh.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class AppendLog:
+    """Append-only NDJSON record log with a compacted JSON snapshot.
+
+    New records are appended to ``<name>.<generation>.log`` one JSON object
+    per line, so flush cost is proportional to the unsaved records only.
+    Appends are fsynced once ``fsync_every`` records have accumulated (and
+    on sync()/close()). compact() writes every live record into the snapshot
+    at ``path`` under the next generation and starts a fresh log; replay()
+    yields the snapshot followed by the tail of the matching log. A crash
+    between the snapshot write and the log switch leaves the old log
+    orphaned under a stale generation, where replay ignores it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_every: int = 100,
+        compact_every: int = 10_000,
+    ) -> None:
+        self._path = path
+        self._fsync_every = fsync_every
+        self._compact_every = compact_every
+        self._generation = 0
+        self._tail_records = 0
+        self._unsynced = 0
+        self._handle: IO[str] | None = None
+        self._snapshot: list[dict[str, Any]] = []
+        self._meta: dict[str, Any] = {}
+        if path.exists():
+            try:
+                snapshot = codec.loads(path.read_bytes())
+            except ValueError:
+                snapshot = None
+            if isinstance(snapshot, dict):
+                self._generation = snapshot.get("generation", 0)
+                self._snapshot = snapshot.get("records", [])
+                self._meta = snapshot.get("meta", {})
+        self._snapshot_size = len(self._snapshot)
+
+    def _log_path(self, generation: int) -> Path:
+        return self._path.with_name(f"{self._path.name}.{generation}.log")
+
+    def replay(self) -> Iterator[dict[str, Any]]:
+        """Yield snapshot records, then every intact record in the log tail.
+
+        A torn final line (from a crash mid-append) is truncated away so
+        later appends start on a clean line boundary.
+        """
+        snapshot, self._snapshot = self._snapshot, []
+        yield from snapshot
+        log_path = self._log_path(self._generation)
+        self._tail_records = 0
+        if not log_path.exists():
+            return
+        good_offset = 0
+        torn = False
+        with log_path.open("rb") as fh:
+            for line in fh:
+                try:
+                    record = codec.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    torn = True
+                    break
+                good_offset += len(line)
+                self._tail_records += 1
+                yield record
+        if torn:
+            with log_path.open("r+b") as fh:
+                fh.truncate(good_offset)
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        """Append records to the log tail, fsyncing per the batching policy."""
+        if self._handle is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._log_path(self._generation).open("a", encoding="utf-8")
+        count = 0
+        for record in records:
+            self._handle.write(codec.dumps(record, compact=True) + "\n")
+            count += 1
+        self._handle.flush()
+        self._tail_records += count
+        self._unsynced += count
+        if self._unsynced >= self._fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Fsync any appended-but-unsynced records."""
+        if self._handle is not None and self._unsynced:
+            os.fsync(self._handle.fileno())
+        self._unsynced = 0
+
+    def compact(
+        self, records: Iterable[dict[str, Any]], meta: dict[str, Any] | None = None,
+    ) -> None:
+        """Rewrite the snapshot from ``records`` and start an empty log.
+
+        ``meta`` is stored alongside the records (replacing any previous
+        value) for state that only changes at compaction time.
+        """
+        self.close()
+        old_log = self._log_path(self._generation)
+        generation = self._generation + 1
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            if meta is not None:
+                self._meta = meta
+            snapshot = {"generation": generation, "records": list(records), "meta": self._meta}
+            fh.write(codec.dumps_bytes(snapshot, compact=True))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(str(tmp), str(self._path))
+        self._generation = generation
+        self._tail_records = 0
+        old_log.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self.sync()
+            self._handle.close()
+            self._handle = None
+
+    @property
+    def snapshot_size(self) -> int:
+        """Number of records in the snapshot at open time."""
+        return self._snapshot_size
+
+    @property
+    def meta(self) -> dict[str, Any]:
+        return self._meta
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._tail_records >= self._compact_every
+
+    @property
+    def tail_records(self) -> int:
+        return self._tail_records
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    impressions INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    shares INTEGER NOT NULL DEFAULT 0,
+    replies INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS metrics_ts ON metrics (ts);
+CREATE INDEX IF NOT EXISTS metrics_channel_ts ON metrics (channel_id, ts);
+"""
+
+_METRIC_COLUMNS = ("channel_id", "content_id", "timestamp", "impressions", "clicks", "shares", "replies")
+
+
+class SqliteStore:
+    """JsonStore-compatible key-value store backed by SQLite.
+
+    get/set/delete/keys/save behave as on JsonStore: values are JSON
+    encoded into a ``kv`` table and changes become durable on save(),
+    which commits the open transaction. File-backed databases run in WAL
+    journal mode. Metric records live in a separate indexed ``metrics``
+    table that AnalyticsCollector appends (or, in upsert mode, upserts) to
+    on flush and that iter_metrics() range-queries directly; they are not
+    part of keys().
+    Without a path the database is in memory.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        # The collector serializes access; the ingest writer thread may flush.
+        self._conn = sqlite3.connect(str(path) if path else ":memory:", check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def save(self) -> None:
+        """Commit pending changes."""
+        self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return default if row is None else codec.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)",
+            (key, codec.dumps(value, compact=True)),
+        )
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def keys(self) -> list[str]:
+        return [row[0] for row in self._conn.execute("SELECT key FROM kv ORDER BY rowid")]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            key: codec.loads(value)
+            for key, value in self._conn.execute("SELECT key, value FROM kv ORDER BY rowid")
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], path: Path | None = None) -> SqliteStore:
+        """Create a store holding ``data``, with ``metrics`` in the metrics table."""
+        store = cls(path)
+        for key, value in data.items():
+            if key == "metrics":
+                store.replace_metrics(value)
+            else:
+                store.set(key, value)
+        return store
+
+    @property
+    def is_persistent(self) -> bool:
+        return self._path is not None
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    # -- metrics table ------------------------------------------------------
+
+    def append_metrics(self, records: Iterable[dict[str, Any]]) -> None:
+        """Insert metric dicts (EngagementMetric.to_dict() shape); durable on save()."""
+        self._conn.executemany(
+            "INSERT INTO metrics (channel_id, content_id, timestamp, ts,"
+            " impressions, clicks, shares, replies) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    r["channel_id"], r["content_id"], str(r["timestamp"]),
+                    codec.epoch_micros(r["timestamp"]),
+                    r.get("impressions", 0), r.get("clicks", 0),
+                    r.get("shares", 0), r.get("replies", 0),
+                )
+                for r in records
+            ),
+        )
+
+    def upsert_metrics(self, records: Iterable[dict[str, Any]], key: Sequence[str]) -> None:
+        """Update the stored row matching each record on ``key``, inserting it if none does.
+
+        ``key`` names metric fields (a timestamp matches on its ``ts``
+        value); an index over those columns is created on first use.
+        """
+        unknown = set(key) - set(_METRIC_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown metric columns: {', '.join(sorted(unknown))}")
+        columns = ["ts" if name == "timestamp" else name for name in key]
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS metrics_key_{'_'.join(columns)}"
+            f" ON metrics ({', '.join(columns)})"
+        )
+        update = (
+            "UPDATE metrics SET timestamp = ?, ts = ?, impressions = ?, clicks = ?,"
+            f" shares = ?, replies = ? WHERE {' AND '.join(f'{c} = ?' for c in columns)}"
+        )
+        for r in records:
+            ts = codec.epoch_micros(r["timestamp"])
+            match = [ts if c == "ts" else r[c] for c in columns]
+            cursor = self._conn.execute(update, (
+                str(r["timestamp"]), ts, r.get("impressions", 0), r.get("clicks", 0),
+                r.get("shares", 0), r.get("replies", 0), *match,
+            ))
+            if cursor.rowcount == 0:
+                self.append_metrics([r])
+
+    def replace_metrics(self, records: Iterable[dict[str, Any]]) -> None:
+        """Replace the whole metrics table (used after compaction)."""
+        self._conn.execute("DELETE FROM metrics")
+        self.append_metrics(records)
+
+    def iter_metrics(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        channels: Collection[str] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield stored metric dicts in insertion order, filtered in SQL.
+
+        ``start`` and ``end`` are inclusive and use the ``ts`` index.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(codec.epoch_micros(start))
+        if end is not None:
+            clauses.append("ts <= ?")
+            params.append(codec.epoch_micros(end))
+        if channels is not None:
+            channels = list(channels)
+            clauses.append(f"channel_id IN ({','.join('?' * len(channels))})")
+            params.extend(channels)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._conn.execute(
+            f"SELECT {', '.join(_METRIC_COLUMNS)} FROM metrics{where} ORDER BY id", params,
+        )
+        for row in cursor:
+            yield dict(zip(_METRIC_COLUMNS, row))
+
+    def count_metrics(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0]
+
+    @classmethod
+    def migrate_from_json(cls, json_path: Path, path: Path) -> SqliteStore:
+        """Create a SqliteStore at ``path`` holding a JsonStore file's contents.
+
+        The ``metrics`` key is moved into the metrics table; every other key
+        is copied into the key-value table. The JSON file is left in place.
+        """
+        store = cls.from_dict(JsonStore(json_path).to_dict(), path)
+        store.save()
+        return store
@@ -6,13 +6,14 @@
 
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from kerygma_strategy import codec
 from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.rollups import RollupStore
 
 
 @dataclass
@@ -60,55 +61,120 @@ def to_dict(self) -> dict[str, Any]:
         }
 
 
+@dataclass
+class PartialAggregate:
+    """Mergeable report totals for one slice of the metrics.
+
+    Partials computed independently (per shard, per process) combine with
+    merge() into the same totals a single pass over all rows would give.
+    """
+    total_metrics: int = 0
+    channel_summary: dict[str, dict[str, int]] = field(default_factory=dict)
+    content_rates: dict[str, list[float]] = field(default_factory=dict)
+    total_impressions: int = 0
+    total_engagement: int = 0
+
+    def _channel(self, channel_id: str) -> dict[str, int]:
+        summary = self.channel_summary.get(channel_id)
+        if summary is None:
+            summary = self.channel_summary[channel_id] = {
+                "impressions": 0, "clicks": 0, "shares": 0, "replies": 0,
+            }
+        return summary
+
+    def add(self, m: EngagementMetric) -> None:
+        summary = self._channel(m.channel_id)
+        summary["impressions"] += m.impressions
+        summary["clicks"] += m.clicks
+        summary["shares"] += m.shares
+        summary["replies"] += m.replies
+        self.total_metrics += 1
+        self.total_impressions += m.impressions
+        self.total_engagement += m.clicks + m.shares + m.replies
+        rates = self.content_rates.setdefault(m.content_id, [0.0, 0])
+        rates[0] += m.engagement_rate
+        rates[1] += 1
+
+    def add_rollups(self, rollups: RollupStore, start: datetime, end: datetime) -> None:
+        """Fold in rollup buckets starting in [start, end] at the finest retained granularity."""
+        if rollups.is_empty:
+            return
+        granularity = rollups.granularity_for(start)
+        for ch_id, bucket in rollups.channel_totals(start, end, granularity).items():
+            summary = self._channel(ch_id)
+            for name, value in bucket.counters().items():
+                summary[name] += value
+            self.total_metrics += bucket.count
+            self.total_impressions += bucket.impressions
+            self.total_engagement += bucket.clicks + bucket.shares + bucket.replies
+        for cid, bucket in rollups.content_totals(start, end, granularity).items():
+            rates = self.content_rates.setdefault(cid, [0.0, 0])
+            rates[0] += bucket.rate_sum
+            rates[1] += bucket.count
+
+    def merge(self, other: PartialAggregate) -> PartialAggregate:
+        """Add another partial's totals into this one and return self."""
+        for ch_id, stats in other.channel_summary.items():
+            summary = self._channel(ch_id)
+            for name, value in stats.items():
+                summary[name] += value
+        for cid, (total, count) in other.content_rates.items():
+            rates = self.content_rates.setdefault(cid, [0.0, 0])
+            rates[0] += total
+            rates[1] += count
+        self.total_metrics += other.total_metrics
+        self.total_impressions += other.total_impressions
+        self.total_engagement += other.total_engagement
+        return self
+
+    @classmethod
+    def from_collector(
+        cls, collector: AnalyticsCollector, start: datetime, end: datetime,
+    ) -> PartialAggregate:
+        """Totals for a collector's raw rows and rollups within [start, end]."""
+        partial = cls()
+        for m in collector.view(start=start, end=end):
+            partial.add(m)
+        partial.add_rollups(collector.rollups, start, end)
+        return partial
+
+
 class ReportGenerator:
-    """Generates distribution performance reports."""
+    """Generates distribution performance reports.
+
+    The collector may be omitted when reports are only built from
+    precomputed partials (see kerygma_strategy.sharding).
+    """
 
-    def __init__(self, collector: AnalyticsCollector) -> None:
+    def __init__(self, collector: AnalyticsCollector | None = None) -> None:
         self._collector = collector
 
-    def _filter_metrics(self, period: ReportPeriod) -> list[EngagementMetric]:
-        """Get metrics within the report period."""
-        return [
-            m for m in self._collector.all_metrics
-            if period.start <= m.timestamp <= period.end
-        ]
+    def generate(self, period: ReportPeriod, partial: PartialAggregate | None = None) -> ReportData:
+        """Generate a report for the given period.
 
-    def generate(self, period: ReportPeriod) -> ReportData:
-        """Generate a report for the given period."""
-        metrics = self._filter_metrics(period)
-
-        channel_summary: dict[str, dict[str, int]] = {}
-        total_impressions = 0
-        total_engagement = 0
-
-        for m in metrics:
-            if m.channel_id not in channel_summary:
-                channel_summary[m.channel_id] = {
-                    "impressions": 0, "clicks": 0, "shares": 0, "replies": 0,
-                }
-            channel_summary[m.channel_id]["impressions"] += m.impressions
-            channel_summary[m.channel_id]["clicks"] += m.clicks
-            channel_summary[m.channel_id]["shares"] += m.shares
-            channel_summary[m.channel_id]["replies"] += m.replies
-            total_impressions += m.impressions
-            total_engagement += m.clicks + m.shares + m.replies
+        Raw rows in the period are combined with any rollup buckets that
+        start inside it, read at the finest granularity still retained.
+        When ``partial`` is given (e.g. merged from shards) it is used as
+        the period's totals and the collector is not read.
+        """
+        if partial is None:
+            if self._collector is None:
+                raise ValueError("ReportGenerator has no collector; pass a PartialAggregate")
+            partial = PartialAggregate.from_collector(self._collector, period.start, period.end)
 
         # Top content by engagement rate
-        content_rates: dict[str, list[float]] = {}
-        for m in metrics:
-            content_rates.setdefault(m.content_id, []).append(m.engagement_rate)
         top_content = sorted(
-            [(cid, sum(r) / len(r)) for cid, r in content_rates.items()],
+            [(cid, total / count) for cid, (total, count) in partial.content_rates.items()],
             key=lambda x: x[1], reverse=True,
         )[:5]
 
         return ReportData(
             period=period,
-            total_metrics=len(metrics),
-            channel_summary=channel_summary,
+            total_metrics=partial.total_metrics,
+            channel_summary=partial.channel_summary,
             top_content=top_content,
-            total_impressions=total_impressions,
-            total_engagement=total_engagement,
+            total_impressions=partial.total_impressions,
+            total_engagement=partial.total_engagement,
         )
 
     def to_markdown(self, report: ReportData) -> str:
@@ -141,23 +207,36 @@ def to_markdown(self, report: ReportData) -> str:
 
         return "\n".join(lines)
 
-    def to_json(self, report: ReportData) -> str:
-        return json.dumps(report.to_dict(), indent=2)
-
-    def save_report(self, report: ReportData, directory: Path, fmt: str = "both") -> list[Path]:
-        """Save report to directory. Returns list of created file paths."""
+    def to_json(self, report: ReportData, compact: bool = False) -> str:
+        return codec.dumps(report.to_dict(), compact=compact)
+
+    def save_report(
+        self,
+        report: ReportData,
+        directory: Path,
+        fmt: str = "both",
+        compact: bool = False,
+        compression: str | None = None,
+    ) -> list[Path]:
+        """Save report to directory. Returns list of created file paths.
+
+        ``compact`` writes the JSON report without indentation.
+        ``compression`` ("gzip" or "lzma") compresses each file and adds a
+        ``.gz``/``.xz`` suffix.
+        """
+        suffix = codec.compression_suffix(compression)
         directory.mkdir(parents=True, exist_ok=True)
         base = f"report-{report.period.label}-{report.period.end:%Y%m%d}"
         created: list[Path] = []
 
         if fmt in ("markdown", "both"):
-            md_path = directory / f"{base}.md"
-            md_path.write_text(self.to_markdown(report), encoding="utf-8")
+            md_path = directory / f"{base}.md{suffix}"
+            codec.write_bytes(md_path, self.to_markdown(report).encode("utf-8"), compression)
             created.append(md_path)
 
         if fmt in ("json", "both"):
-            json_path = directory / f"{base}.json"
-            json_path.write_text(self.to_json(report), encoding="utf-8")
+            json_path = directory / f"{base}.json{suffix}"
+            codec.write_bytes(json_path, self.to_json(report, compact).encode("utf-8"), compression)
             created.append(json_path)
 
         return created
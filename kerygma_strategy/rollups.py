@@ -0,0 +1,225 @@
+"""Time-bucketed rollups of engagement metrics.
+
+Raw EngagementMetric rows older than a retention age are compacted into
+hourly, daily and weekly buckets, kept per channel and per content. Each
+bucket carries counter sums plus the row count and engagement-rate sum,
+so channel totals and top-content averages survive compaction exactly.
+Hourly and daily buckets expire on their own ages; weekly buckets are
+kept indefinitely and serve as the all-time record.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kerygma_strategy.analytics import EngagementMetric
+
+
+class Granularity(Enum):
+    HOURLY = "hourly"
+    DAILY = "daily"
+    WEEKLY = "weekly"
+
+
+def bucket_start(ts: datetime, granularity: Granularity) -> datetime:
+    """Start of the bucket containing ``ts`` (weeks start on Monday).
+
+    Timezone-aware values are bucketed in UTC and returned naive.
+    """
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(UTC).replace(tzinfo=None)
+    if granularity == Granularity.HOURLY:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == Granularity.DAILY:
+        return day
+    return day - timedelta(days=day.weekday())
+
+
+@dataclass
+class RollupBucket:
+    """Pre-aggregated counters for one id over one time bucket."""
+    impressions: int = 0
+    clicks: int = 0
+    shares: int = 0
+    replies: int = 0
+    count: int = 0
+    rate_sum: float = 0.0
+
+    def add(self, metric: EngagementMetric) -> None:
+        self.impressions += metric.impressions
+        self.clicks += metric.clicks
+        self.shares += metric.shares
+        self.replies += metric.replies
+        self.count += 1
+        self.rate_sum += metric.engagement_rate
+
+    def merge(self, other: RollupBucket) -> None:
+        self.impressions += other.impressions
+        self.clicks += other.clicks
+        self.shares += other.shares
+        self.replies += other.replies
+        self.count += other.count
+        self.rate_sum += other.rate_sum
+
+    def counters(self) -> dict[str, int]:
+        return {
+            "impressions": self.impressions, "clicks": self.clicks,
+            "shares": self.shares, "replies": self.replies,
+        }
+
+    def to_list(self) -> list[int | float]:
+        return [self.impressions, self.clicks, self.shares, self.replies,
+                self.count, self.rate_sum]
+
+    @classmethod
+    def from_list(cls, values: list[Any]) -> RollupBucket:
+        return cls(*values)
+
+
+@dataclass
+class RetentionPolicy:
+    """How long raw rows and fine-grained buckets are kept.
+
+    Raw rows older than ``raw_max_age`` are compacted into rollups. Hourly
+    and daily buckets are dropped once older than their max ages (None
+    keeps them forever); weekly buckets are never dropped.
+    """
+    raw_max_age: timedelta = timedelta(days=90)
+    hourly_max_age: timedelta | None = timedelta(days=14)
+    daily_max_age: timedelta | None = timedelta(days=365)
+
+
+# id -> bucket start -> bucket
+_Series = dict[str, dict[datetime, RollupBucket]]
+
+
+class RollupStore:
+    """Hourly/daily/weekly buckets per channel and per content."""
+
+    def __init__(self) -> None:
+        self._channel: dict[Granularity, _Series] = {g: {} for g in Granularity}
+        self._content: dict[Granularity, _Series] = {g: {} for g in Granularity}
+        self._expired_before: dict[Granularity, datetime] = {}
+
+    def add(self, metric: EngagementMetric) -> None:
+        for granularity in Granularity:
+            start = bucket_start(metric.timestamp, granularity)
+            for series, key in (
+                (self._channel[granularity], metric.channel_id),
+                (self._content[granularity], metric.content_id),
+            ):
+                buckets = series.setdefault(key, {})
+                bucket = buckets.get(start)
+                if bucket is None:
+                    bucket = buckets[start] = RollupBucket()
+                bucket.add(metric)
+
+    def expire(self, policy: RetentionPolicy, now: datetime) -> None:
+        """Drop hourly/daily buckets that fall outside the retention policy."""
+        for granularity, max_age in (
+            (Granularity.HOURLY, policy.hourly_max_age),
+            (Granularity.DAILY, policy.daily_max_age),
+        ):
+            if max_age is None:
+                continue
+            cutoff = bucket_start(now - max_age, granularity)
+            for table in (self._channel[granularity], self._content[granularity]):
+                for key in list(table):
+                    buckets = table[key]
+                    for start in [s for s in buckets if s < cutoff]:
+                        del buckets[start]
+                    if not buckets:
+                        del table[key]
+            previous = self._expired_before.get(granularity)
+            if previous is None or cutoff > previous:
+                self._expired_before[granularity] = cutoff
+
+    def granularity_for(self, start: datetime) -> Granularity:
+        """Finest granularity whose retained buckets still reach back to ``start``."""
+        for granularity in (Granularity.HOURLY, Granularity.DAILY):
+            expired = self._expired_before.get(granularity)
+            if expired is None or start >= expired:
+                return granularity
+        return Granularity.WEEKLY
+
+    @staticmethod
+    def _window(
+        series: _Series, start: datetime | None, end: datetime | None,
+    ) -> dict[str, RollupBucket]:
+        out: dict[str, RollupBucket] = {}
+        for key, buckets in series.items():
+            total: RollupBucket | None = None
+            for bucket_ts, bucket in buckets.items():
+                if (start is not None and bucket_ts < start) or (
+                    end is not None and bucket_ts > end
+                ):
+                    continue
+                if total is None:
+                    total = out[key] = RollupBucket()
+                total.merge(bucket)
+        return out
+
+    def channel_totals(
+        self, start: datetime | None = None, end: datetime | None = None,
+        granularity: Granularity = Granularity.WEEKLY,
+    ) -> dict[str, RollupBucket]:
+        """Per-channel sums over buckets starting within [start, end]."""
+        return self._window(self._channel[granularity], start, end)
+
+    def content_totals(
+        self, start: datetime | None = None, end: datetime | None = None,
+        granularity: Granularity = Granularity.WEEKLY,
+    ) -> dict[str, RollupBucket]:
+        """Per-content sums over buckets starting within [start, end]."""
+        return self._window(self._content[granularity], start, end)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._channel[Granularity.WEEKLY]
+
+    @property
+    def total_buckets(self) -> int:
+        return sum(
+            len(buckets)
+            for tables in (self._channel, self._content)
+            for series in tables.values()
+            for buckets in series.values()
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        def dump(tables: dict[Granularity, _Series]) -> dict[str, Any]:
+            return {
+                g.value: {
+                    key: {ts.isoformat(): b.to_list() for ts, b in buckets.items()}
+                    for key, buckets in series.items()
+                }
+                for g, series in tables.items()
+            }
+
+        return {
+            "channel": dump(self._channel),
+            "content": dump(self._content),
+            "expired_before": {g.value: ts.isoformat() for g, ts in self._expired_before.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> RollupStore:
+        store = cls()
+        for name, tables in (("channel", store._channel), ("content", store._content)):
+            for g_value, series in data.get(name, {}).items():
+                granularity = Granularity(g_value)
+                tables[granularity] = {
+                    key: {
+                        datetime.fromisoformat(ts): RollupBucket.from_list(values)
+                        for ts, values in buckets.items()
+                    }
+                    for key, buckets in series.items()
+                }
+        for g_value, ts in data.get("expired_before", {}).items():
+            store._expired_before[Granularity(g_value)] = datetime.fromisoformat(ts)
+        return store
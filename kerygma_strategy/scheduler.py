@@ -6,10 +6,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import bisect
+import heapq
+from calendar import monthrange
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from kerygma_strategy import codec
 
 if TYPE_CHECKING:
     from kerygma_strategy.calendar import DistributionCalendar
@@ -23,6 +30,38 @@ class Frequency(Enum):
     MONTHLY = "monthly"
 
 
+_STEPS = {
+    Frequency.DAILY: timedelta(days=1),
+    Frequency.WEEKLY: timedelta(weeks=1),
+    Frequency.BIWEEKLY: timedelta(weeks=2),
+}
+_STAMP = "%Y%m%d%H%M%S"
+
+
+def _insort(times: list[datetime], ids: list[str], when: datetime, key: str) -> None:
+    i = bisect.bisect_right(times, when)
+    times.insert(i, when)
+    ids.insert(i, key)
+
+
+def _remove(times: list[datetime], ids: list[str], when: datetime, key: str) -> None:
+    i = bisect.bisect_left(times, when)
+    while i < len(times) and times[i] == when:
+        if ids[i] == key:
+            del times[i]
+            del ids[i]
+            return
+        i += 1
+
+
+def add_months(when: datetime, months: int) -> datetime:
+    """Same day and time ``months`` later, clamped to the month's last day."""
+    month = when.month - 1 + months
+    year = when.year + month // 12
+    month = month % 12 + 1
+    return when.replace(year=year, month=month, day=min(when.day, monthrange(year, month)[1]))
+
+
 @dataclass
 class ScheduleEntry:
     entry_id: str
@@ -42,13 +81,112 @@ def mark_published(self) -> None:
     def next_occurrence(self) -> datetime | None:
         if self.frequency == Frequency.ONCE:
             return None
-        deltas = {
-            Frequency.DAILY: timedelta(days=1),
-            Frequency.WEEKLY: timedelta(weeks=1),
-            Frequency.BIWEEKLY: timedelta(weeks=2),
-            Frequency.MONTHLY: timedelta(days=30),
+        if self.frequency == Frequency.MONTHLY:
+            return add_months(self.scheduled_time, 1)
+        return self.scheduled_time + _STEPS[self.frequency]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "entry_id": self.entry_id,
+            "content_id": self.content_id,
+            "channel": self.channel,
+            "scheduled_time": self.scheduled_time.isoformat(),
+            "frequency": self.frequency.value,
+            "published": self.published,
         }
-        return self.scheduled_time + deltas[self.frequency]
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> ScheduleEntry:
+        return cls(
+            entry_id=item["entry_id"],
+            content_id=item["content_id"],
+            channel=item["channel"],
+            scheduled_time=datetime.fromisoformat(item["scheduled_time"]),
+            frequency=Frequency(item.get("frequency", "once")),
+            published=item.get("published", False),
+        )
+
+
+@dataclass
+class RecurrenceRule:
+    """A recurring publication, expanded lazily instead of stored per occurrence.
+
+    Occurrence ``n`` is computed from ``start`` directly (``start + n *
+    step``, or add_months(start, n) for MONTHLY), so monthly posts on the
+    31st land on each month's last day without drifting. ``count`` limits
+    the number of generated occurrences and ``until`` the last time;
+    ``exceptions`` are occurrence times that are skipped (they still count
+    toward ``count``, as with iCalendar EXDATE).
+    """
+    rule_id: str
+    content_id: str
+    channel: str
+    start: datetime
+    frequency: Frequency
+    count: int | None = None
+    until: datetime | None = None
+    exceptions: frozenset[datetime] = field(default_factory=frozenset)
+
+    def __post_init__(self) -> None:
+        if self.count is not None and self.count < 1:
+            raise ValueError("count must be at least 1")
+        self.exceptions = frozenset(self.exceptions)
+
+    def occurrence(self, n: int) -> datetime | None:
+        """Time of occurrence ``n`` (0-based), or None past the rule's end."""
+        if self.frequency == Frequency.ONCE and n > 0:
+            return None
+        if self.count is not None and n >= self.count:
+            return None
+        if self.frequency == Frequency.MONTHLY:
+            when = add_months(self.start, n)
+        elif self.frequency == Frequency.ONCE:
+            when = self.start
+        else:
+            when = self.start + n * _STEPS[self.frequency]
+        if self.until is not None and when > self.until:
+            return None
+        return when
+
+    def index_at(self, when: datetime) -> int:
+        """Index of the first occurrence at or after ``when`` (may be past the end)."""
+        if when <= self.start or self.frequency == Frequency.ONCE:
+            return 0 if when <= self.start else 1
+        if self.frequency == Frequency.MONTHLY:
+            n = max(0, (when.year - self.start.year) * 12 + when.month - self.start.month - 1)
+            while add_months(self.start, n) < when:
+                n += 1
+            return n
+        return -((self.start - when) // _STEPS[self.frequency])
+
+    def indexed(self, first: int = 0, before: datetime | None = None) -> Iterator[tuple[int, datetime]]:
+        """Yield (index, time) from occurrence ``first``, skipping exceptions."""
+        n = first
+        while True:
+            when = self.occurrence(n)
+            if when is None or (before is not None and when > before):
+                return
+            if when not in self.exceptions:
+                yield n, when
+            n += 1
+
+    def occurrences(
+        self, after: datetime | None = None, before: datetime | None = None,
+    ) -> Iterator[datetime]:
+        """Lazily yield occurrence times in [after, before]."""
+        first = 0 if after is None else self.index_at(after)
+        for _, when in self.indexed(first, before):
+            yield when
+
+    def entry_id_for(self, when: datetime) -> str:
+        return f"{self.rule_id}-{when.strftime(_STAMP)}"
+
+    def entry_for(self, when: datetime) -> ScheduleEntry:
+        """A one-off ScheduleEntry for the occurrence at ``when``."""
+        return ScheduleEntry(
+            entry_id=self.entry_id_for(when), content_id=self.content_id,
+            channel=self.channel, scheduled_time=when,
+        )
 
 
 @dataclass
@@ -59,31 +197,265 @@ class PrioritizedEntry:
     modifier: float = 1.0
 
 
+class ScheduleArchive:
+    """Append-only record of published schedule entries.
+
+    Without a ``path`` entries are kept in memory, indexed by content and
+    channel. With one they are appended to an NDJSON file (one entry per
+    line) and not held in memory at all; queries stream the file, so
+    archived history costs disk rather than scheduler memory. A torn last
+    line from an interrupted append is truncated on open.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path
+        self._entries: list[ScheduleEntry] = []
+        self._by_content: dict[str, list[int]] = {}
+        self._by_channel: dict[str, list[int]] = {}
+        self._count = 0
+        if path and path.exists():
+            self._count = self._recover()
+
+    def _recover(self) -> int:
+        """Count intact lines, truncating a torn tail."""
+        assert self._path is not None
+        count = 0
+        good_offset = 0
+        with self._path.open("r+b") as fh:
+            for line in fh:
+                if not line.endswith(b"\n"):
+                    break
+                good_offset += len(line)
+                count += 1
+            fh.truncate(good_offset)
+        return count
+
+    def add(self, entries: Iterable[ScheduleEntry]) -> int:
+        """Append entries; returns how many were archived."""
+        batch = list(entries)
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as fh:
+                fh.writelines(codec.dumps(e.to_dict(), compact=True) + "\n" for e in batch)
+        else:
+            for entry in batch:
+                row = len(self._entries)
+                self._entries.append(entry)
+                self._by_content.setdefault(entry.content_id, []).append(row)
+                self._by_channel.setdefault(entry.channel, []).append(row)
+        self._count += len(batch)
+        return len(batch)
+
+    def __iter__(self) -> Iterator[ScheduleEntry]:
+        """Archived entries in archival order."""
+        if self._path is None:
+            yield from self._entries
+            return
+        if not self._path.exists():
+            return
+        with self._path.open("rb") as fh:
+            for line in fh:
+                try:
+                    yield ScheduleEntry.from_dict(codec.loads(line))
+                except (ValueError, KeyError):
+                    continue
+
+    def __len__(self) -> int:
+        return self._count
+
+    def by_content(self, content_id: str) -> list[ScheduleEntry]:
+        if self._path is None:
+            return [self._entries[row] for row in self._by_content.get(content_id, ())]
+        return [e for e in self if e.content_id == content_id]
+
+    def by_channel(self, channel: str) -> list[ScheduleEntry]:
+        if self._path is None:
+            return [self._entries[row] for row in self._by_channel.get(channel, ())]
+        return [e for e in self if e.channel == channel]
+
+
 class ContentScheduler:
-    """Manages the publication schedule for content across channels."""
+    """Manages the publication schedule for content across channels.
+
+    Unpublished entries are also kept in a time-sorted index (parallel
+    ``_pending_times``/``_pending_ids`` lists), so get_due() and
+    get_upcoming() bisect to their window instead of scanning published
+    history: O(log n + k) for k results, returned in scheduled-time order.
+    Entries must be published through publish_entry() and must not have
+    their scheduled_time changed after scheduling.
 
-    def __init__(self, calendar: DistributionCalendar | None = None) -> None:
+    Published entries stay in the live set until archive_published() moves
+    them to the ``archive`` (a ScheduleArchive, in memory by default), so
+    the live set can be kept proportional to pending work.
+
+    Recurring publications can instead be added as RecurrenceRules, which
+    hold no per-occurrence state: each rule is indexed by its next
+    unpublished occurrence, get_due()/get_upcoming() expand only the rules
+    reaching into the window, and iter_occurrences() walks a window lazily
+    without creating entries. An occurrence appears as an entry with id
+    ``<rule_id>-<YYYYmmddHHMMSS>``; publishing it advances the rule and
+    archives the entry.
+    """
+
+    def __init__(
+        self,
+        calendar: DistributionCalendar | None = None,
+        archive: ScheduleArchive | None = None,
+    ) -> None:
         self._entries: dict[str, ScheduleEntry] = {}
         self._calendar = calendar
+        self._archive = archive if archive is not None else ScheduleArchive()
+        self._pending_times: list[datetime] = []
+        self._pending_ids: list[str] = []
+        self._published_ids: list[str] = []
+        self._rules: dict[str, RecurrenceRule] = {}
+        self._rule_cursor: dict[str, int] = {}  # first unpublished occurrence
+        self._rule_done: dict[str, set[int]] = {}  # published out of order
+        self._rule_next: dict[str, datetime] = {}
+        self._rule_times: list[datetime] = []
+        self._rule_ids: list[str] = []
+
+    def _index(self, entry: ScheduleEntry) -> None:
+        if entry.published:
+            self._published_ids.append(entry.entry_id)
+            return
+        _insort(self._pending_times, self._pending_ids, entry.scheduled_time, entry.entry_id)
+
+    def _unindex(self, entry: ScheduleEntry) -> None:
+        _remove(self._pending_times, self._pending_ids, entry.scheduled_time, entry.entry_id)
+
+    def _rule_pending(
+        self, rule: RecurrenceRule, after: datetime | None = None, before: datetime | None = None,
+    ) -> Iterator[tuple[int, datetime]]:
+        """Unpublished occurrences of a rule within [after, before]."""
+        first = self._rule_cursor[rule.rule_id]
+        if after is not None:
+            first = max(first, rule.index_at(after))
+        done = self._rule_done.get(rule.rule_id, ())
+        for n, when in rule.indexed(first, before):
+            if n not in done:
+                yield n, when
+
+    def _reindex_rule(self, rule: RecurrenceRule) -> None:
+        old = self._rule_next.pop(rule.rule_id, None)
+        if old is not None:
+            _remove(self._rule_times, self._rule_ids, old, rule.rule_id)
+        nxt = next(self._rule_pending(rule), None)
+        if nxt is not None:
+            self._rule_next[rule.rule_id] = nxt[1]
+            _insort(self._rule_times, self._rule_ids, nxt[1], rule.rule_id)
+
+    def _rules_before(self, when: datetime) -> list[RecurrenceRule]:
+        """Rules whose next unpublished occurrence is at or before ``when``."""
+        hi = bisect.bisect_right(self._rule_times, when)
+        return [self._rules[rule_id] for rule_id in self._rule_ids[:hi]]
+
+    def add_rule(self, rule: RecurrenceRule) -> None:
+        if rule.rule_id in self._rules:
+            raise ValueError(f"Recurrence rule '{rule.rule_id}' already exists")
+        self._rules[rule.rule_id] = rule
+        self._rule_cursor[rule.rule_id] = 0
+        self._reindex_rule(rule)
+
+    def remove_rule(self, rule_id: str) -> RecurrenceRule:
+        """Stop a rule; its published occurrences stay in the archive."""
+        rule = self._rules[rule_id]
+        old = self._rule_next.pop(rule_id, None)
+        if old is not None:
+            _remove(self._rule_times, self._rule_ids, old, rule_id)
+        del self._rules[rule_id], self._rule_cursor[rule_id]
+        self._rule_done.pop(rule_id, None)
+        return rule
+
+    def iter_occurrences(
+        self, start: datetime, end: datetime,
+    ) -> Iterator[tuple[datetime, RecurrenceRule]]:
+        """Unpublished rule occurrences in [start, end], lazily, in time order."""
+        def expand(rule: RecurrenceRule) -> Iterator[tuple[datetime, RecurrenceRule]]:
+            for _, when in self._rule_pending(rule, start, end):
+                yield when, rule
+
+        return heapq.merge(
+            *(expand(rule) for rule in self._rules_before(end)), key=lambda item: item[0],
+        )
+
+    def _pending_slice(self, lo: int, hi: int) -> list[ScheduleEntry]:
+        entries = (self._entries[eid] for eid in self._pending_ids[lo:hi])
+        return [e for e in entries if not e.published]
 
     def schedule(self, entry: ScheduleEntry) -> None:
         if entry.entry_id in self._entries:
             raise ValueError(f"Schedule entry '{entry.entry_id}' already exists")
         self._entries[entry.entry_id] = entry
+        self._index(entry)
 
     def get_due(self, now: datetime | None = None) -> list[ScheduleEntry]:
-        return [e for e in self._entries.values() if e.is_due(now)]
+        current = now or datetime.now()
+        due = self._pending_slice(0, bisect.bisect_right(self._pending_times, current))
+        rules = self._rules_before(current)
+        if rules:
+            for rule in rules:
+                due.extend(rule.entry_for(when) for _, when in self._rule_pending(rule, None, current))
+            due.sort(key=lambda e: e.scheduled_time)
+        return due
 
     def get_upcoming(self, hours: int = 24, now: datetime | None = None) -> list[ScheduleEntry]:
         current = now or datetime.now()
         window = current + timedelta(hours=hours)
-        return [
-            e for e in self._entries.values()
-            if not e.published and current <= e.scheduled_time <= window
-        ]
+        upcoming = self._pending_slice(
+            bisect.bisect_left(self._pending_times, current),
+            bisect.bisect_right(self._pending_times, window),
+        )
+        occurrences = [rule.entry_for(when) for when, rule in self.iter_occurrences(current, window)]
+        if occurrences:
+            upcoming.extend(occurrences)
+            upcoming.sort(key=lambda e: e.scheduled_time)
+        return upcoming
+
+    def _publish_occurrence(self, entry_id: str) -> ScheduleEntry:
+        rule_id, _, stamp = entry_id.rpartition("-")
+        rule = self._rules.get(rule_id)
+        try:
+            approx = datetime.strptime(stamp, _STAMP)
+        except ValueError:
+            rule = None
+        if rule is None:
+            raise KeyError(entry_id)
+        # The id drops sub-second precision, so the occurrence is at or after it.
+        n = rule.index_at(approx.replace(tzinfo=rule.start.tzinfo))
+        when = rule.occurrence(n)
+        cursor = self._rule_cursor[rule_id]
+        if (
+            when is None or rule.entry_id_for(when) != entry_id
+            or when in rule.exceptions or n < cursor or n in self._rule_done.get(rule_id, ())
+        ):
+            raise KeyError(entry_id)
+        done = self._rule_done.setdefault(rule_id, set())
+        done.add(n)
+        while True:
+            if cursor in done:
+                done.discard(cursor)
+            else:
+                occurrence = rule.occurrence(cursor)
+                if occurrence is None or occurrence not in rule.exceptions:
+                    break
+            cursor += 1
+        self._rule_cursor[rule_id] = cursor
+        if not done:
+            del self._rule_done[rule_id]
+        self._reindex_rule(rule)
+        entry = rule.entry_for(when)
+        entry.mark_published()
+        self._archive.add([entry])
+        return entry
 
     def publish_entry(self, entry_id: str) -> ScheduleEntry:
+        if entry_id not in self._entries and self._rules:
+            return self._publish_occurrence(entry_id)
         entry = self._entries[entry_id]
+        if not entry.published:
+            self._unindex(entry)
+            self._published_ids.append(entry_id)
         entry.mark_published()
         if entry.frequency != Frequency.ONCE:
             next_time = entry.next_occurrence()
@@ -94,11 +466,42 @@ def publish_entry(self, entry_id: str) -> ScheduleEntry:
                     channel=entry.channel, scheduled_time=next_time,
                     frequency=entry.frequency,
                 )
+                replaced = self._entries.get(new_id)
+                if replaced is not None and not replaced.published:
+                    self._unindex(replaced)
                 self._entries[new_id] = new_entry
+                self._index(new_entry)
         return entry
 
+    def archive_published(
+        self, older_than: timedelta | None = None, now: datetime | None = None,
+    ) -> int:
+        """Move published entries into the archive; returns how many moved.
+
+        With ``older_than``, entries scheduled within that span of ``now``
+        stay live. Only entries published since the last call are examined.
+        """
+        cutoff = None if older_than is None else (now or datetime.now()) - older_than
+        moved: list[ScheduleEntry] = []
+        kept: list[str] = []
+        for entry_id in self._published_ids:
+            entry = self._entries.get(entry_id)
+            if entry is None or not entry.published:
+                continue
+            if cutoff is not None and entry.scheduled_time > cutoff:
+                kept.append(entry_id)
+                continue
+            moved.append(self._entries.pop(entry_id))
+        self._published_ids = kept
+        return self._archive.add(moved)
+
+    @property
+    def archive(self) -> ScheduleArchive:
+        return self._archive
+
     @property
     def total_entries(self) -> int:
+        """Entries in the live set (archived entries are not counted)."""
         return len(self._entries)
 
     def schedule_with_calendar(self, entry: ScheduleEntry) -> ScheduleEntry:
@@ -142,4 +545,10 @@ def get_due_with_priority(self, now: datetime | None = None) -> list[Prioritized
 
     @property
     def pending_count(self) -> int:
-        return sum(1 for e in self._entries.values() if not e.published)
\ No newline at end of file
+        """Unpublished entries (rule occurrences are not counted; see rule_count)."""
+        return len(self._pending_ids)
+
+    @property
+    def rule_count(self) -> int:
+        """Rules that still have unpublished occurrences."""
+        return len(self._rule_ids)
@@ -0,0 +1,254 @@
+"""Delta-encoded storage for cumulative engagement counters.
+
+Pull-back clients (Mastodon statuses, Ghost posts) report running totals,
+so consecutive snapshots of one post differ by small increments. A
+CounterSeries stores one (channel, content) series as zigzag-varint deltas
+against the previous sample, typically a handful of bytes per snapshot
+instead of a full EngagementMetric. Absolute checkpoints every
+``checkpoint_every`` samples let value_at() and window_delta() decode at
+most one checkpoint interval rather than the whole series.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+from array import array
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Any
+
+from kerygma_strategy.analytics import EngagementMetric
+from kerygma_strategy.columnar import from_epoch, to_epoch
+
+_COUNTERS = ("impressions", "clicks", "shares", "replies")
+
+
+def _write_varint(buf: bytearray, value: int) -> None:
+    zigzag = (value << 1) ^ (value >> 63)
+    while zigzag >= 0x80:
+        buf.append((zigzag & 0x7F) | 0x80)
+        zigzag >>= 7
+    buf.append(zigzag)
+
+
+def _read_varint(buf: bytes | bytearray, pos: int) -> tuple[int, int]:
+    shift = 0
+    result = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (result >> 1) ^ -(result & 1), pos
+
+
+class CounterSeries:
+    """Chronological snapshots of one post's cumulative counters.
+
+    Each sample is five zigzag varints: the timestamp delta in seconds and
+    the delta of each counter. Samples must arrive in non-decreasing
+    timestamp order; counters may go down (e.g. an un-favourite).
+    """
+
+    def __init__(self, checkpoint_every: int = 64) -> None:
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+        self._checkpoint_every = checkpoint_every
+        self._data = bytearray()
+        self._count = 0
+        self._last = [0, 0, 0, 0, 0]  # epoch seconds + counters
+        self._ck_ts = array("q")
+        self._ck_offset = array("q")
+        self._ck_values = array("q")  # 4 counters per checkpoint
+
+    def append(self, timestamp: datetime, counters: tuple[int, int, int, int]) -> None:
+        current = [to_epoch(timestamp), *counters]
+        if self._count and current[0] < self._last[0]:
+            raise ValueError("CounterSeries samples must be in timestamp order")
+        if self._count % self._checkpoint_every == 0:
+            # Checkpoint holds this sample's absolute values; decoding resumes after it.
+            self._ck_ts.append(current[0])
+            self._ck_values.extend(current[1:])
+            for now, prev in zip(current, self._last):
+                _write_varint(self._data, now - prev)
+            self._ck_offset.append(len(self._data))
+        else:
+            for now, prev in zip(current, self._last):
+                _write_varint(self._data, now - prev)
+        self._last = current
+        self._count += 1
+
+    def _decode_from(self, checkpoint: int) -> Iterator[list[int]]:
+        """Yield absolute samples starting at the given checkpoint."""
+        base = checkpoint * 4
+        state = [self._ck_ts[checkpoint], *self._ck_values[base:base + 4]]
+        yield list(state)
+        pos = self._ck_offset[checkpoint]
+        remaining = self._count - checkpoint * self._checkpoint_every - 1
+        for _ in range(remaining):
+            for i in range(5):
+                delta, pos = _read_varint(self._data, pos)
+                state[i] += delta
+            yield list(state)
+
+    def _sample_at(self, epoch: int) -> list[int] | None:
+        checkpoint = bisect.bisect_right(self._ck_ts, epoch) - 1
+        if checkpoint < 0:
+            return None
+        # The next checkpoint is already past ``epoch``, so this decodes at
+        # most one checkpoint interval.
+        found: list[int] | None = None
+        for sample in self._decode_from(checkpoint):
+            if sample[0] > epoch:
+                break
+            found = sample
+        return found
+
+    def value_at(self, timestamp: datetime) -> tuple[int, int, int, int] | None:
+        """Counters of the latest sample at or before ``timestamp`` (None if earlier)."""
+        sample = self._sample_at(to_epoch(timestamp))
+        return None if sample is None else (sample[1], sample[2], sample[3], sample[4])
+
+    def window_delta(self, start: datetime, end: datetime) -> tuple[int, int, int, int]:
+        """Counter growth between ``start`` and ``end``.
+
+        Uses the latest sample at or before each bound; a series that starts
+        inside the window counts from zero.
+        """
+        after = self.value_at(end) or (0, 0, 0, 0)
+        before = self.value_at(start) or (0, 0, 0, 0)
+        return (
+            after[0] - before[0], after[1] - before[1],
+            after[2] - before[2], after[3] - before[3],
+        )
+
+    def samples(self) -> Iterator[tuple[datetime, tuple[int, int, int, int]]]:
+        """Decode every sample in order."""
+        if not self._count:
+            return
+        for sample in self._decode_from(0):
+            yield from_epoch(sample[0]), (sample[1], sample[2], sample[3], sample[4])
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self._data) + self._ck_ts.itemsize
+            * (len(self._ck_ts) + len(self._ck_offset) + len(self._ck_values))
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "every": self._checkpoint_every,
+            "count": self._count,
+            "last": self._last,
+            "data": base64.b64encode(bytes(self._data)).decode("ascii"),
+            "ck_ts": self._ck_ts.tolist(),
+            "ck_offset": self._ck_offset.tolist(),
+            "ck_values": self._ck_values.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CounterSeries:
+        series = cls(data["every"])
+        series._count = data["count"]
+        series._last = list(data["last"])
+        series._data = bytearray(base64.b64decode(data["data"]))
+        series._ck_ts = array("q", data["ck_ts"])
+        series._ck_offset = array("q", data["ck_offset"])
+        series._ck_values = array("q", data["ck_values"])
+        return series
+
+
+class CounterSeriesStore:
+    """Delta-encoded series of cumulative snapshots, one per (channel, content)."""
+
+    def __init__(self, checkpoint_every: int = 64) -> None:
+        self._checkpoint_every = checkpoint_every
+        self._series: dict[tuple[str, str], CounterSeries] = {}
+
+    def record(self, metric: EngagementMetric) -> None:
+        key = (metric.channel_id, metric.content_id)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = CounterSeries(self._checkpoint_every)
+        series.append(
+            metric.timestamp,
+            (metric.impressions, metric.clicks, metric.shares, metric.replies),
+        )
+
+    def value_at(
+        self, channel_id: str, content_id: str, timestamp: datetime,
+    ) -> EngagementMetric | None:
+        """The cumulative counters as of ``timestamp``, as an EngagementMetric."""
+        series = self._series.get((channel_id, content_id))
+        if series is None:
+            return None
+        sample = series._sample_at(to_epoch(timestamp))
+        if sample is None:
+            return None
+        return EngagementMetric(
+            channel_id=channel_id, content_id=content_id, timestamp=from_epoch(sample[0]),
+            **dict(zip(_COUNTERS, sample[1:])),
+        )
+
+    def window_delta(
+        self, channel_id: str, content_id: str, start: datetime, end: datetime,
+    ) -> dict[str, int]:
+        """Counter growth for one post between ``start`` and ``end``."""
+        series = self._series.get((channel_id, content_id))
+        delta = series.window_delta(start, end) if series else (0, 0, 0, 0)
+        return dict(zip(_COUNTERS, delta))
+
+    def channel_window_delta(
+        self, channel_id: str, start: datetime, end: datetime,
+    ) -> dict[str, int]:
+        """Counter growth summed over every post on a channel."""
+        totals: dict[str, int] = dict.fromkeys(_COUNTERS, 0)
+        for (ch, _), series in self._series.items():
+            if ch != channel_id:
+                continue
+            for name, value in zip(_COUNTERS, series.window_delta(start, end)):
+                totals[name] += value
+        return totals
+
+    def samples(self, channel_id: str, content_id: str) -> Iterator[EngagementMetric]:
+        """Materialize every stored snapshot of one post."""
+        series = self._series.get((channel_id, content_id))
+        if series is None:
+            return
+        for ts, counters in series.samples():
+            yield EngagementMetric(
+                channel_id=channel_id, content_id=content_id, timestamp=ts,
+                **dict(zip(_COUNTERS, counters)),
+            )
+
+    @property
+    def total_samples(self) -> int:
+        return sum(s.count for s in self._series.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.nbytes for s in self._series.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "every": self._checkpoint_every,
+            "series": [
+                {"channel_id": ch, "content_id": cid, **series.to_dict()}
+                for (ch, cid), series in self._series.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CounterSeriesStore:
+        store = cls(data.get("every", 64))
+        for item in data.get("series", []):
+            store._series[(item["channel_id"], item["content_id"])] = CounterSeries.from_dict(item)
+        return store
@@ -0,0 +1,147 @@
+"""Sharded analytics storage with parallel partial aggregation.
+
+ShardedAnalytics partitions metrics across several JsonStore files, either
+one file per channel or a fixed number of hash shards keyed on
+(channel, content) so every sample of a post lands in the same shard.
+Reports are built by computing a PartialAggregate per shard in a process
+pool and merging the partials, so report time scales with cores instead of
+loading every file into one collector.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import zlib
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from kerygma_strategy.analytics import (
+    AnalyticsCollector,
+    CompactMetric,
+    EngagementMetric,
+    _coerce_metric,
+)
+from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.report_generator import PartialAggregate
+
+_MANIFEST = "shards.json"
+
+
+def shard_partial(path: str, start: datetime, end: datetime) -> PartialAggregate:
+    """Stream one shard file and compute its totals for [start, end].
+
+    Module-level so it can be pickled to worker processes.
+    """
+    collector = AnalyticsCollector.from_stream(Path(path), start=start, end=end)
+    return PartialAggregate.from_collector(collector, start, end)
+
+
+class ShardedAnalytics:
+    """Analytics spread across ``shards`` store files under ``directory``.
+
+    With ``by="hash"`` (default) metrics go to ``shard-NNN.json`` by a
+    stable CRC32 of channel and content id; the shard count is recorded in
+    a manifest and must not change afterwards. With ``by="channel"`` each
+    channel gets its own ``channel-<id>.json`` file and ``shards`` is
+    ignored.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        shards: int = 4,
+        by: str = "hash",
+        persist_every: int = 50,
+    ) -> None:
+        if by not in ("hash", "channel"):
+            raise ValueError(f"Unknown shard key: {by!r} (expected 'hash' or 'channel')")
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._by = by
+        self._shards = shards
+        self._persist_every = persist_every
+        self._collectors: dict[str, AnalyticsCollector] = {}
+        self._check_manifest()
+
+    def _check_manifest(self) -> None:
+        manifest = self._dir / _MANIFEST
+        layout = {"by": self._by, "shards": self._shards if self._by == "hash" else None}
+        if manifest.exists():
+            existing = json.loads(manifest.read_text(encoding="utf-8"))
+            if existing != layout:
+                raise ValueError(
+                    f"Shard layout mismatch in {self._dir}: stored {existing}, requested {layout}"
+                )
+        else:
+            manifest.write_text(json.dumps(layout), encoding="utf-8")
+
+    def shard_name(self, channel_id: str, content_id: str) -> str:
+        """File name of the shard a (channel, content) pair belongs to."""
+        if self._by == "channel":
+            return f"channel-{re.sub(r'[^A-Za-z0-9_.-]', '_', channel_id)}.json"
+        key = f"{channel_id}\0{content_id}".encode()
+        return f"shard-{zlib.crc32(key) % self._shards:03d}.json"
+
+    def _collector(self, name: str) -> AnalyticsCollector:
+        collector = self._collectors.get(name)
+        if collector is None:
+            collector = self._collectors[name] = AnalyticsCollector(
+                store=JsonStore(self._dir / name), persist_every=self._persist_every,
+            )
+        return collector
+
+    def record(self, metric: EngagementMetric) -> None:
+        self._collector(self.shard_name(metric.channel_id, metric.content_id)).record(metric)
+
+    def record_many(
+        self, items: Iterable[EngagementMetric | CompactMetric | dict[str, Any]],
+    ) -> int:
+        """Validate a batch, then hand each shard its slice via record_many()."""
+        metrics = [_coerce_metric(item, i) for i, item in enumerate(items)]
+        by_shard: dict[str, list[EngagementMetric]] = {}
+        for m in metrics:
+            by_shard.setdefault(self.shard_name(m.channel_id, m.content_id), []).append(m)
+        for name, batch in by_shard.items():
+            self._collector(name).record_many(batch)
+        return len(metrics)
+
+    def flush(self) -> None:
+        for collector in self._collectors.values():
+            collector.flush()
+
+    @property
+    def shard_paths(self) -> list[Path]:
+        """Existing shard files, in name order."""
+        pattern = "channel-*.json" if self._by == "channel" else "shard-*.json"
+        return sorted(self._dir.glob(pattern))
+
+    def partial(
+        self, start: datetime, end: datetime, processes: int | None = None,
+    ) -> PartialAggregate:
+        """Merged totals for [start, end] across every shard.
+
+        Pending writes are flushed first. Shards are aggregated in a process
+        pool of up to ``processes`` workers (default: CPU count); with one
+        shard or ``processes=1`` they are aggregated in this process.
+        """
+        self.flush()
+        paths = [str(p) for p in self.shard_paths]
+        workers = min(processes or os.cpu_count() or 1, len(paths))
+        merged = PartialAggregate()
+        if workers <= 1:
+            for path in paths:
+                merged.merge(shard_partial(path, start, end))
+            return merged
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(
+                shard_partial, paths, [start] * len(paths), [end] * len(paths),
+            ):
+                merged.merge(part)
+        return merged
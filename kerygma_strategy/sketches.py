@@ -0,0 +1,308 @@
+"""Mergeable approximate sketches for engagement analytics.
+
+HyperLogLog estimates distinct counts (distinct content per channel) and
+a KLL sketch estimates quantiles (engagement-rate p50/p90/p99). Both merge
+losslessly with sketches of the same parameters, so per-day sketches can
+be combined into any report window. ChannelSketches keeps one pair per
+channel per day, folds days past a retention age into per-week pairs,
+and serializes to plain JSON for the store.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import math
+import random
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from kerygma_strategy.rollups import Granularity, bucket_start
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with a sparse representation for small sets.
+
+    Registers are held in a dict until more than m/8 are set, then in a
+    dense bytearray of m = 2**precision bytes. Standard error is about
+    1.04 / sqrt(m).
+    """
+
+    def __init__(self, precision: int = 10) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self._p = precision
+        self._m = 1 << precision
+        self._sparse: dict[int, int] = {}
+        self._dense: bytearray | None = None
+
+    def add(self, value: str) -> None:
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        idx = h >> (64 - self._p)
+        rest = h & ((1 << (64 - self._p)) - 1)
+        self._set(idx, (64 - self._p) - rest.bit_length() + 1)
+
+    def _set(self, idx: int, rank: int) -> None:
+        if self._dense is not None:
+            self._dense[idx] = max(self._dense[idx], rank)
+            return
+        if rank > self._sparse.get(idx, 0):
+            self._sparse[idx] = rank
+            if len(self._sparse) > self._m // 8:
+                self._densify()
+
+    def _densify(self) -> None:
+        dense = bytearray(self._m)
+        for idx, rank in self._sparse.items():
+            dense[idx] = rank
+        self._dense = dense
+        self._sparse = {}
+
+    def _registers(self) -> Iterable[tuple[int, int]]:
+        if self._dense is not None:
+            return enumerate(self._dense)
+        return self._sparse.items()
+
+    def merge(self, other: HyperLogLog) -> None:
+        if other._p != self._p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        for idx, rank in other._registers():
+            if rank:
+                self._set(idx, rank)
+
+    def count(self) -> int:
+        m = self._m
+        if self._dense is None:
+            zeros = m - len(self._sparse)
+            harmonic = zeros + sum(2.0 ** -r for r in self._sparse.values())
+        else:
+            zeros = self._dense.count(0)
+            harmonic = sum(2.0 ** -r for r in self._dense)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def to_dict(self) -> dict[str, Any]:
+        if self._dense is not None:
+            return {"p": self._p, "dense": base64.b64encode(bytes(self._dense)).decode("ascii")}
+        return {"p": self._p, "sparse": {str(i): r for i, r in self._sparse.items()}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HyperLogLog:
+        sketch = cls(data["p"])
+        if "dense" in data:
+            sketch._dense = bytearray(base64.b64decode(data["dense"]))
+        else:
+            sketch._sparse = {int(i): r for i, r in data.get("sparse", {}).items()}
+        return sketch
+
+
+class KLLSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Keeps a stack of compactors whose capacities shrink geometrically with
+    height; a full compactor sorts itself and promotes every other item one
+    level up with doubled weight. Rank error is roughly O(1/k).
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        self._k = k
+        self._compactors: list[list[float]] = [[]]
+        self._size = 0
+        self._max_size = 0
+        self._rng = random.Random(seed)
+        self._update_max_size()
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self._compactors) - height - 1
+        return math.ceil(self._k * (2 / 3) ** depth) + 1
+
+    def _update_max_size(self) -> None:
+        self._max_size = sum(self._capacity(h) for h in range(len(self._compactors)))
+
+    def update(self, value: float) -> None:
+        self._compactors[0].append(value)
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size:
+            for height, items in enumerate(self._compactors):
+                if len(items) >= self._capacity(height):
+                    if height + 1 >= len(self._compactors):
+                        self._compactors.append([])
+                        self._update_max_size()
+                    items.sort()
+                    # Hold back one item from an odd-sized run so total weight is exact.
+                    leftover = [items.pop()] if len(items) % 2 else []
+                    promoted = items[self._rng.randrange(2)::2]
+                    self._compactors[height + 1].extend(promoted)
+                    self._size += len(promoted) - len(items)
+                    self._compactors[height] = leftover
+                    break
+            else:
+                return
+
+    def merge(self, other: KLLSketch) -> None:
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+        for height, items in enumerate(other._compactors):
+            self._compactors[height].extend(items)
+        self._size = sum(len(c) for c in self._compactors)
+        self._update_max_size()
+        self._compress()
+
+    @property
+    def count(self) -> int:
+        """Total weight (number of values added)."""
+        return sum(len(items) << height for height, items in enumerate(self._compactors))
+
+    def quantiles(self, qs: Iterable[float]) -> dict[float, float]:
+        """Approximate values at each requested quantile (0 <= q <= 1)."""
+        weighted = sorted(
+            (value, 1 << height)
+            for height, items in enumerate(self._compactors)
+            for value in items
+        )
+        if not weighted:
+            return {}
+        total = sum(w for _, w in weighted)
+        out: dict[float, float] = {}
+        for q in sorted(qs):
+            target = q * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    out[q] = value
+                    break
+            else:
+                out[q] = weighted[-1][0]
+        return out
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"k": self._k, "compactors": self._compactors}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> KLLSketch:
+        sketch = cls(data["k"])
+        sketch._compactors = [list(items) for items in data["compactors"]] or [[]]
+        sketch._size = sum(len(c) for c in sketch._compactors)
+        sketch._update_max_size()
+        return sketch
+
+
+# channel id -> bucket start -> (distinct-content HLL, engagement-rate KLL)
+_Buckets = dict[str, dict[datetime, tuple[HyperLogLog, KLLSketch]]]
+
+
+class ChannelSketches:
+    """Per-channel daily/weekly distinct-content and engagement-rate sketches."""
+
+    def __init__(self, precision: int = 10, k: int = 200) -> None:
+        self._precision = precision
+        self._k = k
+        self._days: _Buckets = {}
+        self._weeks: _Buckets = {}
+
+    def add(self, channel_id: str, content_id: str, timestamp: datetime, rate: float) -> None:
+        day = bucket_start(timestamp, Granularity.DAILY)
+        days = self._days.setdefault(channel_id, {})
+        pair = days.get(day)
+        if pair is None:
+            pair = days[day] = (HyperLogLog(self._precision), KLLSketch(self._k))
+        pair[0].add(content_id)
+        pair[1].update(rate)
+
+    def expire(self, max_age: timedelta | None, now: datetime) -> None:
+        """Fold daily sketches older than ``max_age`` into their week's sketches."""
+        if max_age is None:
+            return
+        cutoff = bucket_start(now - max_age, Granularity.DAILY)
+        for channel_id in list(self._days):
+            days = self._days[channel_id]
+            old = [day for day in days if day < cutoff]
+            if not old:
+                continue
+            weeks = self._weeks.setdefault(channel_id, {})
+            for day in old:
+                hll, kll = days.pop(day)
+                week = bucket_start(day, Granularity.WEEKLY)
+                pair = weeks.get(week)
+                if pair is None:
+                    weeks[week] = (hll, kll)
+                else:
+                    pair[0].merge(hll)
+                    pair[1].merge(kll)
+            if not days:
+                del self._days[channel_id]
+
+    def _merged(
+        self, channel_id: str, start: datetime | None, end: datetime | None,
+    ) -> tuple[HyperLogLog, KLLSketch]:
+        # Weekly sketches are included whole when their week overlaps the window.
+        hll, kll = HyperLogLog(self._precision), KLLSketch(self._k)
+        for buckets, granularity in (
+            (self._days, Granularity.DAILY), (self._weeks, Granularity.WEEKLY),
+        ):
+            first = bucket_start(start, granularity) if start is not None else None
+            for bucket, (bucket_hll, bucket_kll) in buckets.get(channel_id, {}).items():
+                if (first is not None and bucket < first) or (end is not None and bucket > end):
+                    continue
+                hll.merge(bucket_hll)
+                kll.merge(bucket_kll)
+        return hll, kll
+
+    def distinct_content(
+        self, channel_id: str, start: datetime | None = None, end: datetime | None = None,
+    ) -> int:
+        """Approximate distinct content ids seen on a channel in [start, end] (by day)."""
+        return self._merged(channel_id, start, end)[0].count()
+
+    def rate_quantiles(
+        self,
+        channel_id: str,
+        qs: Iterable[float] = (0.5, 0.9, 0.99),
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict[float, float]:
+        """Approximate engagement-rate quantiles for a channel in [start, end] (by day)."""
+        return self._merged(channel_id, start, end)[1].quantiles(qs)
+
+    @property
+    def channels(self) -> list[str]:
+        return list(dict.fromkeys([*self._days, *self._weeks]))
+
+    def to_dict(self) -> dict[str, Any]:
+        def dump(buckets: _Buckets) -> dict[str, Any]:
+            return {
+                channel_id: {
+                    start.date().isoformat(): {"hll": hll.to_dict(), "kll": kll.to_dict()}
+                    for start, (hll, kll) in pairs.items()
+                }
+                for channel_id, pairs in buckets.items()
+            }
+
+        data: dict[str, Any] = {
+            "precision": self._precision, "k": self._k, "channels": dump(self._days),
+        }
+        if self._weeks:
+            data["weeks"] = dump(self._weeks)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ChannelSketches:
+        sketches = cls(data.get("precision", 10), data.get("k", 200))
+        for buckets, name in ((sketches._days, "channels"), (sketches._weeks, "weeks")):
+            for channel_id, pairs in data.get(name, {}).items():
+                buckets[channel_id] = {
+                    datetime.fromisoformat(start): (
+                        HyperLogLog.from_dict(pair["hll"]), KLLSketch.from_dict(pair["kll"]),
+                    )
+                    for start, pair in pairs.items()
+                }
+        return sketches
@@ -0,0 +1,188 @@
+"""Streaming reader for large JSON analytics stores.
+
+Walks a JsonStore file (or the matching segment of a segmented store)
+incrementally and yields the elements of one top-level array
+(``metrics`` by default) without parsing the whole document, so memory
+stays bounded by the read chunk plus one record.
+Records can be filtered by time range and channel while loading, which
+lets short-lived commands materialize only the rows they need.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Collection, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
+
+from kerygma_strategy import codec
+from kerygma_strategy.analytics import EngagementMetric
+from kerygma_strategy.persistence import _MANIFEST_KEY, _segment_dir
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Minimal pull tokenizer over a text stream, decoding one value at a time."""
+
+    def __init__(self, fh: IO[str], chunk_size: int) -> None:
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        # Read at least as much as is buffered so re-decoding a value that
+        # spans many chunks stays amortized linear.
+        chunk = self._fh.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+
+    def next_char(self) -> str:
+        """Consume and return the next non-whitespace character ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                ch = self._buf[self._pos]
+                self._pos += 1
+                return ch
+            if self._eof:
+                return ""
+            self._fill()
+
+    def unread(self) -> None:
+        self._pos -= 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        if not self.next_char():
+            raise json.JSONDecodeError("Unexpected end of data", self._buf, self._pos)
+        self.unread()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A value touching the buffer end may be a truncated number.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            self._fill()
+
+
+def _iter_elements(reader: _ChunkReader) -> Iterator[Any]:
+    """Yield the elements of the array at the reader, consuming its ``]``."""
+    if reader.next_char() != "[":
+        raise json.JSONDecodeError("Expected '['", "", 0)
+    if reader.next_char() == "]":
+        return
+    reader.unread()
+    while True:
+        yield reader.value()
+        ch = reader.next_char()
+        if ch == "]":
+            return
+        if ch != ",":
+            raise json.JSONDecodeError("Expected ',' or ']'", "", 0)
+
+
+def _iter_segments(
+    path: Path,
+    manifest: Any,
+    key: str,
+    chunk_size: int,
+    keep: Collection[str],
+    kept: dict[str, Any] | None,
+) -> Iterator[Any]:
+    """Stream ``key`` from a segmented JsonStore whose manifest was read from ``path``."""
+    segments = manifest.get("segments", {}) if isinstance(manifest, dict) else {}
+    directory = _segment_dir(path)
+    if kept is not None:
+        for name in keep:
+            if name in segments:
+                try:
+                    kept[name] = codec.loads(codec.read_bytes(directory / segments[name]))
+                except (OSError, ValueError):
+                    pass
+    if key not in segments:
+        return
+    with codec.open_text(directory / segments[key]) as fh:
+        yield from _iter_elements(_ChunkReader(fh, chunk_size))
+
+
+def iter_json_array(
+    path: Path,
+    key: str = "metrics",
+    chunk_size: int = 1 << 16,
+    keep: Collection[str] = (),
+    kept: dict[str, Any] | None = None,
+) -> Iterator[Any]:
+    """Yield the elements of the top-level array ``key`` in a JSON object file.
+
+    Other top-level values are decoded and discarded one at a time, except
+    those named in ``keep``, which are stored in ``kept`` (complete once the
+    iterator is exhausted). A segmented JsonStore manifest is followed to
+    the segment holding ``key``. gzip/lzma files are decompressed as they
+    are read. Like JsonStore, a missing file or malformed document yields
+    nothing (or stops at the first malformed element).
+    """
+    if not path.exists():
+        return
+    with codec.open_text(path) as fh:
+        reader = _ChunkReader(fh, chunk_size)
+        try:
+            if reader.next_char() != "{":
+                return
+            if reader.next_char() in ("}", ""):
+                return
+            reader.unread()
+            while True:
+                name = reader.value()
+                if reader.next_char() != ":":
+                    return
+                if name == _MANIFEST_KEY:
+                    yield from _iter_segments(path, reader.value(), key, chunk_size, keep, kept)
+                    return
+                if name == key:
+                    yield from _iter_elements(reader)
+                elif name in keep and kept is not None:
+                    kept[name] = reader.value()
+                else:
+                    reader.value()
+                if reader.next_char() != ",":
+                    return
+        except (json.JSONDecodeError, *codec.DECOMPRESSION_ERRORS):
+            return
+
+
+def iter_metrics(
+    path: Path,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    channels: Collection[str] | None = None,
+    chunk_size: int = 1 << 16,
+    keep: Collection[str] = (),
+    kept: dict[str, Any] | None = None,
+) -> Iterator[EngagementMetric]:
+    """Stream EngagementMetric rows from a store file, filtering as they load.
+
+    ``start``/``end`` bound the timestamp inclusively; ``channels`` limits
+    the channel ids kept. Rejected records are never turned into objects.
+    ``keep``/``kept`` are passed through to iter_json_array().
+    """
+    for item in iter_json_array(path, "metrics", chunk_size, keep, kept):
+        if channels is not None and item["channel_id"] not in channels:
+            continue
+        ts = datetime.fromisoformat(item["timestamp"])
+        if (start is not None and ts < start) or (end is not None and ts > end):
+            continue
+        yield EngagementMetric.from_dict(item, timestamp=ts)
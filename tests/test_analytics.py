@@ -1,8 +1,11 @@
 """Tests for the analytics module."""
 
-from datetime import datetime
+import tracemalloc
+from datetime import datetime, timedelta, timezone
 
-from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+import pytest
+
+from kerygma_strategy.analytics import AnalyticsCollector, CompactMetric, EngagementMetric
 
 
 def test_record_and_retrieve():
@@ -58,3 +61,213 @@ def test_to_dict():
     d = m.to_dict()
     assert d["channel_id"] == "ch1"
     assert "engagement_rate" in d
+
+
+def test_indexes_track_rows():
+    collector = AnalyticsCollector()
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c1", timestamp=datetime(2026, 1, 1), impressions=100))
+    collector.record(EngagementMetric(channel_id="ch2", content_id="c1", timestamp=datetime(2026, 1, 2), impressions=200))
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c2", timestamp=datetime(2026, 1, 3), impressions=300))
+    assert [m.impressions for m in collector.get_by_channel("ch1")] == [100, 300]
+    assert [m.impressions for m in collector.get_by_content("c1")] == [100, 200]
+    assert collector.get_by_channel("missing") == []
+
+
+def test_indexes_rebuilt_from_dict():
+    data = {"metrics": [
+        {"channel_id": "ch1", "content_id": "c1", "timestamp": "2026-01-01T00:00:00", "impressions": 5},
+        {"channel_id": "ch2", "content_id": "c1", "timestamp": "2026-01-02T00:00:00", "impressions": 7},
+    ]}
+    collector = AnalyticsCollector.from_dict(data)
+    assert [m.impressions for m in collector.get_by_content("c1")] == [5, 7]
+    assert collector.get_by_channel("ch2")[0].impressions == 7
+    indexes = (dict(collector._by_channel), dict(collector._by_content))
+    collector._rebuild_indexes()
+    assert (collector._by_channel, collector._by_content) == indexes
+
+
+def test_running_aggregates_match_recompute():
+    collector = AnalyticsCollector(verify_aggregates=True)
+    for i in range(20):
+        collector.record(EngagementMetric(
+            channel_id=f"ch{i % 3}", content_id=f"c{i % 7}", timestamp=datetime(2026, 1, 1),
+            impressions=10 * i, clicks=i, shares=i % 2, replies=i % 3,
+        ))
+    agg = collector.aggregate_by_channel()
+    assert agg["ch0"]["impressions"] == sum(10 * i for i in range(0, 20, 3))
+    assert len(collector.top_content(limit=3)) == 3
+    collector.check_aggregates()
+
+
+def test_aggregate_drift_detected():
+    collector = AnalyticsCollector(verify_aggregates=True)
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c1", timestamp=datetime(2026, 1, 1), impressions=100, clicks=10))
+    collector._channel_totals["ch1"]["clicks"] += 1
+    with pytest.raises(RuntimeError, match="ch1"):
+        collector.aggregate_by_channel()
+
+
+def test_range_handles_out_of_order_arrivals():
+    collector = AnalyticsCollector()
+    for day in (5, 1, 3, 3, 9, 2):
+        collector.record(EngagementMetric(channel_id="ch1", content_id=f"c{day}", timestamp=datetime(2026, 1, day)))
+    window = collector.range(datetime(2026, 1, 2), datetime(2026, 1, 5))
+    assert [m.timestamp.day for m in window] == [2, 3, 3, 5]
+    assert collector.range(datetime(2026, 2, 1), datetime(2026, 3, 1)) == []
+    assert len(collector.range(datetime(2025, 1, 1), datetime(2027, 1, 1))) == 6
+
+
+def test_record_many_mixed_items_and_time_order():
+    collector = AnalyticsCollector()
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c0", timestamp=datetime(2026, 1, 10)))
+    n = collector.record_many([
+        EngagementMetric(channel_id="ch1", content_id="c1", timestamp=datetime(2026, 1, 12), impressions=10),
+        {"channel_id": "ch2", "content_id": "c2", "timestamp": "2026-01-05T00:00:00", "impressions": 20},
+        {"channel_id": "ch2", "content_id": "c3", "timestamp": datetime(2026, 1, 11), "clicks": 3},
+    ])
+    assert n == 3
+    assert collector.total_records == 4
+    assert [m.content_id for m in collector.range(datetime(2026, 1, 1), datetime(2026, 2, 1))] == ["c2", "c0", "c3", "c1"]
+    assert collector.aggregate_by_channel()["ch2"] == {"impressions": 20, "clicks": 3, "shares": 0, "replies": 0}
+    assert [m.content_id for m in collector.get_by_channel("ch2")] == ["c2", "c3"]
+
+
+def test_record_many_large_late_batch_merges():
+    collector = AnalyticsCollector()
+    collector.record_many({"channel_id": "ch", "content_id": f"a{i}", "timestamp": datetime(2026, 2, 1, i % 24)} for i in range(100))
+    collector.record_many({"channel_id": "ch", "content_id": f"b{i}", "timestamp": datetime(2026, 1, 1 + i % 28)} for i in range(100))
+    keys = collector._time_keys
+    assert keys == sorted(keys)
+    assert len(collector.range(datetime(2026, 1, 1), datetime(2026, 1, 31))) == 100
+
+
+def test_naive_and_aware_timestamps_share_the_index():
+    collector = AnalyticsCollector()
+    collector.record(EngagementMetric("ch", "c1", datetime(2026, 1, 2, 12)))
+    collector.record(EngagementMetric("ch", "c2", datetime(2026, 1, 2, 9, tzinfo=timezone(timedelta(hours=-5)))))
+    collector.record(EngagementMetric("ch", "c3", datetime(2026, 1, 2, 13)))
+    assert [m.content_id for m in collector.get_by_channel("ch")] == ["c1", "c2", "c3"]
+    assert [m.content_id for m in collector.range(datetime(2026, 1, 2), datetime(2026, 1, 3))] == ["c1", "c3", "c2"]
+    assert collector.distinct_content("ch", start=datetime(2026, 1, 2)) == 3
+
+
+def test_record_many_rejects_bad_batch_atomically():
+    collector = AnalyticsCollector()
+    with pytest.raises(ValueError, match="Item 1"):
+        collector.record_many([
+            {"channel_id": "ch1", "content_id": "c1", "timestamp": "2026-01-01T00:00:00"},
+            {"channel_id": "ch1", "content_id": "c2", "timestamp": "2026-01-01T00:00:00", "clicks": -1},
+        ])
+    with pytest.raises(TypeError):
+        collector.record_many([42])  # type: ignore[list-item]
+    with pytest.raises(TypeError, match="invalid timestamp"):
+        collector.record_many([{"channel_id": "ch1", "content_id": "c1", "timestamp": 1767225600}])
+    assert collector.total_records == 0
+
+
+def test_record_many_persists_once(tmp_path, monkeypatch):
+    from kerygma_strategy.persistence import JsonStore
+
+    saves = []
+    store = JsonStore(tmp_path / "analytics.json")
+    original = store.save
+    monkeypatch.setattr(store, "save", lambda: (saves.append(1), original()))
+    collector = AnalyticsCollector(store=store, persist_every=10)
+    collector.record_many(EngagementMetric(channel_id="ch", content_id=f"c{i}", timestamp=datetime(2026, 1, 1)) for i in range(95))
+    assert len(saves) == 1
+
+
+def test_compact_metric_matches_dataclass():
+    metric = EngagementMetric(channel_id="ch1", content_id="c1", timestamp=datetime(2026, 1, 1, 9, 30, 0, 250), impressions=100, clicks=5, shares=2, replies=1)
+    compact = CompactMetric.from_metric(metric)
+    assert compact == metric and metric == compact
+    assert compact.timestamp == metric.timestamp
+    assert compact.to_dict() == metric.to_dict()
+    assert CompactMetric.from_dict(metric.to_dict()).to_metric() == metric
+    assert compact.engagement_rate == metric.engagement_rate
+    assert not hasattr(compact, "__dict__")
+    other = CompactMetric("".join(["c", "h1"]), "c2", datetime(2026, 1, 1))
+    assert other.channel_id is compact.channel_id
+    aware = CompactMetric("ch1", "c1", datetime(2026, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))))
+    assert aware.timestamp == datetime(2026, 1, 1, 10)
+
+
+def test_compact_records_collector():
+    collector = AnalyticsCollector(compact_records=True, upsert="merge")
+    for day in (5, 1, 3, 9, 2):
+        collector.record(EngagementMetric(channel_id="ch1", content_id=f"c{day}", timestamp=datetime(2026, 1, day), impressions=10))
+    collector.record_many([{"channel_id": "ch1", "content_id": "c3", "timestamp": datetime(2026, 1, 3), "impressions": 30}])
+    window = collector.range(datetime(2026, 1, 2), datetime(2026, 1, 5))
+    assert [m.content_id for m in window] == ["c2", "c3", "c5"]
+    assert all(isinstance(m, CompactMetric) for m in window)
+    assert collector.aggregate_by_channel()["ch1"]["impressions"] == 70
+    collector.check_aggregates()
+    with pytest.raises(ValueError):
+        AnalyticsCollector(columnar=True, compact_records=True)
+
+
+def test_compact_upsert_matches_aware_timestamps(tmp_path):
+    from kerygma_strategy.persistence import SqliteStore
+
+    store = SqliteStore(tmp_path / "analytics.db")
+    collector = AnalyticsCollector(store=store, compact_records=True, upsert="merge", persist_every=1)
+    aware = datetime(2026, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c1", timestamp=aware, impressions=7))
+    collector.record(EngagementMetric(channel_id="ch1", content_id="c1", timestamp=aware, impressions=9))
+    assert collector.total_records == 1
+    assert collector.aggregate_by_channel()["ch1"]["impressions"] == 9
+    assert store.count_metrics() == 1
+    collector.check_aggregates()
+
+
+def test_compact_record_memory_budget():
+    n = 50_000
+    base = datetime(2026, 3, 1)
+    posts = [f"post-{i}" for i in range(5000)]
+    tracemalloc.start()
+    try:
+        rows = [
+            CompactMetric(
+                f"ch{i % 4}", posts[i % 5000], base + timedelta(seconds=37 * i),
+                1000 + i * 7919 % 50000, i * 31 % 400, i % 23, i % 11,
+            )
+            for i in range(n)
+        ]
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(rows) == n
+    # Object, integer timestamp, impressions and list slot (~170 B); interned
+    # ids and small counters are shared.
+    assert used / n < 200
+
+
+def test_record_many_accepts_compact_rows():
+    source = AnalyticsCollector(compact_records=True)
+    for day in (1, 2, 3):
+        source.record(EngagementMetric("mastodon", f"c{day}", datetime(2026, 1, day), impressions=day))
+    target = AnalyticsCollector()
+    assert target.record_many(source.all_metrics) == 3
+    assert target.all_metrics == source.all_metrics
+    assert all(type(m) is EngagementMetric for m in target.all_metrics)
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_views_are_zero_copy_and_read_only(columnar):
+    collector = AnalyticsCollector(columnar=columnar)
+    for day in (4, 1, 3, 2):
+        collector.record(EngagementMetric(channel_id=f"ch{day % 2}", content_id=f"c{day}", timestamp=datetime(2026, 1, day), impressions=day))
+    view = collector.all_metrics
+    assert view._rows is collector._metrics
+    assert len(view) == 4 and view[0].content_id == "c4" and view[-1].content_id == "c2"
+    assert [m.content_id for m in view[1:3]] == ["c1", "c3"]
+    assert view == list(view) and view != view[1:]
+    with pytest.raises(TypeError):
+        view[0] = view[1]  # type: ignore[index]
+    assert not hasattr(view, "append")
+    window = collector.view(start=datetime(2026, 1, 2), end=datetime(2026, 1, 3))
+    assert [m.content_id for m in window] == ["c2", "c3"]
+    assert [m.content_id for m in collector.view(channel_id="ch0")] == ["c4", "c2"]
+    assert [m.content_id for m in collector.view(channel_id="ch0", start=datetime(2026, 1, 3))] == ["c4"]
+    assert list(collector.view(channel_id="missing")) == []
+    assert [m.impressions for m in collector.view().filter(lambda m: m.impressions > 2)] == [4, 3]
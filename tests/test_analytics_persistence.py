@@ -3,7 +3,7 @@
 from datetime import datetime
 
 from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
-from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.persistence import AppendLog, JsonStore, SqliteStore
 
 
 class TestAnalyticsPersistence:
@@ -49,3 +49,202 @@ def test_without_store_no_crash(self):
             timestamp=datetime(2026, 1, 1), impressions=50,
         ))
         assert collector.total_records == 1
+
+    def test_wal_appends_and_replays(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(wal=AppendLog(path), persist_every=2)
+        for i in range(5):
+            collector.record(EngagementMetric(
+                channel_id="mastodon", content_id=f"c{i}",
+                timestamp=datetime(2026, 2, 15, i), impressions=10 * i,
+            ))
+        collector.close()
+
+        reloaded = AnalyticsCollector(wal=AppendLog(path))
+        assert reloaded.total_records == 5
+        assert reloaded.aggregate_by_channel()["mastodon"]["impressions"] == 100
+
+    def test_wal_compaction(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(
+            wal=AppendLog(path, compact_every=3), persist_every=1,
+        )
+        for i in range(4):
+            collector.record(EngagementMetric(
+                channel_id="discord", content_id="c1", timestamp=datetime(2026, 2, 15, i),
+            ))
+        collector.close()
+        assert path.exists()
+        assert AnalyticsCollector(wal=AppendLog(path)).total_records == 4
+
+
+class TestConcurrentWriters:
+    def test_collectors_sharing_a_locked_store_keep_all_metrics(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        first = AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=1)
+        second = AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=1)
+        for i in range(3):
+            first.record(EngagementMetric("mastodon", f"post-{i}", datetime(2026, 1, 1 + i)))
+            second.record(EngagementMetric("discord", f"post-{i}", datetime(2026, 1, 1 + i)))
+        reloaded = AnalyticsCollector(store=JsonStore(path))
+        assert len(reloaded.all_metrics) == 6
+        assert {m.channel_id for m in reloaded.all_metrics} == {"mastodon", "discord"}
+
+    def test_sketches_cover_every_writers_rows(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        writers = [
+            AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=5)
+            for _ in range(4)
+        ]
+        for w, collector in enumerate(writers):
+            for i in range(10):
+                collector.record(EngagementMetric(f"ch{w}", f"post-{i}", datetime(2026, 1, 1 + i)))
+        for collector in writers:
+            collector.close()
+        reloaded = AnalyticsCollector(store=JsonStore(path))
+        assert reloaded.total_records == 40
+        assert sorted(reloaded.sketches.channels) == ["ch0", "ch1", "ch2", "ch3"]
+        assert reloaded.distinct_content("ch1") == 10
+
+
+    def test_flush_keeps_another_writers_compacted_rollups(self, tmp_path):
+        from kerygma_strategy.rollups import RetentionPolicy
+
+        path = tmp_path / "analytics.json"
+        now = datetime(2026, 6, 1)
+        seed = AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=1)
+        seed.record(EngagementMetric("mastodon", "old-0", datetime(2026, 1, 1), impressions=101))
+        seed.compact(RetentionPolicy(), now=now)
+        seed.close()
+        first = AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=1)
+        second = AnalyticsCollector(store=JsonStore(path, locking=True), persist_every=1)
+        first.record(EngagementMetric("mastodon", "old-1", datetime(2026, 1, 2), impressions=100))
+        first.compact(RetentionPolicy(), now=now)
+        second.record(EngagementMetric("mastodon", "new", now, impressions=1))
+        reloaded = AnalyticsCollector(store=JsonStore(path))
+        assert reloaded.rollups.channel_totals()["mastodon"].impressions == 201
+        assert reloaded.aggregate_by_channel()["mastodon"]["impressions"] == 202
+
+
+class TestBackgroundStore:
+    def test_close_waits_for_background_save(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        store = JsonStore(path, background=True)
+        collector = AnalyticsCollector(store=store, persist_every=2)
+        for i in range(5):
+            collector.record(EngagementMetric("mastodon", f"post-{i}", datetime(2026, 1, 1 + i)))
+        collector.close()
+        assert len(AnalyticsCollector(store=JsonStore(path)).all_metrics) == 5
+        store.close()
+
+
+class TestSqlitePersistence:
+    def test_flush_appends_only_new_rows(self, tmp_path):
+        path = tmp_path / "analytics.db"
+        collector = AnalyticsCollector(store=SqliteStore(path), persist_every=3)
+        for day in range(1, 8):
+            collector.record(EngagementMetric(
+                channel_id="mastodon" if day % 2 else "ghost", content_id=f"c{day}",
+                timestamp=datetime(2026, 3, day), impressions=10 * day,
+            ))
+        collector.flush()
+        store = SqliteStore(path)
+        assert store.count_metrics() == 7
+        assert "sketches" not in store.keys()
+        collector.close()
+        assert "sketches" in store.keys()
+        reloaded = AnalyticsCollector(store=store)
+        assert reloaded.all_metrics == collector.all_metrics
+        assert reloaded.aggregate_by_channel() == collector.aggregate_by_channel()
+
+        view = AnalyticsCollector.from_sqlite(
+            store, start=datetime(2026, 3, 2), end=datetime(2026, 3, 5), channels=["mastodon"],
+        )
+        assert [m.content_id for m in view.all_metrics] == ["c3", "c5"]
+
+    def test_compaction_rewrites_table(self, tmp_path):
+        from kerygma_strategy.rollups import RetentionPolicy
+
+        store = SqliteStore(tmp_path / "analytics.db")
+        collector = AnalyticsCollector(store=store)
+        for day in range(1, 11):
+            collector.record(EngagementMetric(channel_id="mastodon", content_id=f"c{day}", timestamp=datetime(2026, 1, day)))
+        collector.flush()
+        collector.compact(RetentionPolicy(), now=datetime(2026, 4, 5))
+        assert store.count_metrics() == collector.total_records == 6
+        assert AnalyticsCollector(store=SqliteStore(tmp_path / "analytics.db")).total_records == 6
+        view = AnalyticsCollector.from_sqlite(SqliteStore(tmp_path / "analytics.db"))
+        assert view.total_records == 6
+        assert view.rollups.channel_totals()["mastodon"].count == 4
+        assert view.aggregate_by_channel() == collector.aggregate_by_channel()
+
+    def test_upsert_flush_updates_rows(self, tmp_path):
+        path = tmp_path / "analytics.db"
+        collector = AnalyticsCollector(
+            store=SqliteStore(path), upsert="merge", upsert_key=("channel_id", "content_id"),
+            persist_every=1,
+        )
+        for i in range(1, 6):
+            collector.record(EngagementMetric("mastodon", "c1", datetime(2026, 3, i), impressions=100 * i))
+        collector.record(EngagementMetric("ghost", "c2", datetime(2026, 3, 2), impressions=7))
+        store = SqliteStore(path)
+        assert store.count_metrics() == 2
+        view = AnalyticsCollector.from_sqlite(store)
+        assert view.aggregate_by_channel()["mastodon"]["impressions"] == 500
+        reloaded = AnalyticsCollector(store=store, upsert="merge", upsert_key=("channel_id", "content_id"))
+        assert reloaded.all_metrics == collector.all_metrics
+
+
+class TestUpsert:
+    @staticmethod
+    def _sample(hour: int, favourites: int, ts_hour: int = 0) -> EngagementMetric:
+        return EngagementMetric(
+            channel_id="mastodon", content_id="status-1",
+            timestamp=datetime(2026, 3, 1, ts_hour), impressions=100 + hour, clicks=favourites,
+        )
+
+    def test_replace_keeps_one_row(self):
+        collector = AnalyticsCollector(upsert="replace", verify_aggregates=True)
+        for i in range(5):
+            collector.record(self._sample(i, favourites=i))
+        assert collector.total_records == 1
+        assert collector.get_by_content("status-1")[0].clicks == 4
+        assert collector.aggregate_by_channel()["mastodon"]["impressions"] == 104
+
+    def test_merge_takes_counter_maximum(self):
+        collector = AnalyticsCollector(
+            upsert="merge", upsert_key=("channel_id", "content_id"), verify_aggregates=True,
+        )
+        collector.record(self._sample(0, favourites=9, ts_hour=1))
+        collector.record(self._sample(5, favourites=3, ts_hour=4))
+        [row] = collector.all_metrics
+        assert (row.impressions, row.clicks, row.timestamp.hour) == (105, 9, 4)
+        assert collector.range(datetime(2026, 3, 1, 3), datetime(2026, 3, 1, 5)) == [row]
+        assert collector.range(datetime(2026, 3, 1), datetime(2026, 3, 1, 2)) == []
+        collector.check_aggregates()
+
+    def test_upsert_collapses_wal_on_replay(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(wal=AppendLog(path), upsert="replace", persist_every=1)
+        for i in range(10):
+            collector.record(self._sample(i, favourites=i))
+        collector.close()
+        reloaded = AnalyticsCollector(wal=AppendLog(path), upsert="replace")
+        assert reloaded.total_records == 1
+        assert reloaded.all_metrics[0].clicks == 9
+
+    def test_upsert_with_columnar_and_store(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(store=JsonStore(path), upsert="replace", columnar=True)
+        collector.record_many([self._sample(i, favourites=i) for i in range(3)])
+        collector.flush()
+        assert len(JsonStore(path).get("metrics")) == 1
+        assert collector.all_metrics[0].clicks == 2
+
+    def test_invalid_configuration(self):
+        import pytest
+
+        with pytest.raises(ValueError):
+            AnalyticsCollector(upsert="upsert")
+        with pytest.raises(ValueError):
+            AnalyticsCollector(upsert="replace", upsert_key=("timestamp",))
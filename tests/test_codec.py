@@ -0,0 +1,94 @@
+"""Tests for the shared JSON codec."""
+
+import json
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from kerygma_strategy import codec
+from kerygma_strategy.persistence import JsonStore
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        if codec.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+DOC = {
+    "when": datetime(2026, 3, 1, 9, 30, 0, 250),
+    "aware": datetime(2026, 3, 1, tzinfo=timezone.utc),
+    "day": date(2026, 3, 1),
+    "path": Path("reports"),
+    "nested": {"list": [1, 2.5, None, True], "text": "café"},
+}
+
+
+def test_backend_name(backend):
+    assert codec.backend() == backend
+
+
+def test_round_trip_and_datetimes(backend):
+    decoded = codec.loads(codec.dumps(DOC))
+    assert decoded["when"] == "2026-03-01T09:30:00.000250"
+    assert decoded["aware"] == "2026-03-01T00:00:00+00:00"
+    assert decoded["day"] == "2026-03-01"
+    assert decoded["path"] == "reports"
+    assert decoded["nested"] == DOC["nested"]
+    assert codec.loads(codec.dumps_bytes(DOC, compact=True)) == decoded
+
+
+def test_layouts_match_stdlib(backend):
+    plain = {"a": [1, {"b": "x"}], "c": "é"}
+    assert codec.dumps(plain) == json.dumps(plain, indent=2, ensure_ascii=False)
+    compact = codec.dumps(plain, compact=True)
+    assert compact == '{"a":[1,{"b":"x"}],"c":"é"}'
+    assert len(compact) < len(codec.dumps(plain))
+
+
+def test_bad_input_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_compact_json_store(tmp_path, backend):
+    path = tmp_path / "store.json"
+    store = JsonStore(path, compact=True)
+    store.set("metrics", [{"n": i, "ts": datetime(2026, 1, 1)} for i in range(3)])
+    store.save()
+    assert "\n" not in path.read_text(encoding="utf-8")
+    assert JsonStore(path).get("metrics")[2] == {"n": 2, "ts": "2026-01-01T00:00:00"}
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "lzma"])
+def test_compressed_files_round_trip(tmp_path, compression):
+    path = tmp_path / "doc.json"
+    codec.write_bytes(path, [b'{"a":', b" [1, 2]}"], compression)
+    head = path.read_bytes()[:6]
+    assert codec.detect_compression(head) == compression
+    assert codec.loads(codec.read_bytes(path)) == {"a": [1, 2]}
+    with codec.open_text(path) as fh:
+        assert fh.read() == '{"a": [1, 2]}'
+
+
+def test_compression_names_and_suffixes(tmp_path):
+    assert codec.compression_for(tmp_path / "a.json.gz") == "gzip"
+    assert codec.compression_for(tmp_path / "a.json.xz") == "lzma"
+    assert codec.compression_for(tmp_path / "a.json") is None
+    assert codec.compression_suffix("lzma") == ".xz"
+    assert codec.compression_suffix(None) == ""
+    with pytest.raises(ValueError, match="Unknown compression"):
+        codec.check_compression("zip")
+
+
+def test_truncated_compressed_file_raises_value_error(tmp_path):
+    path = tmp_path / "doc.json.gz"
+    codec.write_bytes(path, b'{"a": 1}' * 100, "gzip")
+    path.write_bytes(path.read_bytes()[:20])
+    with pytest.raises(ValueError, match="Corrupt compressed file"):
+        codec.read_bytes(path)
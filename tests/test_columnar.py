@@ -0,0 +1,93 @@
+"""Tests for the columnar analytics backend."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from kerygma_strategy import columnar
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.columnar import ColumnarMetrics, from_epoch, to_epoch
+
+
+def _metrics() -> list[EngagementMetric]:
+    return [
+        EngagementMetric(channel_id="mastodon", content_id="c1", timestamp=datetime(2026, 2, 1),
+                         impressions=100, clicks=10, shares=2, replies=1),
+        EngagementMetric(channel_id="discord", content_id="c1", timestamp=datetime(2026, 2, 2),
+                         impressions=0, clicks=3),
+        EngagementMetric(channel_id="mastodon", content_id="c2", timestamp=datetime(2026, 2, 3),
+                         impressions=200, clicks=50, shares=10, replies=5),
+    ]
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar.np is None:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(columnar, "np", None)
+    return request.param
+
+
+def _pair() -> tuple[AnalyticsCollector, AnalyticsCollector]:
+    plain = AnalyticsCollector()
+    table = AnalyticsCollector(columnar=True)
+    for m in _metrics():
+        plain.record(m)
+        table.record(m)
+    return plain, table
+
+
+def test_epoch_round_trip():
+    ts = datetime(2026, 2, 15, 12, 30, 5)
+    assert from_epoch(to_epoch(ts)) == ts
+    aware = datetime(2026, 2, 15, 12, 30, 5, tzinfo=timezone.utc)
+    assert from_epoch(to_epoch(aware)) == ts
+
+
+def test_lazy_view_materializes_rows():
+    table = ColumnarMetrics()
+    for m in _metrics():
+        table.append(m)
+    assert len(table) == 3
+    assert table[0] == _metrics()[0]
+    assert table[-1].content_id == "c2"
+    assert list(table) == _metrics()
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_queries_match_list_backend(backend):
+    plain, table = _pair()
+    assert table.get_by_channel("mastodon") == plain.get_by_channel("mastodon")
+    assert table.get_by_content("c1") == plain.get_by_content("c1")
+    assert table.get_by_channel("missing") == []
+    assert table.aggregate_by_channel() == plain.aggregate_by_channel()
+    assert table.top_content() == pytest.approx(plain.top_content())
+    assert table.all_metrics == plain.all_metrics
+
+
+def test_columnar_round_trip_through_store(tmp_path):
+    from kerygma_strategy.persistence import JsonStore
+
+    path = tmp_path / "analytics.json"
+    collector = AnalyticsCollector(store=JsonStore(path), columnar=True)
+    for m in _metrics():
+        collector.record(m)
+    collector.flush()
+
+    reloaded = AnalyticsCollector(store=JsonStore(path), columnar=True)
+    assert reloaded.total_records == 3
+    assert reloaded.aggregate_by_channel()["mastodon"]["impressions"] == 300
+
+
+def test_time_index_keys_on_stored_seconds():
+    collector = AnalyticsCollector(columnar=True, upsert="merge", upsert_key=("channel_id", "content_id"))
+    collector.record(EngagementMetric("mastodon", "c1", datetime(2026, 2, 1, 12, 0, 0, 700_000)))
+    collector.record(EngagementMetric("mastodon", "c2", datetime(2026, 2, 1, 12, 0, 1)))
+    assert all(isinstance(key, int) for key in collector._time_keys)
+    window = collector.range(datetime(2026, 2, 1, 12, 0, 0, 500_000), datetime(2026, 2, 1, 13))
+    assert [m.content_id for m in window] == ["c2"]
+    collector.record(EngagementMetric("mastodon", "c1", datetime(2026, 2, 1, 12, 30)))
+    assert [m.content_id for m in collector.range(datetime(2026, 2, 1, 12, 0, 1), datetime(2026, 2, 1, 13))] == ["c2", "c1"]
@@ -0,0 +1,103 @@
+"""Tests for concurrent ingestion."""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.ingest import ConcurrentIngestor
+from kerygma_strategy.persistence import AppendLog, JsonStore
+
+
+def _metric(thread: int, i: int) -> EngagementMetric:
+    return EngagementMetric(
+        channel_id=f"ch{thread}", content_id=f"c{i % 10}",
+        timestamp=datetime(2026, 3, 1, i % 24), impressions=10, clicks=1,
+    )
+
+
+class TestConcurrentIngestor:
+    def test_many_producers(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(wal=AppendLog(path), persist_every=100)
+        per_thread = 500
+
+        with ConcurrentIngestor(collector, batch_size=64) as ingestor:
+            def produce(t):
+                for i in range(per_thread):
+                    ingestor.submit(_metric(t, i))
+
+            threads = [threading.Thread(target=produce, args=(t,)) for t in range(8)]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+        collector.close()
+
+        assert collector.total_records == 8 * per_thread
+        assert collector.aggregate_by_channel()["ch3"]["impressions"] == 10 * per_thread
+        assert AnalyticsCollector(wal=AppendLog(path)).total_records == 8 * per_thread
+
+    def test_wait_idle_flushes(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(store=JsonStore(path), persist_every=10_000)
+        ingestor = ConcurrentIngestor(collector)
+        ingestor.submit_many(_metric(0, i) for i in range(25))
+        assert ingestor.wait_idle(timeout=5)
+        assert AnalyticsCollector(store=JsonStore(path)).total_records == 25
+        ingestor.close()
+
+    def test_writer_errors_surface(self):
+        collector = AnalyticsCollector()
+        ingestor = ConcurrentIngestor(collector)
+        ingestor.submit("not a metric")  # type: ignore[arg-type]
+        with pytest.raises(RuntimeError, match="writer failed"):
+            ingestor.wait_idle(timeout=5)
+        ingestor.close()
+
+    def test_bad_item_does_not_drop_batch(self):
+        collector = AnalyticsCollector()
+        ingestor = ConcurrentIngestor(collector, flush_interval=60)
+        items: list[object] = [_metric(0, i) for i in range(20)]
+        items.insert(7, {"channel_id": "ch0", "timestamp": "2026-03-01T00:00:00"})
+        ingestor.submit_many(items)  # type: ignore[arg-type]
+        with pytest.raises(RuntimeError, match="writer failed") as info:
+            ingestor.wait_idle(timeout=5)
+        assert "Item 0: missing 'content_id'" in str(info.value.__cause__)
+        ingestor.close()
+        assert collector.total_records == 20
+
+    def test_submit_blocks_when_queue_is_full(self, monkeypatch):
+        collector = AnalyticsCollector()
+        release = threading.Event()
+        record_many = collector.record_many
+
+        def slow_record_many(items):
+            release.wait(5)
+            return record_many(items)
+
+        monkeypatch.setattr(collector, "record_many", slow_record_many)
+        ingestor = ConcurrentIngestor(collector, batch_size=1, max_pending=2)
+        ingestor.submit(_metric(0, 0))
+        while ingestor._queue.qsize():  # writer holds the first item
+            threading.Event().wait(0.01)
+        ingestor.submit(_metric(0, 1))
+        ingestor.submit(_metric(0, 2))
+        blocked = threading.Thread(target=ingestor.submit, args=(_metric(0, 3),))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+        release.set()
+        blocked.join(5)
+        ingestor.close()
+        assert collector.total_records == 4
+
+    def test_submit_after_close_raises(self):
+        collector = AnalyticsCollector()
+        ingestor = ConcurrentIngestor(collector)
+        ingestor.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            ingestor.submit(_metric(0, 0))
+        with pytest.raises(RuntimeError, match="closed"):
+            ingestor.submit_many([_metric(0, 1)])
@@ -1,8 +1,14 @@
 """Tests for the persistence module."""
 
 import json
+import multiprocessing
+import threading
+from datetime import datetime
+from pathlib import Path
 
-from kerygma_strategy.persistence import JsonStore
+import pytest
+
+from kerygma_strategy.persistence import AppendLog, JsonStore, MappedJsonStore, SqliteStore
 
 
 class TestJsonStore:
@@ -65,3 +71,428 @@ def test_atomic_write(self, tmp_path):
         # No .tmp file should remain
         assert not (path.with_suffix(".tmp")).exists()
         assert json.loads(path.read_text())["key"] == "value"
+
+
+class TestDirtyTracking:
+    def test_segmented_save_skips_when_clean(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, segmented=True)
+        store.set("a", 1)
+        assert store.dirty_keys == {"a"}
+        store.save()
+        assert store.dirty_keys == set()
+        # A clean save does not touch the manifest.
+        path.write_text(json.dumps({"a": 2}))
+        store.save()
+        assert json.loads(path.read_text()) == {"a": 2}
+        assert JsonStore(path).dirty_keys == set()
+        store.delete("missing")
+        assert store.dirty_keys == set()
+
+    def test_pathless_store_keeps_no_append_buffer(self):
+        store = JsonStore()
+        store.append("items", range(3))
+        store.append("items", [3])
+        assert store.get("items") == [0, 1, 2, 3]
+        assert store._appended == {}
+        store.save()
+        assert store.dirty_keys == set()
+
+    def test_monolithic_save_keeps_in_place_mutations(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path)
+        store.set("items", [1])
+        store.save()
+        store.get("items").append(2)
+        store.save()
+        assert JsonStore(path).get("items") == [1, 2]
+
+    def test_segmented_writes_only_dirty_keys(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, segmented=True)
+        store.set("metrics", [{"n": i} for i in range(100)])
+        store.set("config", {"v": 1})
+        store.save()
+        segments = tmp_path / "store.json.segments"
+        metrics_file = segments / json.loads(path.read_text())["__jsonstore_segments__"]["segments"]["metrics"]
+        before = metrics_file.stat().st_mtime_ns
+        store.set("config", {"v": 2})
+        store.save()
+        manifest = json.loads(path.read_text())["__jsonstore_segments__"]["segments"]
+        assert segments / manifest["metrics"] == metrics_file
+        assert metrics_file.stat().st_mtime_ns == before
+        assert len(list(segments.iterdir())) == 2
+        reloaded = JsonStore(path)
+        assert reloaded.get("config") == {"v": 2}
+        assert len(reloaded.get("metrics")) == 100
+
+    def test_segmented_delete_and_crash_safety(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, segmented=True)
+        store.set("a", 1)
+        store.set("b", None)
+        store.save()
+        store.delete("b")
+        store.save()
+        assert JsonStore(path).to_dict() == {"a": 1}
+        # An orphaned segment from an interrupted save is ignored.
+        (tmp_path / "store.json.segments" / "seg-99999999.json").write_text("{")
+        assert JsonStore(path).to_dict() == {"a": 1}
+
+    def test_monolithic_file_converted(self, tmp_path):
+        path = tmp_path / "store.json"
+        JsonStore.from_dict({"a": 1, "b": [1, 2]}, path=path).save()
+        store = JsonStore(path, segmented=True)
+        assert store.dirty_keys == {"a", "b"}
+        store.save()
+        assert "__jsonstore_segments__" in json.loads(path.read_text())
+        assert JsonStore(path).to_dict() == {"a": 1, "b": [1, 2]}
+
+
+
+DOC = {
+    "metrics": [{"n": i, "text": 'quote " and } ] { ['} for i in range(50)],
+    "config": {"nested": {"x": [1, 2, {}]}, "empty": []},
+    "escaped": "back\\slash",
+    "number": -1.5e3,
+    "flag": None,
+}
+
+
+def _locked_writer(path: str, worker: int, rounds: int) -> None:
+    for i in range(rounds):
+        store = JsonStore(Path(path), locking=True)
+        store.append("items", [f"{worker}-{i}"])
+        store.save()
+
+
+class TestLocking:
+    def test_concurrent_appends_are_merged(self, tmp_path):
+        path = tmp_path / "store.json"
+        first = JsonStore(path, locking=True)
+        second = JsonStore(path, locking=True)
+        first.append("metrics", [1, 2])
+        second.append("metrics", [3])
+        first.save()
+        second.save()
+        assert JsonStore(path).get("metrics") == [1, 2, 3]
+        # The rebased store now sees the other writer's items.
+        assert second.get("metrics") == [1, 2, 3]
+        first.append("metrics", [4])
+        first.save()
+        assert JsonStore(path).get("metrics") == [1, 2, 3, 4]
+
+    def test_set_wins_per_key_and_clean_keys_refresh(self, tmp_path):
+        path = tmp_path / "store.json"
+        JsonStore.from_dict({"a": 1, "b": 1, "c": 1}, path=path).save()
+        first = JsonStore(path, locking=True)
+        second = JsonStore(path, locking=True)
+        first.set("a", 2)
+        first.delete("c")
+        first.save()
+        second.set("b", 3)
+        second.save()
+        assert JsonStore(path).to_dict() == {"a": 2, "b": 3}
+
+    def test_unlocked_store_keeps_last_writer(self, tmp_path):
+        path = tmp_path / "store.json"
+        first = JsonStore(path)
+        second = JsonStore(path)
+        first.append("metrics", [1])
+        second.append("metrics", [2])
+        first.save()
+        second.save()
+        assert JsonStore(path).get("metrics") == [2]
+
+    def test_segmented_rebase(self, tmp_path):
+        path = tmp_path / "store.json"
+        first = JsonStore(path, segmented=True, locking=True)
+        second = JsonStore(path, segmented=True, locking=True)
+        first.append("metrics", [1])
+        first.set("config", {"v": 1})
+        first.save()
+        second.append("metrics", [2])
+        second.save()
+        assert JsonStore(path).to_dict() == {"metrics": [1, 2], "config": {"v": 1}}
+        assert len(list((tmp_path / "store.json.segments").iterdir())) == 2
+
+    def test_processes_do_not_lose_appends(self, tmp_path):
+        path = tmp_path / "store.json"
+        ctx = multiprocessing.get_context("fork")
+        procs = [
+            ctx.Process(target=_locked_writer, args=(str(path), w, 20)) for w in range(4)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        items = JsonStore(path).get("items")
+        assert len(items) == 80
+        assert set(items) == {f"{w}-{i}" for w in range(4) for i in range(20)}
+
+
+class TestBackgroundSave:
+    def test_save_is_durable_after_wait(self, tmp_path):
+        path = tmp_path / "store.json"
+        with JsonStore(path, background=True) as store:
+            store.set("a", 1)
+            store.append("items", [1, 2])
+            store.save()
+            assert store.wait_durable(timeout=5)
+            assert json.loads(path.read_text()) == {"a": 1, "items": [1, 2]}
+            store.append("items", [3])
+            store.save()
+        assert JsonStore(path).get("items") == [1, 2, 3]
+
+    def test_saves_coalesce_while_writing(self, tmp_path, monkeypatch):
+        store = JsonStore(tmp_path / "store.json", background=True)
+        gate = threading.Event()
+        started = threading.Event()
+        writes: list[dict] = []
+        original = store._write
+
+        def slow_write(data, dirty, appended):
+            writes.append(dict(data))
+            started.set()
+            gate.wait(5)
+            return original(data, dirty, appended)
+
+        monkeypatch.setattr(store, "_write", slow_write)
+        store.set("n", 0)
+        store.save()
+        assert started.wait(5)
+        for i in range(1, 4):
+            store.set("n", i)
+            store.save()
+        gate.set()
+        store.close()
+        assert [w["n"] for w in writes] == [0, 3]
+        assert JsonStore(tmp_path / "store.json").get("n") == 3
+
+    def test_chunked_encoding_matches_single_call(self, tmp_path):
+        data = {
+            "metrics": [{"id": i, "tags": [i, {"x": [i]}]} for i in range(5000)],
+            "empty": [],
+            "config": {"nested": [1, 2]},
+        }
+        for compact in (False, True):
+            sync_path = tmp_path / f"sync-{compact}.json"
+            bg_path = tmp_path / f"bg-{compact}.json"
+            JsonStore.from_dict(data, path=sync_path, compact=compact).save()
+            with JsonStore(bg_path, compact=compact, background=True) as store:
+                for key, value in data.items():
+                    store.set(key, value)
+                store.save()
+            assert bg_path.read_bytes() == sync_path.read_bytes()
+
+    def test_writer_error_is_raised_and_keys_stay_dirty(self, tmp_path):
+        blocker = tmp_path / "blocker"
+        blocker.write_text("")
+        store = JsonStore(blocker / "store.json", background=True)
+        store.set("a", 1)
+        store.save()
+        with pytest.raises(RuntimeError):
+            store.wait_durable(timeout=5)
+        assert store.dirty_keys == {"a"}
+        store.close()
+
+    def test_close_makes_later_saves_synchronous(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, background=True)
+        store.close()
+        store.set("a", 1)
+        store.save()
+        assert json.loads(path.read_text()) == {"a": 1}
+
+
+class TestCompression:
+    @pytest.mark.parametrize("compression", ["gzip", "lzma"])
+    def test_round_trip(self, tmp_path, compression):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, compression=compression)
+        store.set("metrics", [{"channel_id": "mastodon", "n": i} for i in range(500)])
+        store.save()
+        plain = tmp_path / "plain.json"
+        JsonStore.from_dict(store.to_dict(), path=plain).save()
+        assert path.stat().st_size < plain.stat().st_size / 5
+        # Readers detect compression regardless of their own setting.
+        assert JsonStore(path).to_dict() == store.to_dict()
+        assert MappedJsonStore(path).get("metrics") == store.get("metrics")
+
+    def test_suffix_implies_compression(self, tmp_path):
+        path = tmp_path / "store.json.gz"
+        store = JsonStore(path)
+        store.set("a", 1)
+        store.save()
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+        assert JsonStore(path).get("a") == 1
+
+    def test_segmented_and_corrupt(self, tmp_path):
+        path = tmp_path / "store.json"
+        store = JsonStore(path, segmented=True, compression="lzma")
+        store.set("a", [1, 2])
+        store.save()
+        assert JsonStore(path).get("a") == [1, 2]
+        path.write_bytes(path.read_bytes()[:10])
+        assert JsonStore(path).to_dict() == {}
+
+    def test_rejects_index_and_unknown_names(self, tmp_path):
+        with pytest.raises(ValueError, match="uncompressed"):
+            JsonStore(tmp_path / "s.json", compression="gzip", write_index=True)
+        with pytest.raises(ValueError, match="Unknown compression"):
+            JsonStore(tmp_path / "s.json", compression="bz2")
+
+
+class TestMappedJsonStore:
+    @pytest.mark.parametrize("compact", [False, True])
+    @pytest.mark.parametrize("write_index", [False, True])
+    def test_lazy_reads_match_json_store(self, tmp_path, compact, write_index):
+        path = tmp_path / "store.json"
+        JsonStore.from_dict(DOC, path=path, compact=compact, write_index=write_index).save()
+        assert (tmp_path / "store.json.idx").exists() == write_index
+        with MappedJsonStore(path) as store:
+            assert store.keys() == list(DOC)
+            assert store.get("config") == DOC["config"]
+            if write_index:
+                assert list(store._cache) == ["config"]
+            assert store.get("missing", 7) == 7
+            assert store.to_dict() == DOC
+
+    def test_index_output_is_identical(self, tmp_path):
+        JsonStore.from_dict(DOC, path=tmp_path / "a.json").save()
+        JsonStore.from_dict(DOC, path=tmp_path / "b.json", write_index=True).save()
+        assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+    def test_stale_index_falls_back_to_full_decode(self, tmp_path):
+        path = tmp_path / "store.json"
+        JsonStore.from_dict({"a": 1}, path=path, write_index=True).save()
+        path.write_text(json.dumps({"b": [2, 3], "a": 10}))
+        with MappedJsonStore(path) as store:
+            assert store.to_dict() == {"b": [2, 3], "a": 10}
+
+    def test_segmented_and_read_only(self, tmp_path):
+        path = tmp_path / "store.json"
+        JsonStore.from_dict({"a": 1, "b": [2]}, path=path, segmented=True).save()
+        with MappedJsonStore(path) as store:
+            assert sorted(store.keys()) == ["a", "b"]
+            assert store.get("b") == [2]
+            with pytest.raises(RuntimeError):
+                store.set("a", 2)
+            with pytest.raises(RuntimeError):
+                store.save()
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+        with MappedJsonStore(path) as store:
+            assert store.keys() == []
+
+
+class TestAppendLog:
+    def test_append_and_replay(self, tmp_path):
+        path = tmp_path / "metrics.json"
+        log = AppendLog(path, fsync_every=2)
+        log.append([{"n": 1}, {"n": 2}])
+        log.append([{"n": 3}])
+        log.close()
+        assert list(AppendLog(path).replay()) == [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    def test_compact_moves_tail_into_snapshot(self, tmp_path):
+        path = tmp_path / "metrics.json"
+        log = AppendLog(path)
+        log.append([{"n": 1}, {"n": 2}])
+        log.compact([{"n": 1}, {"n": 2}])
+        log.append([{"n": 3}])
+        log.close()
+        assert json.loads(path.read_text())["generation"] == 1
+        assert not (tmp_path / "metrics.json.0.log").exists()
+        reopened = AppendLog(path)
+        assert list(reopened.replay()) == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert reopened.tail_records == 1
+
+    def test_torn_tail_is_truncated(self, tmp_path):
+        path = tmp_path / "metrics.json"
+        log = AppendLog(path)
+        log.append([{"n": 1}])
+        log.close()
+        with (tmp_path / "metrics.json.0.log").open("a") as fh:
+            fh.write('{"n": 2')
+        reopened = AppendLog(path)
+        assert list(reopened.replay()) == [{"n": 1}]
+        reopened.append([{"n": 3}])
+        reopened.close()
+        assert list(AppendLog(path).replay()) == [{"n": 1}, {"n": 3}]
+
+    def test_needs_compaction(self, tmp_path):
+        log = AppendLog(tmp_path / "metrics.json", compact_every=2)
+        log.append([{"n": 1}])
+        assert not log.needs_compaction
+        log.append([{"n": 2}])
+        assert log.needs_compaction
+        log.close()
+
+
+def _metric_dict(i: int, channel: str = "mastodon") -> dict:
+    return {
+        "channel_id": channel, "content_id": f"c{i}",
+        "timestamp": datetime(2026, 1, 1 + i).isoformat(), "impressions": i, "clicks": 1,
+    }
+
+
+class TestSqliteStore:
+    def test_key_value_surface(self, tmp_path):
+        path = tmp_path / "store.db"
+        store = SqliteStore(path)
+        store.set("a", {"x": [1, 2]})
+        store.set("b", 2)
+        store.set("a", {"x": [3]})
+        store.delete("b")
+        assert store.get("a") == {"x": [3]}
+        assert store.get("missing", "default") == "default"
+        store.save()
+        store.set("unsaved", 1)
+        store._conn.rollback()
+        reopened = SqliteStore(path)
+        assert reopened.keys() == ["a"]
+        assert reopened.to_dict() == {"a": {"x": [3]}}
+        assert reopened.is_persistent and not SqliteStore().is_persistent
+        assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_metrics_table_range_query(self):
+        store = SqliteStore()
+        store.append_metrics(_metric_dict(i, "mastodon" if i % 2 else "discord") for i in range(10))
+        assert store.count_metrics() == 10
+        window = list(store.iter_metrics(start=datetime(2026, 1, 3), end=datetime(2026, 1, 5)))
+        assert [m["content_id"] for m in window] == ["c2", "c3", "c4"]
+        assert window[0]["timestamp"] == "2026-01-03T00:00:00"
+        assert len(list(store.iter_metrics(channels=["discord"]))) == 5
+        store.replace_metrics([_metric_dict(1)])
+        assert store.count_metrics() == 1
+        assert store.keys() == []
+
+    def test_upsert_metrics_updates_in_place(self):
+        store = SqliteStore()
+        store.append_metrics([_metric_dict(0), _metric_dict(1)])
+        key = ("channel_id", "content_id", "timestamp")
+        store.upsert_metrics([{**_metric_dict(0), "clicks": 9}, _metric_dict(2)], key)
+        store.upsert_metrics([{**_metric_dict(0), "clicks": 12}], key)
+        rows = list(store.iter_metrics())
+        assert [(m["content_id"], m["clicks"]) for m in rows] == [("c0", 12), ("c1", 1), ("c2", 1)]
+        with pytest.raises(ValueError):
+            store.upsert_metrics([], ("channel_id", "id; DROP TABLE metrics"))
+
+    def test_migrate_from_json(self, tmp_path):
+        source = JsonStore(tmp_path / "analytics.json")
+        source.set("metrics", [_metric_dict(i) for i in range(3)])
+        source.set("sketches", {"precision": 10})
+        source.save()
+        store = SqliteStore.migrate_from_json(tmp_path / "analytics.json", tmp_path / "analytics.db")
+        assert store.count_metrics() == 3
+        assert store.keys() == ["sketches"]
+        assert (tmp_path / "analytics.json").exists()
+
+    def test_from_dict_moves_metrics_into_table(self):
+        store = SqliteStore.from_dict({"metrics": [_metric_dict(i) for i in range(3)], "rollups": {}})
+        assert store.count_metrics() == 3
+        assert store.keys() == ["rollups"]
+
@@ -1,5 +1,7 @@
 """Tests for the report generator module."""
 
+import gzip
+import json
 from datetime import datetime
 
 from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
@@ -64,6 +66,8 @@ def test_to_json(self):
         import json
         data = json.loads(gen.to_json(report))
         assert data["total_metrics"] == 3
+        compact = gen.to_json(report, compact=True)
+        assert "\n" not in compact and json.loads(compact) == data
 
     def test_save_report(self, tmp_path):
         collector = _make_collector()
@@ -74,6 +78,16 @@ def test_save_report(self, tmp_path):
         assert len(files) == 2  # markdown + json
         assert all(f.exists() for f in files)
 
+    def test_save_report_compressed(self, tmp_path):
+        gen = ReportGenerator(_make_collector())
+        report = gen.generate(ReportPeriod.weekly(datetime(2026, 2, 17)))
+        files = gen.save_report(report, tmp_path, compression="gzip")
+        assert [f.name for f in files] == [
+            "report-weekly-20260217.md.gz", "report-weekly-20260217.json.gz",
+        ]
+        with gzip.open(files[1], "rt", encoding="utf-8") as fh:
+            assert json.load(fh) == report.to_dict()
+
     def test_top_content(self):
         collector = _make_collector()
         gen = ReportGenerator(collector)
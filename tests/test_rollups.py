@@ -0,0 +1,120 @@
+"""Tests for time-bucketed rollups and retention."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.cli import cmd_report
+from kerygma_strategy.persistence import AppendLog, JsonStore
+from kerygma_strategy.report_generator import ReportGenerator, ReportPeriod
+from kerygma_strategy.rollups import (
+    Granularity,
+    RetentionPolicy,
+    RollupStore,
+    bucket_start,
+)
+
+NOW = datetime(2026, 6, 1)
+
+
+def _history(collector: AnalyticsCollector, days: int = 120) -> None:
+    for d in range(days):
+        for channel in ("mastodon", "discord"):
+            collector.record(EngagementMetric(
+                channel_id=channel, content_id=f"post-{d % 9}",
+                timestamp=NOW - timedelta(days=d, hours=d % 5),
+                impressions=100 + d, clicks=d % 7, shares=1, replies=d % 2,
+            ))
+
+
+class TestBuckets:
+    def test_bucket_start(self):
+        ts = datetime(2026, 2, 19, 14, 35, 10)  # a Thursday
+        assert bucket_start(ts, Granularity.HOURLY) == datetime(2026, 2, 19, 14)
+        assert bucket_start(ts, Granularity.DAILY) == datetime(2026, 2, 19)
+        assert bucket_start(ts, Granularity.WEEKLY) == datetime(2026, 2, 16)
+
+    def test_expire_and_granularity_choice(self):
+        rollups = RollupStore()
+        rollups.add(EngagementMetric(channel_id="ch", content_id="c", timestamp=NOW - timedelta(days=30), impressions=5))
+        rollups.expire(RetentionPolicy(hourly_max_age=timedelta(days=7), daily_max_age=None), NOW)
+        assert rollups.channel_totals(granularity=Granularity.HOURLY) == {}
+        assert rollups.channel_totals(granularity=Granularity.DAILY)["ch"].impressions == 5
+        assert rollups.granularity_for(NOW - timedelta(days=3)) == Granularity.HOURLY
+        assert rollups.granularity_for(NOW - timedelta(days=30)) == Granularity.DAILY
+
+    def test_round_trip(self):
+        rollups = RollupStore()
+        rollups.add(EngagementMetric(channel_id="ch", content_id="c", timestamp=NOW, impressions=10, clicks=2))
+        rollups.expire(RetentionPolicy(), NOW)
+        restored = RollupStore.from_dict(rollups.to_dict())
+        assert restored.to_dict() == rollups.to_dict()
+
+
+class TestCollectorCompaction:
+    def test_compact_preserves_aggregates(self):
+        collector = AnalyticsCollector(verify_aggregates=True)
+        _history(collector)
+        before_agg = collector.aggregate_by_channel()
+        before_top = collector.top_content()
+        moved = collector.compact(RetentionPolicy(raw_max_age=timedelta(days=30)), now=NOW)
+        assert moved > 0
+        assert collector.total_records == 240 - moved
+        assert collector.aggregate_by_channel() == before_agg
+        after_top = collector.top_content()
+        assert [cid for cid, _ in after_top] == [cid for cid, _ in before_top]
+        assert [r for _, r in after_top] == pytest.approx([r for _, r in before_top])
+        assert collector.range(datetime(2000, 1, 1), NOW - timedelta(days=31)) == []
+
+    def test_report_reads_rollups(self):
+        raw = AnalyticsCollector()
+        _history(raw)
+        compacted = AnalyticsCollector()
+        _history(compacted)
+        compacted.compact(
+            RetentionPolicy(raw_max_age=timedelta(days=7), hourly_max_age=None), now=NOW,
+        )
+        period = ReportPeriod.monthly(NOW)
+        expected = ReportGenerator(raw).generate(period)
+        report = ReportGenerator(compacted).generate(period)
+        assert report.channel_summary == expected.channel_summary
+        assert report.total_metrics == expected.total_metrics
+        assert report.total_impressions == expected.total_impressions
+
+    def test_rollups_persist_in_store(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(store=JsonStore(path))
+        _history(collector, days=40)
+        before = collector.aggregate_by_channel()
+        collector.compact(RetentionPolicy(raw_max_age=timedelta(days=10)), now=NOW)
+        reloaded = AnalyticsCollector(store=JsonStore(path), verify_aggregates=True)
+        assert reloaded.total_records == collector.total_records
+        assert reloaded.aggregate_by_channel() == before
+
+    def test_cli_report_reads_rollups(self, tmp_path, capsys):
+        path = tmp_path / "analytics.json"
+        now = datetime.now()
+        collector = AnalyticsCollector(store=JsonStore(path))
+        for d in range(28):
+            collector.record(EngagementMetric(
+                channel_id="mastodon", content_id=f"post-{d}",
+                timestamp=now - timedelta(days=d, hours=1), impressions=100 + d,
+            ))
+        collector.compact(RetentionPolicy(raw_max_age=timedelta(days=7)), now=now)
+        streamed = AnalyticsCollector.from_stream(path, start=now - timedelta(days=30))
+        assert streamed.total_records == 7
+        assert streamed.aggregate_by_channel() == collector.aggregate_by_channel()
+        cmd_report(str(path), str(tmp_path / "reports"), "monthly")
+        assert "**Total metrics:** 28" in capsys.readouterr().out
+
+    def test_rollups_persist_in_wal(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(wal=AppendLog(path), columnar=True)
+        _history(collector, days=40)
+        before = collector.aggregate_by_channel()
+        collector.compact(RetentionPolicy(raw_max_age=timedelta(days=10)), now=NOW)
+        collector.close()
+        reloaded = AnalyticsCollector(wal=AppendLog(path), columnar=True, verify_aggregates=True)
+        assert reloaded.total_records == collector.total_records
+        assert reloaded.aggregate_by_channel() == before
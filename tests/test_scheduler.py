@@ -1,6 +1,11 @@
 """Tests for the scheduler module."""
 from datetime import datetime, timedelta
-from kerygma_strategy.scheduler import ContentScheduler, ScheduleEntry, Frequency
+
+import pytest
+
+from kerygma_strategy.scheduler import (
+    ContentScheduler, Frequency, RecurrenceRule, ScheduleArchive, ScheduleEntry, add_months,
+)
 
 def test_schedule_entry_is_due():
     past = datetime.now() - timedelta(hours=1)
@@ -29,3 +34,127 @@ def test_publish_creates_next_for_recurring():
     sched.publish_entry("E1")
     assert sched.total_entries == 2
     assert sched.pending_count == 1
+
+def test_due_and_upcoming_skip_published_history():
+    sched = ContentScheduler()
+    base = datetime(2026, 3, 1, 9, 0)
+    sched.schedule(ScheduleEntry(entry_id="R", content_id="C1", channel="ch1", scheduled_time=base, frequency=Frequency.DAILY))
+    entry_id = "R"
+    for _ in range(30):
+        sched.publish_entry(entry_id)
+        entry_id = sched.get_due(base + timedelta(days=40))[0].entry_id
+    sched.schedule(ScheduleEntry(entry_id="B", content_id="C2", channel="ch2", scheduled_time=base + timedelta(days=30)))
+    sched.schedule(ScheduleEntry(entry_id="A", content_id="C3", channel="ch3", scheduled_time=base + timedelta(days=30, hours=2)))
+    assert sched.total_entries == 33
+    assert sched.pending_count == 3
+    due = sched.get_due(base + timedelta(days=30, hours=1))
+    assert [e.entry_id for e in due] == [entry_id, "B"]
+    upcoming = sched.get_upcoming(hours=2, now=base + timedelta(days=30, minutes=1))
+    assert [e.entry_id for e in upcoming] == ["A"]
+    assert [e.entry_id for e in sched.get_upcoming(hours=2, now=base + timedelta(days=30))] == [entry_id, "B", "A"]
+
+def test_republishing_does_not_duplicate_pending():
+    sched = ContentScheduler()
+    t = datetime(2026, 3, 1, 9, 0)
+    sched.schedule(ScheduleEntry(entry_id="E1", content_id="C1", channel="ch1", scheduled_time=t, frequency=Frequency.WEEKLY))
+    sched.publish_entry("E1")
+    sched.publish_entry("E1")
+    assert sched.pending_count == 1
+    assert len(sched.get_due(t + timedelta(weeks=2))) == 1
+
+def _daily_scheduler(archive=None, channels=("ch1", "ch2"), days=10):
+    sched = ContentScheduler(archive=archive)
+    base = datetime(2026, 3, 1, 9, 0)
+    for ch in channels:
+        sched.schedule(ScheduleEntry(entry_id=f"post-{ch}", content_id=f"C-{ch}", channel=ch, scheduled_time=base, frequency=Frequency.DAILY))
+    for day in range(days):
+        for entry in sched.get_due(base + timedelta(days=day)):
+            sched.publish_entry(entry.entry_id)
+    return sched, base
+
+def test_archive_published_bounds_live_entries():
+    sched, base = _daily_scheduler()
+    assert sched.total_entries == 22
+    moved = sched.archive_published(older_than=timedelta(days=3), now=base + timedelta(days=10))
+    assert moved == 16
+    assert sched.total_entries == 6
+    assert sched.archive_published() == 4
+    assert sched.total_entries == sched.pending_count == 2
+    assert len(sched.archive) == 20
+    history = sched.archive.by_channel("ch1")
+    assert len(history) == 10 and all(e.published and e.channel == "ch1" for e in history)
+    assert [e.content_id for e in sched.archive.by_content("C-ch2")] == ["C-ch2"] * 10
+    assert sched.archive_published() == 0
+
+def test_file_archive_round_trip(tmp_path):
+    path = tmp_path / "schedule-archive.ndjson"
+    sched, _ = _daily_scheduler(archive=ScheduleArchive(path), days=5)
+    sched.archive_published()
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"entry_id": "torn"')
+    reopened = ScheduleArchive(path)
+    assert len(reopened) == 10
+    assert [e.scheduled_time.day for e in reopened.by_channel("ch2")] == [1, 2, 3, 4, 5]
+    assert reopened.by_content("C-ch1")[0].frequency == Frequency.DAILY
+    reopened.add([ScheduleEntry(entry_id="X", content_id="C-x", channel="ch3", scheduled_time=datetime(2026, 4, 1), published=True)])
+    assert [e.entry_id for e in ScheduleArchive(path).by_channel("ch3")] == ["X"]
+
+def test_schedule_entry_dict_round_trip():
+    entry = ScheduleEntry(entry_id="E1", content_id="C1", channel="ch1", scheduled_time=datetime(2026, 3, 1, 9), frequency=Frequency.MONTHLY, published=True)
+    assert ScheduleEntry.from_dict(entry.to_dict()) == entry
+
+def test_add_months_clamps_to_month_end():
+    assert add_months(datetime(2026, 1, 31, 9), 1) == datetime(2026, 2, 28, 9)
+    assert add_months(datetime(2027, 12, 31), 2) == datetime(2028, 2, 29)
+    assert add_months(datetime(2026, 11, 15), 3) == datetime(2027, 2, 15)
+    assert add_months(datetime(2026, 3, 31), -1) == datetime(2026, 2, 28)
+    entry = ScheduleEntry(entry_id="M", content_id="C", channel="ch", scheduled_time=datetime(2026, 1, 31), frequency=Frequency.MONTHLY)
+    assert entry.next_occurrence() == datetime(2026, 2, 28)
+
+def test_recurrence_rule_expansion():
+    monthly = RecurrenceRule("m", "C", "ch", datetime(2026, 1, 31, 9), Frequency.MONTHLY, count=5, exceptions=frozenset({datetime(2026, 3, 31, 9)}))
+    assert [d.date().isoformat() for d in monthly.occurrences()] == ["2026-01-31", "2026-02-28", "2026-04-30", "2026-05-31"]
+    weekly = RecurrenceRule("w", "C", "ch", datetime(2026, 1, 5, 9), Frequency.WEEKLY, until=datetime(2026, 12, 31))
+    window = list(weekly.occurrences(after=datetime(2026, 6, 1), before=datetime(2026, 6, 30)))
+    assert window == [datetime(2026, 6, d, 9) for d in (1, 8, 15, 22, 29)]
+    assert weekly.index_at(datetime(2026, 1, 5, 9)) == 0 and weekly.index_at(datetime(2026, 1, 5, 10)) == 1
+    assert len(list(weekly.occurrences())) == 52
+    once = RecurrenceRule("o", "C", "ch", datetime(2026, 1, 1), Frequency.ONCE)
+    assert list(once.occurrences()) == [datetime(2026, 1, 1)]
+    with pytest.raises(ValueError):
+        RecurrenceRule("x", "C", "ch", datetime(2026, 1, 1), Frequency.DAILY, count=0)
+
+def test_scheduler_rules_due_publish_and_archive():
+    sched = ContentScheduler()
+    start = datetime(2026, 3, 1, 9)
+    sched.add_rule(RecurrenceRule("daily", "C1", "ch1", start, Frequency.DAILY, count=10))
+    sched.schedule(ScheduleEntry(entry_id="E1", content_id="C2", channel="ch2", scheduled_time=start + timedelta(hours=30)))
+    due = sched.get_due(start + timedelta(days=1, hours=8))
+    assert [e.entry_id for e in due] == ["daily-20260301090000", "daily-20260302090000", "E1"]
+    sched.publish_entry("daily-20260302090000")
+    assert [e.entry_id for e in sched.get_due(start + timedelta(days=1, hours=8))] == ["daily-20260301090000", "E1"]
+    sched.publish_entry("daily-20260301090000")
+    with pytest.raises(KeyError):
+        sched.publish_entry("daily-20260301090000")
+    with pytest.raises(KeyError):
+        sched.publish_entry("daily-20260301093000")
+    assert [e.entry_id for e in sched.archive.by_content("C1")] == ["daily-20260302090000", "daily-20260301090000"]
+    upcoming = sched.get_upcoming(hours=48, now=start + timedelta(days=1))
+    assert [e.entry_id for e in upcoming] == ["E1", "daily-20260303090000", "daily-20260304090000"]
+    assert sched.total_entries == 1 and sched.rule_count == 1
+    for day in range(2, 10):
+        sched.publish_entry(f"daily-202603{day + 1:02d}090000")
+    assert sched.rule_count == 0
+    assert sched.get_due(start + timedelta(days=30)) == [sched._entries["E1"]]
+
+def test_iter_occurrences_across_many_rules():
+    sched = ContentScheduler()
+    start = datetime(2026, 1, 1, 8)
+    for i in range(2000):
+        sched.add_rule(RecurrenceRule(f"r{i}", f"C{i}", f"ch{i % 40}", start + timedelta(minutes=i), Frequency.WEEKLY))
+    window = list(sched.iter_occurrences(datetime(2026, 6, 1), datetime(2026, 6, 8)))
+    assert len(window) == 2000
+    assert [when for when, _ in window] == sorted(when for when, _ in window)
+    assert all(rule.start.minute == when.minute for when, rule in window)
+    sched.remove_rule("r0")
+    assert sched.rule_count == 1999
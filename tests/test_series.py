@@ -0,0 +1,80 @@
+"""Tests for delta-encoded cumulative counter series."""
+
+import json
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from kerygma_strategy.analytics import EngagementMetric
+from kerygma_strategy.series import CounterSeries, CounterSeriesStore
+
+START = datetime(2026, 3, 1)
+
+
+def _snapshot(i: int, content_id: str = "status-1") -> EngagementMetric:
+    return EngagementMetric(
+        channel_id="mastodon", content_id=content_id,
+        timestamp=START + timedelta(minutes=15 * i),
+        impressions=10 * i, clicks=i // 2, shares=i // 3, replies=i // 5,
+    )
+
+
+@pytest.fixture
+def store():
+    s = CounterSeriesStore(checkpoint_every=16)
+    for i in range(200):
+        s.record(_snapshot(i))
+    return s
+
+
+class TestCounterSeries:
+    def test_samples_round_trip(self, store):
+        assert list(store.samples("mastodon", "status-1")) == [_snapshot(i) for i in range(200)]
+        assert store.total_samples == 200
+
+    def test_value_at_matches_latest_sample(self, store):
+        for i in (0, 15, 16, 17, 99, 199):
+            assert store.value_at("mastodon", "status-1", _snapshot(i).timestamp) == _snapshot(i)
+        between = _snapshot(40).timestamp + timedelta(minutes=5)
+        assert store.value_at("mastodon", "status-1", between) == _snapshot(40)
+        assert store.value_at("mastodon", "status-1", START - timedelta(seconds=1)) is None
+        assert store.value_at("mastodon", "other", START) is None
+
+    def test_window_delta(self, store):
+        delta = store.window_delta("mastodon", "status-1", _snapshot(20).timestamp, _snapshot(150).timestamp)
+        assert delta == {"impressions": 1300, "clicks": 65, "shares": 44, "replies": 26}
+        # A window starting before the first sample counts from zero.
+        assert store.window_delta("mastodon", "status-1", START - timedelta(days=1), START)["impressions"] == 0
+        assert store.window_delta("mastodon", "missing", START, START) == dict.fromkeys(
+            ("impressions", "clicks", "shares", "replies"), 0,
+        )
+
+    def test_channel_window_delta(self, store):
+        for i in range(10):
+            store.record(_snapshot(i, content_id="status-2"))
+        totals = store.channel_window_delta("mastodon", START, _snapshot(9).timestamp)
+        assert totals["impressions"] == 90 + 90
+
+    def test_counters_may_decrease(self):
+        series = CounterSeries(checkpoint_every=2)
+        for i, value in enumerate((5, 3, 8)):
+            series.append(START + timedelta(hours=i), (value, 0, 0, 0))
+        assert series.value_at(START + timedelta(hours=1)) == (3, 0, 0, 0)
+        assert series.window_delta(START, START + timedelta(hours=2))[0] == 3
+
+    def test_out_of_order_rejected(self):
+        series = CounterSeries()
+        series.append(START, (1, 0, 0, 0))
+        with pytest.raises(ValueError):
+            series.append(START - timedelta(seconds=1), (2, 0, 0, 0))
+
+    def test_compact_encoding(self, store):
+        assert store.nbytes < 200 * 12
+        assert store.nbytes * 10 < sum(sys.getsizeof(m) + sys.getsizeof(m.__dict__) for m in store.samples("mastodon", "status-1"))
+
+    def test_json_round_trip(self, store):
+        restored = CounterSeriesStore.from_dict(json.loads(json.dumps(store.to_dict())))
+        assert list(restored.samples("mastodon", "status-1")) == list(store.samples("mastodon", "status-1"))
+        restored.record(_snapshot(200))
+        assert restored.value_at("mastodon", "status-1", _snapshot(200).timestamp) == _snapshot(200)
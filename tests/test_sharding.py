@@ -0,0 +1,99 @@
+"""Tests for sharded analytics and partial aggregate merging."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.report_generator import PartialAggregate, ReportGenerator, ReportPeriod
+from kerygma_strategy.sharding import ShardedAnalytics
+
+PERIOD = ReportPeriod(start=datetime(2026, 3, 1), end=datetime(2026, 3, 8), label="weekly")
+
+
+def _metrics() -> list[EngagementMetric]:
+    return [
+        EngagementMetric(
+            channel_id=("mastodon", "discord", "ghost")[i % 3], content_id=f"post-{i % 17}",
+            timestamp=datetime(2026, 2, 27) + timedelta(hours=4 * i),
+            impressions=100 + i, clicks=i % 7, shares=i % 5, replies=i % 3,
+        )
+        for i in range(90)
+    ]
+
+
+def _expected():
+    collector = AnalyticsCollector()
+    collector.record_many(_metrics())
+    return ReportGenerator(collector).generate(PERIOD)
+
+
+def _assert_same(report, expected):
+    assert report.total_metrics == expected.total_metrics
+    assert report.channel_summary == expected.channel_summary
+    assert report.total_impressions == expected.total_impressions
+    assert report.total_engagement == expected.total_engagement
+    assert [c for c, _ in report.top_content] == [c for c, _ in expected.top_content]
+    for (_, rate), (_, want) in zip(report.top_content, expected.top_content):
+        assert rate == pytest.approx(want)
+
+
+class TestPartialAggregate:
+    def test_merge_matches_single_pass(self):
+        metrics = _metrics()
+        whole, left, right = PartialAggregate(), PartialAggregate(), PartialAggregate()
+        for i, m in enumerate(metrics):
+            whole.add(m)
+            (left if i % 2 else right).add(m)
+        merged = left.merge(right)
+        assert merged.total_metrics == whole.total_metrics
+        assert merged.channel_summary == whole.channel_summary
+        assert merged.content_rates.keys() == whole.content_rates.keys()
+
+    def test_generate_from_partial_without_collector(self):
+        expected = _expected()
+        collector = AnalyticsCollector()
+        collector.record_many(_metrics())
+        partial = PartialAggregate.from_collector(collector, PERIOD.start, PERIOD.end)
+        _assert_same(ReportGenerator().generate(PERIOD, partial), expected)
+
+    def test_generate_without_collector_or_partial(self):
+        with pytest.raises(ValueError):
+            ReportGenerator().generate(PERIOD)
+
+
+class TestShardedAnalytics:
+    @pytest.mark.parametrize("by", ["hash", "channel"])
+    def test_report_matches_single_collector(self, tmp_path, by):
+        sharded = ShardedAnalytics(tmp_path, shards=3, by=by)
+        sharded.record_many(_metrics())
+        sharded.flush()
+        assert len(sharded.shard_paths) == 3
+        partial = sharded.partial(PERIOD.start, PERIOD.end, processes=1)
+        _assert_same(ReportGenerator().generate(PERIOD, partial), _expected())
+
+    def test_process_pool(self, tmp_path):
+        sharded = ShardedAnalytics(tmp_path, shards=4)
+        for m in _metrics():
+            sharded.record(m)
+        partial = sharded.partial(PERIOD.start, PERIOD.end, processes=2)
+        _assert_same(ReportGenerator().generate(PERIOD, partial), _expected())
+
+    def test_posts_stay_on_one_shard(self, tmp_path):
+        sharded = ShardedAnalytics(tmp_path, shards=8)
+        assert sharded.shard_name("mastodon", "post-1") == sharded.shard_name("mastodon", "post-1")
+        sharded.record_many(_metrics())
+        sharded.flush()
+        seen: dict[tuple[str, str], str] = {}
+        for path in sharded.shard_paths:
+            for m in AnalyticsCollector(store=JsonStore(path)).all_metrics:
+                assert seen.setdefault((m.channel_id, m.content_id), path.name) == path.name
+
+    def test_layout_mismatch(self, tmp_path):
+        ShardedAnalytics(tmp_path, shards=4)
+        ShardedAnalytics(tmp_path, shards=4)
+        with pytest.raises(ValueError):
+            ShardedAnalytics(tmp_path, shards=2)
+        with pytest.raises(ValueError):
+            ShardedAnalytics(tmp_path / "x", by="region")
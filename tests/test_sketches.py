@@ -0,0 +1,140 @@
+"""Tests for distinct-count and quantile sketches."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import AppendLog, JsonStore
+from kerygma_strategy.rollups import RetentionPolicy
+from kerygma_strategy.sketches import ChannelSketches, HyperLogLog, KLLSketch
+
+
+class TestHyperLogLog:
+    def test_small_counts_are_near_exact(self):
+        hll = HyperLogLog()
+        for i in range(50):
+            hll.add(f"post-{i}")
+            hll.add(f"post-{i}")
+        assert hll.count() == pytest.approx(50, abs=2)
+
+    def test_large_count_within_error(self):
+        hll = HyperLogLog(precision=12)
+        for i in range(20_000):
+            hll.add(f"post-{i}")
+        assert hll.count() == pytest.approx(20_000, rel=0.05)
+
+    def test_merge_and_round_trip(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            (a if i % 2 else b).add(f"id-{i}")
+        a.merge(b)
+        assert a.count() == pytest.approx(3000, rel=0.1)
+        assert HyperLogLog.from_dict(a.to_dict()).count() == a.count()
+        small = HyperLogLog()
+        small.add("x")
+        assert HyperLogLog.from_dict(small.to_dict()).count() == 1
+
+    def test_precision_mismatch(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+
+class TestKLLSketch:
+    def test_quantiles_within_rank_error(self):
+        rng = random.Random(7)
+        values = [rng.random() for _ in range(50_000)]
+        kll = KLLSketch(seed=1)
+        for v in values:
+            kll.update(v)
+        assert kll.count == 50_000
+        q = kll.quantiles([0.5, 0.9, 0.99])
+        assert q[0.5] == pytest.approx(0.5, abs=0.03)
+        assert q[0.9] == pytest.approx(0.9, abs=0.03)
+        assert q[0.99] == pytest.approx(0.99, abs=0.02)
+
+    def test_merge_and_round_trip(self):
+        a, b = KLLSketch(seed=1), KLLSketch(seed=2)
+        for i in range(10_000):
+            (a if i % 2 else b).update(i / 10_000)
+        a.merge(b)
+        assert a.count == 10_000
+        assert a.quantiles([0.5])[0.5] == pytest.approx(0.5, abs=0.03)
+        assert KLLSketch.from_dict(a.to_dict()).quantiles([0.5]) == a.quantiles([0.5])
+
+
+def _record_days(collector: AnalyticsCollector) -> None:
+    for day in range(10):
+        for post in range(day + 1):
+            collector.record(EngagementMetric(
+                channel_id="mastodon", content_id=f"post-{post}",
+                timestamp=datetime(2026, 3, 1) + timedelta(days=day, hours=post),
+                impressions=100, clicks=post,
+            ))
+
+
+class TestCollectorSketches:
+    def test_per_period_queries(self):
+        collector = AnalyticsCollector()
+        _record_days(collector)
+        assert collector.distinct_content("mastodon") == 10
+        assert collector.distinct_content("mastodon", end=datetime(2026, 3, 3)) == 3
+        q = collector.rate_quantiles("mastodon", start=datetime(2026, 3, 10), end=datetime(2026, 3, 10))
+        assert q[0.5] == pytest.approx(0.05, abs=0.011)
+        assert collector.rate_quantiles("missing") == {}
+
+    def test_sketches_persist_with_store(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(store=JsonStore(path))
+        _record_days(collector)
+        collector.close()
+        reloaded = AnalyticsCollector(store=JsonStore(path))
+        assert reloaded.sketches.to_dict() == collector.sketches.to_dict()
+
+    def test_flush_skips_sketches_until_close(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(store=JsonStore(path), persist_every=5)
+        _record_days(collector)
+        assert JsonStore(path).get("sketches") is None
+        collector.close()
+        collector.record(EngagementMetric("mastodon", "post-x", datetime(2026, 3, 5)))
+        collector.flush()
+        # The sketches written by close() no longer cover every stored row.
+        reloaded = AnalyticsCollector(store=JsonStore(path))
+        assert reloaded.distinct_content("mastodon") == 11
+        assert AnalyticsCollector.from_stream(path).sketches.channels == []
+
+    def test_sketches_persist_with_wal(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        collector = AnalyticsCollector(wal=AppendLog(path, compact_every=20), persist_every=7)
+        _record_days(collector)
+        collector.close()
+        reloaded = AnalyticsCollector(wal=AppendLog(path))
+        assert reloaded.distinct_content("mastodon") == 10
+        assert reloaded.sketches.to_dict()["channels"].keys() == {"mastodon"}
+        days = reloaded.sketches.to_dict()["channels"]["mastodon"]
+        assert sum(len(d["kll"]["compactors"][0]) for d in days.values()) == 55
+
+    def test_compact_folds_old_days_into_weeks(self):
+        collector = AnalyticsCollector()
+        _record_days(collector)
+        before = collector.distinct_content("mastodon")
+        quantiles = collector.rate_quantiles("mastodon")
+        policy = RetentionPolicy(raw_max_age=timedelta(days=400), daily_max_age=timedelta(days=4))
+        collector.compact(policy, now=datetime(2026, 3, 10))
+        data = collector.sketches.to_dict()
+        assert sorted(data["channels"]["mastodon"]) == [f"2026-03-{d:02d}" for d in range(6, 11)]
+        assert sorted(data["weeks"]["mastodon"]) == ["2026-02-23", "2026-03-02"]
+        assert collector.distinct_content("mastodon") == before
+        assert collector.rate_quantiles("mastodon") == quantiles
+        restored = ChannelSketches.from_dict(data)
+        assert restored.to_dict() == data
+        assert restored.distinct_content("mastodon", start=datetime(2026, 3, 2), end=datetime(2026, 3, 3)) == 5
+
+    def test_round_trip(self):
+        sketches = ChannelSketches()
+        sketches.add("ch", "c1", datetime(2026, 3, 1, 12), 0.25)
+        restored = ChannelSketches.from_dict(sketches.to_dict())
+        assert restored.rate_quantiles("ch", (0.5,)) == {0.5: 0.25}
+        assert restored.channels == ["ch"]
@@ -0,0 +1,87 @@
+"""Tests for the streaming store reader."""
+
+import json
+from datetime import datetime
+
+from kerygma_strategy.analytics import AnalyticsCollector, EngagementMetric
+from kerygma_strategy.persistence import JsonStore
+from kerygma_strategy.streaming import iter_json_array, iter_metrics
+
+
+def _write_store(path, n=50):
+    store = JsonStore(path)
+    store.set("config", {"nested": [1, 2, {"x": "]}"}], "n": 12345})
+    store.set("metrics", [
+        EngagementMetric(
+            channel_id="mastodon" if i % 2 else "discord", content_id=f"c{i}",
+            timestamp=datetime(2026, 1, 1 + i % 28), impressions=i, clicks=1,
+        ).to_dict()
+        for i in range(n)
+    ])
+    store.set("trailing", 3.25)
+    store.save()
+
+
+class TestIterJsonArray:
+    def test_matches_full_parse_with_small_chunks(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        _write_store(path)
+        expected = json.loads(path.read_text())["metrics"]
+        assert list(iter_json_array(path, chunk_size=7)) == expected
+
+    def test_other_keys(self, tmp_path):
+        path = tmp_path / "store.json"
+        path.write_text('{"a": 1, "items": [10, 20.5, "x"], "b": []}')
+        assert list(iter_json_array(path, "items", chunk_size=3)) == [10, 20.5, "x"]
+        assert list(iter_json_array(path, "b")) == []
+        assert list(iter_json_array(path, "missing")) == []
+
+    def test_compressed_store(self, tmp_path):
+        plain = tmp_path / "analytics.json"
+        _write_store(plain)
+        packed = tmp_path / "analytics.json.gz"
+        JsonStore.from_dict(JsonStore(plain).to_dict(), path=packed).save()
+        assert list(iter_json_array(packed, chunk_size=7)) == list(iter_json_array(plain))
+        packed.write_bytes(packed.read_bytes()[:200])
+        assert len(list(iter_json_array(packed))) < 50
+
+    def test_segmented_store(self, tmp_path):
+        plain = tmp_path / "analytics.json"
+        _write_store(plain)
+        segmented = tmp_path / "segmented.json"
+        JsonStore.from_dict(JsonStore(plain).to_dict(), path=segmented, segmented=True).save()
+        kept: dict = {}
+        rows = list(iter_json_array(segmented, chunk_size=7, keep=("config", "missing"), kept=kept))
+        assert rows == list(iter_json_array(plain))
+        assert kept == {"config": {"nested": [1, 2, {"x": "]}"}], "n": 12345}}
+        assert list(iter_json_array(segmented, "absent")) == []
+        assert AnalyticsCollector.from_stream(segmented, channels={"discord"}).total_records == 25
+
+    def test_missing_and_corrupt_files(self, tmp_path):
+        assert list(iter_json_array(tmp_path / "nope.json")) == []
+        bad = tmp_path / "bad.json"
+        bad.write_text("not json at all")
+        assert list(iter_json_array(bad)) == []
+        truncated = tmp_path / "truncated.json"
+        truncated.write_text('{"metrics": [{"a": 1}, {"a": ')
+        assert list(iter_json_array(truncated)) == [{"a": 1}]
+
+
+class TestIterMetrics:
+    def test_filters_by_time_and_channel(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        _write_store(path)
+        start, end = datetime(2026, 1, 5), datetime(2026, 1, 10)
+        rows = list(iter_metrics(path, start=start, end=end, channels={"mastodon"}))
+        assert rows
+        assert all(r.channel_id == "mastodon" and start <= r.timestamp <= end for r in rows)
+        full = AnalyticsCollector(store=JsonStore(path))
+        expected = [m for m in full.range(start, end) if m.channel_id == "mastodon"]
+        assert sorted(rows, key=lambda m: m.content_id) == sorted(expected, key=lambda m: m.content_id)
+
+    def test_collector_from_stream(self, tmp_path):
+        path = tmp_path / "analytics.json"
+        _write_store(path)
+        collector = AnalyticsCollector.from_stream(path, channels={"discord"})
+        assert collector.total_records == 25
+        assert set(collector.aggregate_by_channel()) == {"discord"}